@@ -5,8 +5,9 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Any
 
-from engine import analyze_video, Config
+from engine import analyze_video, open_frame_source, select_face_segment, Config
 from engine.types import Verdict
+from engine.utils.video import prune_frame_cache
 from backend.storage.base import StorageBackend
 
 
@@ -74,10 +75,24 @@ def run_analysis(job: JobSpec, storage: StorageBackend) -> JobResult:
             # For now, use default config
             pass
 
+        # Decode once into a memmap frame cache; the same frames feed the
+        # engine and evidence rendering. FRAME_CACHE_DIR makes the cache
+        # outlive the job so re-analysis of the same upload skips decoding
+        # and, unless face settings changed, face detection.
+        frame_cache_dir = os.getenv("FRAME_CACHE_DIR") or str(temp_dir / "frame_cache")
+        source = None
+
         # Run engine analysis
         try:
-            result = analyze_video(str(input_video_path), config)
+            # Segment pre-scan (if enabled) is cached next to the frames.
+            start_time = select_face_segment(str(input_video_path), config, cache_dir=frame_cache_dir)
+            source = open_frame_source(
+                str(input_video_path), config, cache_dir=frame_cache_dir, start_time=start_time
+            )
+            result = analyze_video(source, config)
         except Exception as e:
+            if source is not None:
+                source.release()
             return JobResult(
                 analysis_id=job.analysis_id,
                 status='failed',
@@ -105,6 +120,7 @@ def run_analysis(job: JobSpec, storage: StorageBackend) -> JobResult:
                 result_dict,
                 config,
                 input_video_path=str(input_video_path),
+                frame_source=source,
             )
             logger.info(f"Evidence artifacts written: {list(evidence_paths.keys())}")
             if evidence_paths.get("roi_masks"):
@@ -113,6 +129,12 @@ def run_analysis(job: JobSpec, storage: StorageBackend) -> JobResult:
             # Evidence writing failure is non-fatal
             logger.error(f"Evidence writing failed (non-fatal): {e}", exc_info=True)
             evidence_paths = {}
+        finally:
+            source.release()
+            if os.getenv("FRAME_CACHE_DIR"):
+                # The persistent cache is shared by every job: keep it bounded.
+                max_gb = float(os.getenv("FRAME_CACHE_MAX_GB") or 20)
+                prune_frame_cache(frame_cache_dir, int(max_gb * 1e9))
 
         # Create evidence index
         index_data = {
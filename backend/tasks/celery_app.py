@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init
 import os
 from datetime import datetime
 
@@ -7,6 +8,8 @@ from backend.storage.factory import create_storage_backend
 from backend.storage.base import StorageConfig
 from backend.database import db as dbmod
 from backend.database.models import Analysis, AnalysisStatus
+from engine.config import Config
+from engine.detectors import warm_up_detectors
 
 # Initialize Celery
 celery_app = Celery(
@@ -24,6 +27,18 @@ celery_app.conf.task_acks_late = True
 celery_app.conf.task_reject_on_worker_lost = True
 celery_app.conf.worker_max_memory_per_child = 1500000  # 1.5 GB, restart worker if exceeded
 
+
+@worker_process_init.connect
+def warm_up_worker_process(**_kwargs) -> None:
+    """Load the configured face detector models once per worker process, before the first job."""
+    try:
+        face = Config().face  # the runner analyzes with the default Config
+        warm_up_detectors(face.detector, threads=face.onnx_threads)
+    except Exception as e:
+        # A cold start only costs latency; the first job loads the models.
+        print(f"Detector warm-up failed: {e}")
+
+
 def ensure_db_initialized() -> None:
     """
     Ensure SQLAlchemy engine/session are initialized in *this* process.
@@ -1,36 +1,68 @@
+from typing import Union
+
 from .config import Config
-from .types import AnalysisResult, Verdict
-from .ingest import ingest_video
-from .face import analyze_faces
+from .types import AnalysisResult, FaceTrack, Verdict
+from .ingest import ingest_video, open_frame_source
+from .face import adaptive_stop_enabled, analyze_faces, scan_faces, select_face_segment
 from .roi import extract_rois
 from .stabilization import stabilize_rois
 from .rppg import extract_rppg
 from .quality import compute_sqi
 from .features import compute_features
 from .scoring import score_and_decide
+from .tube import FaceTube, build_face_tube
+from .utils.video import FrameSource
 
 
-def analyze_video(input_path: str, config: Config) -> AnalysisResult:
+def analyze_video(input_path: Union[str, FrameSource], config: Config) -> AnalysisResult:
     """
     Public entrypoint for the bioverify engine.
 
     Run the full analysis pipeline (ingest, face, ROI, stabilization, rPPG,
     SQI, features, scoring) and return an AnalysisResult.
+
+    The video is decoded once into a FrameSource shared by every stage. With
+    adaptive stopping (FaceConfig.stop_after_face_seconds /
+    give_up_after_seconds) decoding ends as soon as enough face signal has
+    been collected, or clearly none will be. Pass
+    an existing FrameSource to reuse the decoded frames afterwards (e.g. for
+    write_evidence).
     """
     try:
-        ingest_result = ingest_video(input_path, config)
-        face_result = analyze_faces(input_path, ingest_result, config)
+        if isinstance(input_path, FrameSource):
+            source = input_path
+        else:
+            source = open_frame_source(
+                input_path, config, start_time=select_face_segment(input_path, config)
+            )
+        scan = None
+        if adaptive_stop_enabled(config):
+            # Face detection drives decoding; every later stage only sees the
+            # frames read before it stopped.
+            scan = scan_faces(source, config)
+            source.limit(len(scan["frames"]))
+        ingest_result = ingest_video(source, config)
+        face_result = analyze_faces(source, ingest_result, config, scan=scan)
+        face_tube = None
+        if config.face.face_tube:
+            face_tube = build_face_tube(source, face_result["metrics"]["frames"])
+            # Later stages only look inside the face box; evidence re-reads
+            # the few frames it renders.
+            source.release()
         roi_result = extract_rois(
-            input_path, face_result["metrics"], ingest_result, config
+            source, face_result["metrics"], ingest_result, config
         )
         stabilization_result = stabilize_rois(
             ingest_result, face_result["metrics"], roi_result["metrics"], config
         )
         rppg_result = extract_rppg(
-            input_path,
+            source,
             ingest_result,
             roi_result["metrics"],
             config,
+            face_tube=face_tube,
+            geometry=roi_result["geometry"],
+            region_valid=roi_result["region_valid"],
         )
         sqi = compute_sqi(rppg_result["metrics"], stabilization_result["metrics"], config)
         feats = compute_features(rppg_result["metrics"])
@@ -70,5 +102,15 @@ def analyze_video(input_path: str, config: Config) -> AnalysisResult:
         )
 
 
-__all__ = ["analyze_video", "Config", "AnalysisResult", "Verdict"]
+__all__ = [
+    "analyze_video",
+    "open_frame_source",
+    "select_face_segment",
+    "Config",
+    "AnalysisResult",
+    "Verdict",
+    "FrameSource",
+    "FaceTrack",
+    "FaceTube",
+]
 
@@ -10,6 +10,8 @@ from .config import Config
 from .evidence import write_evidence
 from .eval import run_evaluation
 from .calibration import run_calibration
+from .face import select_face_segment
+from .ingest import open_frame_source
 
 
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -70,10 +72,19 @@ def main(argv: list[str] | None = None) -> int:
     args = _parse_args(argv)
     if args.command == "analyze":
         cfg = _load_config(getattr(args, "config_path", None))
-        result = analyze_video(args.video_path, cfg)
+        source = open_frame_source(
+            args.video_path, cfg, start_time=select_face_segment(args.video_path, cfg)
+        )
+        result = analyze_video(source, cfg)
         as_dict = result.to_dict()
         print(json.dumps(as_dict, indent=2, sort_keys=True))
-        write_evidence(args.out_dir, as_dict, cfg, input_video_path=args.video_path)
+        write_evidence(
+            args.out_dir,
+            as_dict,
+            cfg,
+            input_video_path=args.video_path,
+            frame_source=source,
+        )
         return 0
 
     if args.command == "eval":
@@ -10,6 +10,27 @@ class IngestConfig:
     window_seconds: float = 8.0
     overlap_ratio: float = 0.5
     min_duration_seconds: float = 3.0
+    # Stream frames in fixed-size chunks instead of holding the whole clip in
+    # memory (bounded RSS, but each pass over the frames decodes again).
+    stream_frames: bool = False
+    chunk_size: int = 64
+    # Chunks decoded ahead on a background thread (0 = decode inline).
+    prefetch_chunks: int = 2
+    # Decode into a .npy memmap under the caller-provided cache dir (if any)
+    # so later passes and re-runs map the file instead of decoding again.
+    cache_frames: bool = True
+    # Decoder backend: "cv2" (cv2.VideoCapture) or "pyav" (needs the `av`
+    # package; threaded decode and exact PTS timestamps).
+    decoder: str = "cv2"
+    decoder_threads: int = 0  # pyav codec threads, 0 = let FFmpeg decide
+    # Videos longer than the decode budget: pre-scan sparse frames for faces
+    # and read the segment with the best face visibility instead of always
+    # the opening seconds. Off by default: each sample costs a full detector
+    # pass (at most 20 samples, ~1.5 s with the Caffe SSD); with a cache dir
+    # the chosen start is stored so re-runs skip the scan.
+    select_segment: bool = False
+    segment_scan_step: float = 1.0  # seconds between pre-scan samples
+    segment_scan_max_dim: int = 240  # pre-scan decode size (detector cost is unaffected)
 
 
 @dataclass
@@ -17,17 +38,81 @@ class FaceConfig:
     min_face_fraction: float = 0.6
     # Face detection sensitivity (lower = more sensitive, detects smaller/less clear faces)
     detection_sensitivity: float = 1.0  # 1.0 = default, <1.0 = more lenient, >1.0 = stricter
+    # Face detector: "caffe" (OpenCV DNN SSD ResNet-10), "onnx" / "onnx-int8"
+    # (Ultra-Light RFB-320 on ONNX Runtime, needs `onnxruntime`; int8 =
+    # dynamically quantized weights) or "haar".
+    detector: str = "caffe"
+    onnx_threads: int = 0  # ONNX Runtime intra-op threads, 0 = default
+    # After detection, cut per-frame face crops (FaceTube) for the ROI/rPPG
+    # stages and drop the full frames from memory.
+    face_tube: bool = True
+    # Between detector runs, follow the face by template matching and re-run
+    # the detector only when the match weakens, the box drifts or
+    # redetect_interval frames have passed. False = fixed detect_every_n cadence.
+    track_faces: bool = True
+    track_min_score: float = 0.7  # normalized cross-correlation
+    track_max_drift: float = 0.25  # box sizes moved since the last detection
+    redetect_interval: int = 30  # frames
+    # Once a face is known, detect inside a crop around its last box (padded
+    # by local_search_margin box sizes per side), so the face fills more of
+    # the detector input; falls back to the full frame on a miss.
+    local_detection: bool = True
+    local_search_margin: float = 0.5
+    # Smooth the face track with a constant-velocity Kalman (RTS) smoother so
+    # ROI boxes glide instead of stepping at each detection. Noise levels are
+    # in face-box sizes: per-frame detection jitter and box acceleration.
+    smooth_boxes: bool = False
+    smooth_measurement_noise: float = 0.05
+    smooth_process_noise: float = 0.01
+    # Store the raw face track under the caller-provided frame cache dir (if
+    # any), keyed by video content, detector and detection settings, so a
+    # re-run with other scoring/ROI settings skips face detection.
+    cache_detections: bool = True
+    # Detector cadence without tracking, or while no face is tracked.
+    detect_every_n: int = 3
+    # Detector frames per DNN forward pass (cv2.dnn.blobFromImages). Only
+    # applies when track_faces=False (the fixed-cadence mode); batching
+    # amortizes per-call overhead but measured no faster per frame on CPU.
+    detect_batch_size: int = 8
+    # Parallel detection: split the clip into chunks detected on this many
+    # threads (1 = sequential), stitched so the face track stays continuous.
+    detect_workers: int = 1
+    detect_chunk_frames: int = 0  # frames per parallel chunk, 0 = ingest chunk_size
+    # cv2.setNumThreads while detecting in parallel (-1 = leave OpenCV's
+    # setting); 1 avoids oversubscribing cores with several DNN workers.
+    cv_threads: int = 1
+    # Adaptive stopping (0 = off): detect faces while decoding and stop
+    # reading once this many seconds of frames with a face are collected...
+    stop_after_face_seconds: float = 0.0
+    # ...or once no face has appeared in this many seconds from the start.
+    give_up_after_seconds: float = 0.0
 
 
 @dataclass
 class ROIConfig:
     min_region_coverage: float = 0.2
+    # Patch grid (0 = off): also split the face box into patch_rows x
+    # patch_cols patches and extract a pulse per patch (integral images, so
+    # the cost barely depends on the patch count) for a spatial pulse map.
+    patch_rows: int = 0
+    patch_cols: int = 0
 
 
 @dataclass
 class RPPGConfig:
     bandpass_low_hz: float = 0.7
     bandpass_high_hz: float = 4.0
+    # Pulse extraction method (engine.rppg_methods.METHODS: green, chrom,
+    # pos, pbv, ica), or "auto" to run them all and keep, per clip, the one
+    # with the highest in-band SNR averaged over the regions.
+    method: str = "chrom"
+    # Also run every other method on the same RGB traces and report their
+    # per-region SNR / peak frequency in metrics["methods"] (implied by "auto").
+    compare_methods: bool = False
+    # Process each ingest window on its own (bounded work per window) and
+    # overlap-add the window pulses; per-window spectra feed SQI.
+    windowed: bool = False
+    window_workers: int = 1  # threads for windowed processing
 
 
 @dataclass
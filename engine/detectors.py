@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import cv2
+import numpy as np
+
+from .utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Directory where DNN model files are stored
+MODEL_DIR = Path(__file__).parent / "models"
+
+_PROTOTXT = "deploy.prototxt"
+_CAFFEMODEL = "res10_300x300_ssd_iter_140000_fp16.caffemodel"
+_PROTOTXT_URL = (
+    "https://raw.githubusercontent.com/opencv/opencv/master/samples/dnn/face_detector/deploy.prototxt"
+)
+_CAFFEMODEL_URL = (
+    "https://github.com/opencv/opencv_3rdparty/raw/dnn_samples_face_detector_20180205_fp16/"
+    "res10_300x300_ssd_iter_140000_fp16.caffemodel"
+)
+_HAAR_CASCADE = "haarcascade_frontalface_default.xml"
+# Ultra-Light-Fast-Generic-Face-Detector-1MB (RFB, 320x240 input).
+_ONNX_MODEL = "version-RFB-320.onnx"
+_ONNX_INT8_MODEL = "version-RFB-320.int8.onnx"
+_ONNX_MODEL_URL = (
+    "https://github.com/Linzaer/Ultra-Light-Fast-Generic-Face-Detector-1MB/raw/master/"
+    "models/onnx/version-RFB-320.onnx"
+)
+
+# Face detector backends selectable via FaceConfig.detector.
+DETECTORS = ("caffe", "onnx", "onnx-int8", "haar")
+
+
+def _download_caffe_model(model_dir: Path) -> bool:
+    """Fetch the SSD model files into `model_dir` if missing; False on failure."""
+    prototxt = model_dir / _PROTOTXT
+    caffemodel = model_dir / _CAFFEMODEL
+    if prototxt.exists() and caffemodel.exists():
+        return True
+
+    logger.info("Downloading DNN face detection model (one-time)...")
+    try:
+        import urllib.request
+
+        model_dir.mkdir(exist_ok=True)
+        if not prototxt.exists():
+            urllib.request.urlretrieve(_PROTOTXT_URL, str(prototxt))
+            logger.info(f"Downloaded {prototxt.name}")
+        if not caffemodel.exists():
+            urllib.request.urlretrieve(_CAFFEMODEL_URL, str(caffemodel))
+            logger.info(f"Downloaded {caffemodel.name}")
+    except Exception as e:
+        logger.warning(f"Could not download DNN model: {e}. Will fall back to Haar cascade.")
+        return False
+    return True
+
+
+class OnnxFaceDetector:
+    """
+    Ultra-Light RFB-320 face detector on ONNX Runtime (CPU).
+
+    Takes the same inputs as the Caffe SSD path (frames resized to
+    `input_size`, BGR) and returns the same per-frame lists of
+    (x, y, w, h, confidence) in original frame coordinates. One session is
+    shared by all threads; InferenceSession.run is thread-safe.
+    """
+
+    input_size = (320, 240)
+
+    def __init__(self, model_path: Path, threads: int = 0) -> None:
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.model_path = Path(model_path)
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def detect_batch(
+        self,
+        inputs: Sequence[np.ndarray],
+        frame_sizes: Sequence[Tuple[int, int]],
+        confidence_threshold: float = 0.5,
+        nms_threshold: float = 0.3,
+    ) -> List[List[Tuple[int, int, int, int, float]]]:
+        """Faces per input; `frame_sizes` are the (width, height) to map boxes to."""
+        faces: List[List[Tuple[int, int, int, int, float]]] = []
+        for image, (w, h) in zip(inputs, frame_sizes):
+            # The exported model has a fixed batch of one.
+            rgb = image[..., ::-1].astype(np.float32)
+            blob = ((rgb - 127.0) / 128.0).transpose(2, 0, 1)[None]
+            scores, boxes = self.session.run(None, {self.input_name: blob})
+            conf = scores[0, :, 1]
+            keep = conf >= confidence_threshold
+            conf, corners = conf[keep], boxes[0, keep]
+            rects = [
+                [float(x0 * w), float(y0 * h), float((x1 - x0) * w), float((y1 - y0) * h)]
+                for x0, y0, x1, y1 in corners
+            ]
+            found = []
+            if rects:
+                for i in np.asarray(
+                    cv2.dnn.NMSBoxes(rects, conf.tolist(), confidence_threshold, nms_threshold)
+                ).reshape(-1):
+                    x, y, fw, fh = rects[int(i)]
+                    x0 = max(0, min(int(x), w - 1))
+                    y0 = max(0, min(int(y), h - 1))
+                    x1 = max(0, min(int(x + fw), w - 1))
+                    y1 = max(0, min(int(y + fh), h - 1))
+                    if x1 - x0 > 10 and y1 - y0 > 10:
+                        found.append((x0, y0, x1 - x0, y1 - y0, float(conf[int(i)])))
+            faces.append(found)
+        return faces
+
+
+def _onnx_model_path(model_dir: Path, quantized: bool) -> Optional[Path]:
+    """
+    Path to the RFB-320 model (fetched, and int8-quantized, on first use).
+
+    Both files are written under a temporary name and renamed into place,
+    so an interrupted download or quantization is retried next time instead
+    of leaving a truncated model behind.
+    """
+    model = model_dir / _ONNX_MODEL
+    if not model.exists():
+        logger.info("Downloading ONNX face detection model (one-time)...")
+        try:
+            import urllib.request
+
+            model_dir.mkdir(exist_ok=True)
+            tmp_path = model.with_name(f"{model.name}.{os.getpid()}.tmp")
+            urllib.request.urlretrieve(_ONNX_MODEL_URL, str(tmp_path))
+            os.replace(tmp_path, model)
+        except Exception as e:
+            logger.warning(f"Could not download ONNX face model: {e}")
+            return None
+    if not quantized:
+        return model
+
+    int8 = model_dir / _ONNX_INT8_MODEL
+    if not int8.exists():
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            tmp_path = int8.with_name(f"{int8.stem}.{os.getpid()}.tmp.onnx")
+            quantize_dynamic(str(model), str(tmp_path), weight_type=QuantType.QUInt8)
+            os.replace(tmp_path, int8)
+            logger.info(f"Quantized {model.name} -> {int8.name}")
+        except Exception as e:
+            logger.warning(f"Could not quantize ONNX face model: {e}")
+            return None
+    return int8
+
+
+class DetectorRegistry:
+    """
+    Face detector models, loaded once per process and instantiated per thread.
+
+    Model files are read (downloading them on first use) a single time and
+    kept in memory; each thread that asks for a detector gets its own
+    cv2.dnn_Net / CascadeClassifier built from those bytes, since neither is
+    safe to share across threads. A failed load is remembered so callers
+    fall back to Haar without retrying on every frame.
+    """
+
+    def __init__(self, model_dir: Path = MODEL_DIR) -> None:
+        self.model_dir = Path(model_dir)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._caffe: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._caffe_loaded = False
+        self._onnx: Dict[bool, Optional[OnnxFaceDetector]] = {}
+        self._fallbacks: Set[str] = set()
+
+    def _caffe_buffers(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        with self._lock:
+            if not self._caffe_loaded:
+                self._caffe_loaded = True
+                if _download_caffe_model(self.model_dir):
+                    self._caffe = (
+                        np.fromfile(str(self.model_dir / _PROTOTXT), dtype=np.uint8),
+                        np.fromfile(str(self.model_dir / _CAFFEMODEL), dtype=np.uint8),
+                    )
+            return self._caffe
+
+    def dnn_net(self):
+        """This thread's SSD ResNet-10 cv2.dnn_Net, or None if the model is unavailable."""
+        if not hasattr(self._local, "dnn_net"):
+            net = None
+            buffers = self._caffe_buffers()
+            if buffers is not None:
+                try:
+                    net = cv2.dnn.readNetFromCaffe(*buffers)
+                    logger.info("DNN face detector loaded successfully")
+                except Exception as e:
+                    logger.warning(f"Could not load DNN model: {e}. Will fall back to Haar cascade.")
+            self._local.dnn_net = net
+        return self._local.dnn_net
+
+    def onnx_detector(self, quantized: bool = False, threads: int = 0) -> Optional[OnnxFaceDetector]:
+        """
+        The process's ONNX Runtime detector (int8 weights if `quantized`),
+        or None if onnxruntime or the model is unavailable.
+        """
+        with self._lock:
+            if quantized not in self._onnx:
+                detector = None
+                try:
+                    import onnxruntime  # noqa: F401
+                except ImportError:
+                    logger.warning("ONNX face detector requires onnxruntime (pip install onnxruntime)")
+                else:
+                    path = _onnx_model_path(self.model_dir, quantized)
+                    if path is not None:
+                        try:
+                            detector = OnnxFaceDetector(path, threads=threads)
+                            logger.info(f"ONNX face detector loaded: {path.name}")
+                        except Exception as e:
+                            logger.warning(f"Could not load ONNX face model: {e}")
+                self._onnx[quantized] = detector
+            return self._onnx[quantized]
+
+    def detector(self, name: str, threads: int = 0):
+        """
+        Batch face detector for `name` (see DETECTORS) on the calling thread:
+        a cv2.dnn_Net for "caffe", an OnnxFaceDetector for "onnx" /
+        "onnx-int8", None for "haar". An unavailable ONNX backend falls back
+        to the Caffe SSD.
+        """
+        if name not in DETECTORS:
+            raise ValueError(f"Unknown face detector {name!r}; expected one of {list(DETECTORS)}")
+        if name == "haar":
+            return None
+        if name.startswith("onnx"):
+            detector = self.onnx_detector(quantized=name == "onnx-int8", threads=threads)
+            if detector is not None:
+                return detector
+            with self._lock:
+                warn = name not in self._fallbacks
+                self._fallbacks.add(name)
+            if warn:
+                logger.warning(f"Face detector {name!r} unavailable; using the Caffe SSD")
+        return self.dnn_net()
+
+    def haar_cascade(self) -> cv2.CascadeClassifier:
+        """This thread's frontal-face Haar cascade."""
+        if not hasattr(self._local, "haar"):
+            self._local.haar = cv2.CascadeClassifier(cv2.data.haarcascades + _HAAR_CASCADE)
+        return self._local.haar
+
+    def warm_up(self, detector: str = "caffe", threads: int = 0) -> None:
+        """
+        Load the models for `detector` (plus the Caffe and Haar fallbacks)
+        and run one dummy inference on the calling thread, so the first real
+        job does not pay load or first-run latency.
+        """
+        net = self.dnn_net()
+        if net is not None:
+            net.setInput(cv2.dnn.blobFromImage(np.zeros((300, 300, 3), dtype=np.uint8)))
+            net.forward()
+        self.haar_cascade()
+        if detector.startswith("onnx"):
+            onnx = self.onnx_detector(quantized=detector == "onnx-int8", threads=threads)
+            if onnx is not None:
+                w, h = onnx.input_size
+                onnx.detect_batch([np.zeros((h, w, 3), dtype=np.uint8)], [(w, h)])
+
+
+_registry = DetectorRegistry()
+
+
+def get_detector_registry() -> DetectorRegistry:
+    """The process-wide DetectorRegistry."""
+    return _registry
+
+
+def warm_up_detectors(detector: str = "caffe", threads: int = 0) -> None:
+    """
+    Preload face detector models for this process (e.g. at worker start);
+    `detector` / `threads` as in FaceConfig.detector / onnx_threads.
+    """
+    _registry.warm_up(detector, threads=threads)
@@ -8,6 +8,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from .config import Config
+from .roi_geometry import REGION_NAMES, region_rects
+from .utils.video import FrameSource
 
 
 def write_evidence(
@@ -15,6 +17,7 @@ def write_evidence(
     result_dict: Dict[str, Any],
     config: Config,
     input_video_path: Optional[str] = None,
+    frame_source: Optional[FrameSource] = None,
 ) -> Dict[str, Any]:
     """
     Write evidence artifacts into out_dir.
@@ -24,6 +27,9 @@ def write_evidence(
       - basic plots for rPPG traces and spectra if available
       - optional face/ROI visualization frames (ROI masks) if enabled
       - index.json listing artifacts
+
+    ROI frames are taken from `frame_source` when given (the FrameSource the
+    analysis already decoded), otherwise `input_video_path` is decoded.
     """
     root = Path(out_dir)
     root.mkdir(parents=True, exist_ok=True)
@@ -75,20 +81,21 @@ def write_evidence(
 
     # Face / ROI visualization frames (screenshots)
     # These help understand framing, motion, and ROI coverage per stage.
-    if config.evidence.enable_roi_masks and input_video_path:
+    if config.evidence.enable_roi_masks and (frame_source is not None or input_video_path):
         try:
             import cv2
-            from .utils.video import read_video  # local import to avoid cycles at import time
             from .utils.logging import get_logger
 
             logger = get_logger(__name__)
 
-            frames, timestamps, _fps = read_video(input_video_path)
+            if frame_source is None:
+                # Only a few frames are needed; stream rather than hold the clip.
+                frame_source = FrameSource(input_video_path, keep_frames=False)
+            timestamps = frame_source.timestamps
             roi_metrics = metrics.get("roi") or {}
             per_frame = roi_metrics.get("frames") or []
             
-            # Check if frames array is empty (numpy arrays can't use 'if not frames')
-            if frames is None or (hasattr(frames, 'size') and frames.size == 0) or len(frames) == 0:
+            if len(timestamps) == 0:
                 logger.warning("No frames read from video for ROI visualization")
             elif not per_frame:
                 logger.warning("No ROI frame data available for visualization")
@@ -96,21 +103,21 @@ def write_evidence(
                 # Choose up to 3 representative frames where we have ROI info.
                 indices = list(range(len(per_frame)))
                 if not indices:
-                    indices = list(range(min(3, len(frames))))
+                    indices = list(range(min(3, len(timestamps))))
                 # Sample at roughly start / middle / end.
                 sample_idxs = sorted(
                     {indices[0], indices[len(indices) // 2], indices[-1]}
                     if len(indices) >= 3
                     else set(indices)
                 )
+                sample_idxs = [idx for idx in sample_idxs if idx < len(timestamps)]
+                # Only the sampled frames are copied out of the source.
+                sample_frames = frame_source.get_frames(sample_idxs)
 
                 roi_dir = root / "roi_masks"
                 roi_dir.mkdir(exist_ok=True)
 
-                for i, frame_idx in enumerate(sample_idxs, start=1):
-                    if frame_idx >= len(frames):
-                        continue
-                    frame = frames[frame_idx].copy()
+                for i, (frame_idx, frame) in enumerate(zip(sample_idxs, sample_frames), start=1):
                     rec = per_frame[min(frame_idx, len(per_frame) - 1)] or {}
                     box = rec.get("box")
                     regions = rec.get("regions") or {}
@@ -138,32 +145,17 @@ def write_evidence(
                             cv2.rectangle(frame, (x, y), (x + fw, y + fh), (52, 211, 153), 2)  # emerald
                             status_text.append("Face detected")
 
-                            # Draw ROI rectangles based on the same geometry as ROI extraction
-                            regions_def = {
-                                "forehead": (
-                                    (x, int(y + 0.0 * fh)),
-                                    (x + fw, int(y + 0.3 * fh)),
-                                ),
-                                "left_cheek": (
-                                    (int(x + 0.0 * fw), int(y + 0.3 * fh)),
-                                    (int(x + 0.5 * fw), int(y + 0.7 * fh)),
-                                ),
-                                "right_cheek": (
-                                    (int(x + 0.5 * fw), int(y + 0.3 * fh)),
-                                    (int(x + 1.0 * fw), int(y + 0.7 * fh)),
-                                ),
-                            }
+                            # Draw ROI rectangles from the same geometry as ROI extraction
+                            rects = region_rects(np.array([[x, y, fw, fh]]), (h, w))[0]
                             valid_count = 0
-                            for name, ((x0, y0), (x1, y1)) in regions_def.items():
+                            for name, (x0, y0, x1, y1) in zip(REGION_NAMES, rects.tolist()):
                                 color = (239, 68, 68)  # red (BGR)
                                 if regions.get(name, {}).get("valid"):
                                     color = (52, 211, 153)  # emerald (BGR)
                                     valid_count += 1
-                                # Clamp to frame
-                                x0 = max(0, min(w - 1, x0))
-                                x1 = max(0, min(w - 1, x1))
-                                y0 = max(0, min(h - 1, y0))
-                                y1 = max(0, min(h - 1, y1))
+                                # Keep the outline inside the frame
+                                x1 = min(w - 1, x1)
+                                y1 = min(h - 1, y1)
                                 if x1 > x0 and y1 > y0:
                                     cv2.rectangle(frame, (x0, y0), (x1, y1), color, 2)
                             
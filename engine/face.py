@@ -1,101 +1,89 @@
 from __future__ import annotations
 
-import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
-from typing import Any, Dict, List, Tuple
-from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
 
-from .config import Config
-from .types import IngestResult
+from .config import Config, FaceConfig
+from .detectors import OnnxFaceDetector, get_detector_registry
+from .face_cache import (
+    face_cache_key,
+    load_face_track,
+    load_segment_start,
+    save_face_track,
+    save_segment_start,
+    segment_cache_key,
+)
+from .tracking import FaceTracker, smooth_boxes
+from .types import FaceTrack, IngestResult
 from .utils.logging import get_logger, log_params
-from .utils.video import read_video
+from .utils.video import (
+    DEFAULT_MAX_FRAMES,
+    FrameChunk,
+    FrameSource,
+    as_frame_source,
+    open_decoder,
+)
 
 
 logger = get_logger(__name__)
 
-# Directory where DNN model files are stored
-_MODEL_DIR = Path(__file__).parent / "models"
 
-_dnn_net = None
-
-
-def _get_dnn_detector():
+def _get_dnn_detector(config: Optional[FaceConfig] = None):
     """
-    Load OpenCV's built-in DNN face detector (Caffe model).
-    Downloads the model files on first use if they don't exist.
-    Falls back to Haar cascade if DNN model is unavailable.
+    Batch face detector for the calling thread, per `config.detector`: an
+    OpenCV DNN net (Caffe SSD) or an OnnxFaceDetector. Returns None for
+    "haar" or if no model is available (callers fall back to Haar).
     """
-    global _dnn_net
-    if _dnn_net is not None:
-        return _dnn_net
-
-    _MODEL_DIR.mkdir(exist_ok=True)
-
-    prototxt = _MODEL_DIR / "deploy.prototxt"
-    caffemodel = _MODEL_DIR / "res10_300x300_ssd_iter_140000_fp16.caffemodel"
+    config = config or FaceConfig()
+    return get_detector_registry().detector(config.detector, threads=config.onnx_threads)
 
-    if not prototxt.exists() or not caffemodel.exists():
-        logger.info("Downloading DNN face detection model (one-time)...")
-        try:
-            import urllib.request
-
-            proto_url = (
-                "https://raw.githubusercontent.com/opencv/opencv/master/samples/dnn/face_detector/deploy.prototxt"
-            )
-            model_url = (
-                "https://github.com/opencv/opencv_3rdparty/raw/dnn_samples_face_detector_20180205_fp16/"
-                "res10_300x300_ssd_iter_140000_fp16.caffemodel"
-            )
 
-            if not prototxt.exists():
-                urllib.request.urlretrieve(proto_url, str(prototxt))
-                logger.info(f"Downloaded {prototxt.name}")
+# SSD ResNet-10 input size and BGR mean.
+_DNN_INPUT_SIZE = (300, 300)
+_DNN_MEAN = (104.0, 177.0, 123.0)
 
-            if not caffemodel.exists():
-                urllib.request.urlretrieve(model_url, str(caffemodel))
-                logger.info(f"Downloaded {caffemodel.name}")
 
-        except Exception as e:
-            logger.warning(f"Could not download DNN model: {e}. Will fall back to Haar cascade.")
-            return None
-
-    try:
-        net = cv2.dnn.readNetFromCaffe(str(prototxt), str(caffemodel))
-        _dnn_net = net
-        logger.info("DNN face detector loaded successfully")
-        return net
-    except Exception as e:
-        logger.warning(f"Could not load DNN model: {e}. Will fall back to Haar cascade.")
-        return None
+def _dnn_input(frame: np.ndarray, net=None) -> np.ndarray:
+    """Resize a frame to the detector's input size (a copy, safe to keep across frames)."""
+    return cv2.resize(frame, getattr(net, "input_size", _DNN_INPUT_SIZE))
 
 
-def _detect_face_dnn(frame: np.ndarray, net, confidence_threshold: float = 0.5) -> List[Tuple[int, int, int, int, float]]:
+def _detect_face_dnn_batch(
+    inputs: Sequence[np.ndarray],
+    frame_sizes: Sequence[Tuple[int, int]],
+    net,
+    confidence_threshold: float = 0.5,
+) -> List[List[Tuple[int, int, int, int, float]]]:
     """
-    Detect faces using OpenCV DNN (SSD ResNet-10).
-    Returns list of (x, y, w, h, confidence).
+    Detect faces in several frames with one forward pass.
+
+    `inputs` are frames already resized by _dnn_input and `frame_sizes` the
+    (width, height) of the original frames; boxes come back in original
+    frame coordinates. Returns one list of (x, y, w, h, confidence) per frame.
     """
-    h, w = frame.shape[:2]
-    blob = cv2.dnn.blobFromImage(
-        cv2.resize(frame, (300, 300)),
-        1.0,
-        (300, 300),
-        (104.0, 177.0, 123.0),
-    )
+    if isinstance(net, OnnxFaceDetector):
+        return net.detect_batch(inputs, frame_sizes, confidence_threshold)
+    blob = cv2.dnn.blobFromImages(list(inputs), 1.0, _DNN_INPUT_SIZE, _DNN_MEAN)
     net.setInput(blob)
     detections = net.forward()
 
-    faces = []
-    for i in range(detections.shape[2]):
-        conf = float(detections[0, 0, i, 2])
-        if conf < confidence_threshold:
+    faces: List[List[Tuple[int, int, int, int, float]]] = [[] for _ in inputs]
+    for det in detections[0, 0]:
+        # Rows are (image_id, label, confidence, x0, y0, x1, y1).
+        conf = float(det[2])
+        image_id = int(det[0])
+        if conf < confidence_threshold or not 0 <= image_id < len(faces):
             continue
-        x0 = int(detections[0, 0, i, 3] * w)
-        y0 = int(detections[0, 0, i, 4] * h)
-        x1 = int(detections[0, 0, i, 5] * w)
-        y1 = int(detections[0, 0, i, 6] * h)
+        w, h = frame_sizes[image_id]
+        x0 = int(det[3] * w)
+        y0 = int(det[4] * h)
+        x1 = int(det[5] * w)
+        y1 = int(det[6] * h)
 
         # Clamp to frame bounds
         x0 = max(0, min(x0, w - 1))
@@ -106,16 +94,23 @@ def _detect_face_dnn(frame: np.ndarray, net, confidence_threshold: float = 0.5)
         fw = x1 - x0
         fh = y1 - y0
         if fw > 10 and fh > 10:
-            faces.append((x0, y0, fw, fh, conf))
+            faces[image_id].append((x0, y0, fw, fh, conf))
 
     return faces
 
 
+def _detect_face_dnn(frame: np.ndarray, net, confidence_threshold: float = 0.5) -> List[Tuple[int, int, int, int, float]]:
+    """
+    Detect faces using OpenCV DNN (SSD ResNet-10).
+    Returns list of (x, y, w, h, confidence).
+    """
+    h, w = frame.shape[:2]
+    return _detect_face_dnn_batch([_dnn_input(frame, net)], [(w, h)], net, confidence_threshold)[0]
+
+
 def _detect_face_haar(frame: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
     """Fallback: Haar cascade face detection. Returns list of (x, y, w, h, confidence)."""
-    cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-    )
+    cascade = get_detector_registry().haar_cascade()
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
     if len(faces) == 0:
@@ -165,109 +160,616 @@ def _select_best_face(
     return best
 
 
+def _detect_best_face(frame: np.ndarray, dnn_net) -> Tuple[int, int, int, int, float] | None:
+    """Run the DNN detector (Haar if `dnn_net` is None) and pick the best face."""
+    frame_h, frame_w = frame.shape[:2]
+    if dnn_net is not None:
+        faces = _detect_face_dnn(frame, dnn_net, confidence_threshold=0.5)
+    else:
+        faces = _detect_face_haar(frame)
+    return _select_best_face(faces, frame_w, frame_h)
+
+
+def _search_region(
+    box: Sequence[int], frame_w: int, frame_h: int, margin: float
+) -> Tuple[int, int, int, int] | None:
+    """
+    Square crop (x0, y0, x1, y1) around `box`, padded by `margin` box sizes
+    on each side and shifted to stay in the frame. None if the crop would
+    not be smaller than the frame.
+    """
+    x, y, w, h = (int(v) for v in box)
+    side = int(round(max(w, h) * (1 + 2 * margin)))
+    if side >= frame_w and side >= frame_h:
+        return None
+    x0 = int(max(0, min(x + w / 2 - side / 2, frame_w - side)))
+    y0 = int(max(0, min(y + h / 2 - side / 2, frame_h - side)))
+    return x0, y0, min(frame_w, x0 + side), min(frame_h, y0 + side)
+
+
+def _offset_face(best, x0: int, y0: int):
+    if best is None:
+        return None
+    x, y, w, h, conf = best
+    return (x + x0, y + y0, w, h, conf)
+
+
+def _detect_best_face_near(
+    frame: np.ndarray, box: Sequence[int] | None, dnn_net, margin: float
+) -> Tuple[int, int, int, int, float] | None:
+    """
+    Detect within a crop around the last known `box` (the face then fills
+    more of the detector input), falling back to the full frame on a miss.
+    """
+    if box is not None:
+        region = _search_region(box, frame.shape[1], frame.shape[0], margin)
+        if region is not None:
+            x0, y0, x1, y1 = region
+            best = _offset_face(_detect_best_face(frame[y0:y1, x0:x1], dnn_net), x0, y0)
+            if best is not None:
+                return best
+    return _detect_best_face(frame, dnn_net)
+
+
 def _make_result(x, y, w, h, conf):
-    """Build a face result dict from detection coordinates."""
-    landmarks = [
-        [int(x + 0.3 * w), int(y + 0.35 * h)],
-        [int(x + 0.7 * w), int(y + 0.35 * h)],
-        [int(x + 0.5 * w), int(y + 0.5 * h)],
-        [int(x + 0.35 * w), int(y + 0.75 * h)],
-        [int(x + 0.65 * w), int(y + 0.75 * h)],
-        [int(x + 0.5 * w), int(y + 0.9 * h)],
-    ]
-    return {
-        "box": [int(x), int(y), int(w), int(h)],
-        "landmarks": landmarks,
-        "tracking_confidence": float(conf),
-    }
+    """Build a per-frame detection result (landmarks are added by FaceTrack)."""
+    return {"box": [int(x), int(y), int(w), int(h)], "tracking_confidence": float(conf)}
 
 
-_NO_FACE = {"box": None, "landmarks": [], "tracking_confidence": 0.0}
+_NO_FACE = {"box": None, "tracking_confidence": 0.0}
 
-# Run DNN detector every Nth frame; reuse the last detection for skipped frames.
-_DETECT_EVERY_N = 3
 
+def _log_face_selected(frame_idx: int, best, frame_w: int, frame_h: int) -> None:
+    x, y, w, h, conf = best
+    cx = x + w / 2
+    cy = y + h / 2
+    size_pct = (w * h) / (frame_w * frame_h) * 100
+    logger.info(
+        f"Face selected frame {frame_idx}: box=({x},{y},{w},{h}), "
+        f"center=({cx:.0f},{cy:.0f}), size={size_pct:.1f}% of frame, "
+        f"conf={conf:.2f}"
+    )
 
-def _detect_faces(frames: np.ndarray) -> List[Dict[str, Any]]:
-    """Detect faces with frame skipping for speed."""
-    dnn_net = _get_dnn_detector()
-    use_dnn = dnn_net is not None
-    logger.info(f"Face detector: {'DNN (SSD ResNet-10)' if use_dnn else 'Haar cascade (fallback)'}")
 
-    results: List[Dict[str, Any]] = []
-    detected_count = 0
-    last_detection = None
+def _iter_face_detections(
+    frames: Iterable[np.ndarray],
+    config: Optional[FaceConfig] = None,
+    initial_box: Optional[Sequence[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Detect faces, yielding one result per frame.
+
+    `frames` may be any iterable (e.g. FrameSource.iter_frames()); frames are
+    not retained, so a streaming source keeps memory bounded, and the
+    consumer may stop early.
+
+    With `config.track_faces` a template tracker follows the face between
+    detector runs (see _iter_tracked_detections); otherwise the detector
+    runs every `detect_every_n` frames in batches (see
+    _iter_batched_detections).
+
+    `initial_box` is the face box just before these frames (e.g. from the
+    previous chunk); the first detection searches around it.
+    """
+    config = config or FaceConfig()
+    dnn_net = _get_dnn_detector(config)
+    if config.track_faces:
+        return _iter_tracked_detections(frames, dnn_net, config, initial_box)
+    return _iter_batched_detections(frames, dnn_net, config, initial_box)
+
+
+def _detector_id(config: FaceConfig) -> str:
+    """Identity of the detector `config` actually loads (after any fallback)."""
+    net = _get_dnn_detector(config)
+    if isinstance(net, OnnxFaceDetector):
+        return f"onnx:{net.model_path.name}"
+    return "caffe:res10_300x300_ssd" if net is not None else "haar"
+
+
+def _log_detector(config: FaceConfig) -> None:
+    net = _get_dnn_detector(config)
+    if isinstance(net, OnnxFaceDetector):
+        name = f"ONNX Runtime ({net.model_path.name})"
+    elif net is not None:
+        name = "DNN (SSD ResNet-10)"
+    else:
+        name = "Haar cascade" if config.detector == "haar" else "Haar cascade (fallback)"
+    logger.info(f"Face detector: {name}")
+
+
+def _iter_tracked_detections(
+    frames: Iterable[np.ndarray],
+    dnn_net,
+    config: FaceConfig,
+    initial_box: Optional[Sequence[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Detect once, then track by template matching until the track weakens.
+
+    The detector re-runs when the match score drops below
+    `track_min_score`, the box has drifted more than `track_max_drift` box
+    sizes from its detection, or `redetect_interval` frames have passed.
+    Without a face the detector runs every `detect_every_n` frames.
+
+    With `local_detection`, re-detections search a crop around the tracked
+    box first (see _detect_best_face_near).
+    """
+    tracker = FaceTracker()
+    every_n = max(1, int(config.detect_every_n))
+    det_conf = 0.0
+    since_detect = 0
     logged = 0
+    detector_runs = 0
 
     for frame_idx, frame in enumerate(frames):
         frame_h, frame_w = frame.shape[:2]
-
-        # Only run the detector every Nth frame
-        run_detector = (frame_idx % _DETECT_EVERY_N == 0)
-
-        if run_detector:
-            if use_dnn:
-                faces = _detect_face_dnn(frame, dnn_net, confidence_threshold=0.5)
+        result = None
+        run_detector = False
+
+        if tracker.active:
+            since_detect += 1
+            box, score = tracker.update(frame)
+            if (
+                score < config.track_min_score
+                or tracker.drift > config.track_max_drift
+                or since_detect >= config.redetect_interval
+            ):
+                run_detector = True
             else:
-                faces = _detect_face_haar(frame)
-            best = _select_best_face(faces, frame_w, frame_h)
+                result = _make_result(*box, det_conf * score)
+        else:
+            run_detector = frame_idx % every_n == 0
 
+        if run_detector:
+            detector_runs += 1
+            since_detect = 0
+            near = tracker.box if tracker.active else initial_box
+            initial_box = None
+            if not config.local_detection:
+                near = None
+            best = _detect_best_face_near(frame, near, dnn_net, config.local_search_margin)
             if best is not None:
-                x, y, w, h, conf = best
-                last_detection = _make_result(x, y, w, h, conf)
-                detected_count += 1
+                x, y, w, h, det_conf = best
+                tracker.start(frame, (x, y, w, h))
+                result = _make_result(x, y, w, h, det_conf)
                 if logged < 3:
-                    cx = x + w / 2
-                    cy = y + h / 2
-                    size_pct = (w * h) / (frame_w * frame_h) * 100
-                    logger.info(
-                        f"Face selected frame {frame_idx}: box=({x},{y},{w},{h}), "
-                        f"center=({cx:.0f},{cy:.0f}), size={size_pct:.1f}% of frame, "
-                        f"conf={conf:.2f}"
-                    )
+                    _log_face_selected(frame_idx, best, frame_w, frame_h)
                     logged += 1
             else:
-                last_detection = None
-        else:
-            # Reuse last detection for skipped frames
-            if last_detection is not None:
-                detected_count += 1
+                tracker.reset()
+
+        yield result if result is not None else dict(_NO_FACE)
 
-        results.append(dict(last_detection) if last_detection else dict(_NO_FACE))
+    logger.debug(f"Face tracking: detector ran on {detector_runs} frames")
 
-    rate = detected_count / len(frames) * 100 if len(frames) else 0
-    logger.info(f"Face detection summary: {detected_count}/{len(frames)} frames ({rate:.1f}%) had faces")
-    if detected_count == 0:
+
+def _iter_batched_detections(
+    frames: Iterable[np.ndarray],
+    dnn_net,
+    config: FaceConfig,
+    initial_box: Optional[Sequence[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run the detector every `detect_every_n` frames; skipped frames reuse the
+    last detection.
+
+    Only used when `track_faces` is off. DNN detection runs
+    `detect_batch_size` detector frames per forward pass: only their
+    300x300 inputs are buffered, and results for the frames covered by a
+    batch are yielded once it has run. (On CPU the SSD costs about the same
+    per frame batched or not; batching mainly cuts per-call overhead.)
+
+    With `local_detection`, frames queued after a face was found are
+    searched in a crop around the last box first; misses are re-run on the
+    full frame in a second batched pass.
+    """
+    use_dnn = dnn_net is not None
+    every_n = max(1, int(config.detect_every_n))
+    batch_size = max(1, int(config.detect_batch_size))
+
+    last_detection = None
+    logged = 0
+    # Frames awaiting the current batch: (frame_idx, width, height, detector slot or None).
+    pending: List[Tuple[int, int, int, Optional[int]]] = []
+    # For the detector frames in `pending`: DNN (full input, crop input or
+    # None, crop region or None), or Haar results.
+    batch: List[Any] = []
+
+    def _run_dnn_batch() -> List[Any]:
+        bests: List[Any] = [None] * len(batch)
+        local = [i for i, item in enumerate(batch) if item[1] is not None]
+        if local:
+            regions = [batch[i][2] for i in local]
+            sizes = [(x1 - x0, y1 - y0) for x0, y0, x1, y1 in regions]
+            found = _detect_face_dnn_batch([batch[i][1] for i in local], sizes, dnn_net)
+            for i, faces, (w, h), (x0, y0, _x1, _y1) in zip(local, found, sizes, regions):
+                bests[i] = _offset_face(_select_best_face(faces, w, h), x0, y0)
+        full = [i for i in range(len(batch)) if bests[i] is None]
+        if full:
+            frame_sizes = [(w, h) for _, w, h, slot in pending if slot is not None]
+            sizes = [frame_sizes[i] for i in full]
+            found = _detect_face_dnn_batch([batch[i][0] for i in full], sizes, dnn_net)
+            for i, faces, (w, h) in zip(full, found, sizes):
+                bests[i] = _select_best_face(faces, w, h)
+        return bests
+
+    def _flush() -> Iterator[Dict[str, Any]]:
+        nonlocal last_detection, logged, initial_box
+        bests = _run_dnn_batch() if use_dnn and batch else batch
+        for frame_idx, frame_w, frame_h, slot in pending:
+            # Skipped frames reuse the last detection.
+            if slot is not None:
+                best = bests[slot]
+                if best is not None:
+                    last_detection = _make_result(*best)
+                    if logged < 3:
+                        _log_face_selected(frame_idx, best, frame_w, frame_h)
+                        logged += 1
+                else:
+                    last_detection = None
+
+            yield dict(last_detection) if last_detection else dict(_NO_FACE)
+        pending.clear()
+        batch.clear()
+        initial_box = None
+
+    for frame_idx, frame in enumerate(frames):
+        frame_h, frame_w = frame.shape[:2]
+
+        slot = None
+        if frame_idx % every_n == 0:
+            slot = len(batch)
+            near = last_detection["box"] if last_detection else initial_box
+            if not config.local_detection:
+                near = None
+            if not use_dnn:
+                batch.append(_detect_best_face_near(frame, near, None, config.local_search_margin))
+            else:
+                region = None
+                if near is not None:
+                    region = _search_region(near, frame_w, frame_h, config.local_search_margin)
+                crop = None
+                if region is not None:
+                    x0, y0, x1, y1 = region
+                    crop = _dnn_input(frame[y0:y1, x0:x1], dnn_net)
+                batch.append((_dnn_input(frame, dnn_net), crop, region))
+        pending.append((frame_idx, frame_w, frame_h, slot))
+
+        if len(batch) >= batch_size:
+            yield from _flush()
+
+    yield from _flush()
+
+
+def _log_detection_summary(results: List[Dict[str, Any]], warn_if_empty: bool = True) -> None:
+    num_frames = len(results)
+    detected_count = sum(1 for rec in results if rec["box"] is not None)
+    rate = detected_count / num_frames * 100 if num_frames else 0
+    logger.info(f"Face detection summary: {detected_count}/{num_frames} frames ({rate:.1f}%) had faces")
+    if detected_count == 0 and warn_if_empty:
         logger.warning("No faces detected in any frame! The DNN model may not have downloaded correctly.")
 
+
+def _detect_faces(
+    frames: Iterable[np.ndarray], config: Optional[FaceConfig] = None
+) -> List[Dict[str, Any]]:
+    """Run _iter_face_detections over every frame."""
+    config = config or FaceConfig()
+    _log_detector(config)
+    results = list(_iter_face_detections(frames, config))
+    _log_detection_summary(results)
+    return results
+
+
+# Chunk results whose first box overlaps the previous chunk's last box less
+# than this are re-detected seeded with that box.
+_STITCH_MIN_IOU = 0.3
+
+
+def _box_iou(a: Sequence[int], b: Sequence[int]) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _detect_faces_parallel(
+    chunks: Iterable[FrameChunk], config: FaceConfig
+) -> List[Dict[str, Any]]:
+    """
+    Detect faces chunk by chunk on `config.detect_workers` threads.
+
+    Each chunk is tracked independently (every thread gets its own detector
+    from the registry), then the results are stitched in order: where a
+    chunk starts without a face, or with a box that does not overlap the
+    previous chunk's last box, it is re-run seeded with that box so the
+    track continues across the boundary instead of jumping to another
+    face. Chunks are copied (streaming buffers are reused) and at most
+    2 * workers are in flight.
+    """
+    _log_detector(config)
+    workers = max(1, int(config.detect_workers))
+    cv_threads = cv2.getNumThreads()
+    if config.cv_threads >= 0:
+        cv2.setNumThreads(config.cv_threads)
+
+    def _detect(frames: np.ndarray, initial_box=None) -> List[Dict[str, Any]]:
+        return list(_iter_face_detections(frames, config, initial_box))
+
+    results: List[Dict[str, Any]] = []
+    stitched = 0
+
+    def _stitch(frames: np.ndarray, future) -> None:
+        nonlocal stitched
+        chunk_results = future.result()
+        prev = results[-1]["box"] if results else None
+        first = chunk_results[0]["box"] if chunk_results else None
+        if prev is not None and (first is None or _box_iou(prev, first) < _STITCH_MIN_IOU):
+            chunk_results = _detect(frames, initial_box=prev)
+            stitched += 1
+        results.extend(chunk_results)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bioverify-face") as pool:
+            in_flight: Deque[Tuple[np.ndarray, Any]] = deque()
+            for chunk in chunks:
+                frames = np.array(chunk.frames, copy=True)
+                in_flight.append((frames, pool.submit(_detect, frames)))
+                while len(in_flight) > 2 * workers:
+                    _stitch(*in_flight.popleft())
+            while in_flight:
+                _stitch(*in_flight.popleft())
+    finally:
+        cv2.setNumThreads(cv_threads)
+
+    if stitched:
+        logger.info(f"Parallel face detection: re-ran {stitched} chunk(s) to keep the track continuous")
+    _log_detection_summary(results)
     return results
 
 
-def analyze_faces(path: str, ingest_result: IngestResult, config: Config) -> Dict[str, Any]:
-    """Run per-frame face detection and basic tracking quality metrics."""
+# Upper bound on pre-scan samples (each is a full detector pass); the sample
+# step grows for long videos.
+_SEGMENT_SCAN_MAX_SAMPLES = 20
+
+
+def select_face_segment(
+    path: str,
+    config: Config,
+    max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    cache_dir: Optional[str] = None,
+) -> float:
+    """
+    Choose where to start reading a video longer than the decode budget.
+
+    Returns 0.0 unless `ingest.select_segment` is set. Samples one frame
+    every `ingest.segment_scan_step` seconds (at most
+    _SEGMENT_SCAN_MAX_SAMPLES), seeking to keyframes where the decoder
+    supports it (pyav; cv2 seeks frame-accurately), runs the face detector
+    on each and returns the start time (seconds) of the `max_frames`-long
+    segment with the most samples showing a face. Returns 0.0 when the
+    whole video fits the budget, its length is unknown, no later segment
+    beats the opening one, or the scan fails (e.g. an undecodable file,
+    which the analysis then reports as usual).
+
+    With `cache_dir` (e.g. the frame cache dir) the result is stored under
+    the video's content hash and scan settings, so re-runs skip the scan.
+    """
+    if not config.ingest.select_segment:
+        return 0.0
+    key = None
+    if cache_dir:
+        key = segment_cache_key(path, config.ingest, config.face, max_frames, _detector_id(config.face))
+        start = load_segment_start(cache_dir, key)
+        if start is not None:
+            logger.info(f"Segment pre-scan loaded from cache: reading from {start:.1f}s")
+            return start
+
+    try:
+        start = _scan_face_segment(path, config, max_frames)
+    except Exception as e:
+        logger.warning(f"Segment pre-scan failed, reading from the start: {e}")
+        return 0.0
+    if key is not None:
+        try:
+            save_segment_start(cache_dir, key, start)
+        except OSError as e:
+            logger.warning(f"Could not write segment cache: {e}")
+    return start
+
+
+def _scan_face_segment(path: str, config: Config, max_frames: Optional[int]) -> float:
+    ingest = config.ingest
+    with open_decoder(
+        path,
+        max_dim=ingest.segment_scan_max_dim,
+        backend=ingest.decoder,
+        threads=ingest.decoder_threads,
+    ) as decoder:
+        duration = decoder.frame_count / decoder.fps if decoder.frame_count > 0 else 0.0
+        budget = max_frames / decoder.fps if max_frames else 0.0
+        if budget <= 0 or duration <= budget:
+            return 0.0
+
+        step = max(ingest.segment_scan_step, duration / _SEGMENT_SCAN_MAX_SAMPLES)
+        dnn_net = _get_dnn_detector(config.face)
+        frame = np.empty(decoder.frame_shape, dtype=np.uint8)
+        times: List[float] = []
+        hits: List[bool] = []
+        for target in np.arange(0.0, duration, step):
+            decoder.seek(float(target), exact=False)
+            t = decoder.read_into(frame)
+            if t is None:
+                break
+            if times and t <= times[-1]:
+                # Landed on a keyframe that was already sampled.
+                continue
+            times.append(t)
+            hits.append(_detect_best_face(frame, dnn_net) is not None)
+
+    if not any(hits):
+        logger.info(f"Segment pre-scan: no face in {len(times)} samples; reading from the start")
+        return 0.0
+
+    # Face samples per candidate segment via prefix sums over the samples.
+    sample_times = np.asarray(times)
+    last_start = duration - budget
+    starts = np.unique(np.append(sample_times[sample_times <= last_start], [0.0, last_start]))
+    cum = np.concatenate(([0], np.cumsum(hits)))
+    lo = np.searchsorted(sample_times, starts, side="left")
+    hi = np.searchsorted(sample_times, starts + budget, side="left")
+    counts = cum[hi] - cum[lo]
+    best = int(np.argmax(counts))
+    start = float(starts[best]) if counts[best] > counts[0] else 0.0
+    logger.info(
+        f"Segment pre-scan: face in {sum(hits)}/{len(times)} samples; "
+        f"reading {start:.1f}s-{start + budget:.1f}s of {duration:.1f}s"
+    )
+    return start
+
+
+def adaptive_stop_enabled(config: Config) -> bool:
+    """True when scan_faces should drive decoding (either stop rule is set)."""
+    return config.face.stop_after_face_seconds > 0 or config.face.give_up_after_seconds > 0
+
+
+def scan_faces(source: Union[FrameSource, str], config: Config) -> Dict[str, Any]:
+    """
+    Detect faces while decoding and stop reading as soon as the outcome is
+    clear: `stop_after_face_seconds` of frames with a face have been seen,
+    or no face at all within the first `give_up_after_seconds`.
+
+    Returns {"frames": per-frame detections for the frames read,
+    "stop_reason": "face_seconds_reached" | "no_face" | None}. Callers then
+    `limit` the source to those frames and pass the result to analyze_faces.
+    """
+    source = as_frame_source(source)
+    _log_detector(config.face)
+    target = config.face.stop_after_face_seconds
+    give_up = config.face.give_up_after_seconds
+
+    times: List[float] = []
+    chunks = source.iter_chunks()
+
+    def _frames() -> Iterator[np.ndarray]:
+        for chunk in chunks:
+            for i in range(len(chunk)):
+                times.append(float(chunk.timestamps[i]))
+                yield chunk.frames[i]
+
+    results: List[Dict[str, Any]] = []
+    stop_reason = None
+    face_seconds = 0.0
+    seen_face = False
+    for rec in _iter_face_detections(_frames(), config.face):
+        # Detection batches run behind decoding, so index times by result.
+        i = len(results)
+        results.append(rec)
+        t = times[i]
+        if rec["box"] is not None:
+            seen_face = True
+            if i > 0:
+                face_seconds += t - times[i - 1]
+        if target > 0 and face_seconds >= target:
+            stop_reason = "face_seconds_reached"
+            break
+        if give_up > 0 and not seen_face and t - times[0] >= give_up:
+            stop_reason = "no_face"
+            break
+    # Closing the chunk iterator stops the decoder (and any prefetch thread).
+    chunks.close()
+
+    # A deliberate "no_face" give-up is not a detector problem.
+    _log_detection_summary(results, warn_if_empty=stop_reason is None)
+    if stop_reason is not None:
+        logger.info(
+            f"Stopped decoding after {len(results)} frames ({t - times[0]:.1f}s): {stop_reason}"
+        )
+    return {"frames": results, "stop_reason": stop_reason}
+
+
+def _detect_faces_for_source(source: FrameSource, config: FaceConfig) -> List[Dict[str, Any]]:
+    if config.detect_workers > 1:
+        return _detect_faces_parallel(
+            source.iter_chunks(config.detect_chunk_frames or None), config
+        )
+    return _detect_faces(source.iter_frames(), config)
+
+
+def _detect_face_track(source: FrameSource, config: FaceConfig) -> FaceTrack:
+    """
+    Detect faces over `source`. With `cache_detections` and a source cache
+    dir, the track is looked up by content address first (see
+    face_cache_key) and stored after a miss.
+    """
+    key = None
+    if config.cache_detections and source.cache_dir:
+        key = face_cache_key(source, config, _detector_id(config))
+        track = load_face_track(source.cache_dir, key)
+        if track is not None and len(track) == len(source.timestamps):
+            logger.info(f"Face detections loaded from cache ({len(track)} frames)")
+            return track
+
+    track = FaceTrack.from_detections(source.timestamps, _detect_faces_for_source(source, config))
+    if key is not None:
+        try:
+            save_face_track(source.cache_dir, key, track)
+        except OSError as e:
+            logger.warning(f"Could not write face cache: {e}")
+    return track
+
+
+def analyze_faces(
+    source: Union[FrameSource, str],
+    ingest_result: IngestResult,
+    config: Config,
+    scan: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run per-frame face detection and basic tracking quality metrics.
+
+    metrics["frames"] is a FaceTrack.
+
+    `scan` is the result of scan_faces when detection already ran while
+    decoding; its detections are reused instead of detecting again.
+    """
+    source = as_frame_source(source)
     log_params(
         logger,
         "face",
-        {"path": path, "face": asdict(config.face), "num_windows": len(ingest_result.windows)},
+        {"path": source.path, "face": asdict(config.face), "num_windows": len(ingest_result.windows)},
     )
 
-    frames, timestamps, _fps = read_video(path)
-    per_frame = _detect_faces(frames)
+    if scan is not None:
+        track = FaceTrack.from_detections(source.timestamps, scan["frames"])
+    else:
+        track = _detect_face_track(source, config.face)
+    if config.face.smooth_boxes:
+        boxes = smooth_boxes(
+            track.boxes,
+            track.valid,
+            config.face.smooth_process_noise,
+            config.face.smooth_measurement_noise,
+        )
+        track = FaceTrack.from_boxes(track.times, boxes, track.conf)
 
     window_summaries: List[Dict[str, Any]] = []
     reasons: List[str] = []
     min_fraction = config.face.min_face_fraction
 
+    # Windows live on the ingest resampling grid: map per-frame validity onto
+    # it and take per-window fractions from prefix sums over the spans.
+    fractions = np.zeros(len(ingest_result.windows))
+    grid = ingest_result.grid
+    if grid is not None and ingest_result.window_index is not None:
+        has_face = track.conf > 0.0
+        fractions = ingest_result.window_index.fractions(grid.take(has_face))
+
     for w in ingest_result.windows:
-        mask = (timestamps >= w.start_time) & (timestamps <= w.end_time)
-        idxs = np.where(mask)[0]
-        if len(idxs) == 0:
-            fraction = 0.0
-        else:
-            num_valid = sum(
-                1 for i in idxs if per_frame[i]["tracking_confidence"] > 0.0
-            )
-            fraction = num_valid / len(idxs)
+        fraction = float(fractions[w.index])
 
         usable = fraction >= min_fraction
         if not usable:
@@ -284,16 +786,11 @@ def analyze_faces(path: str, ingest_result: IngestResult, config: Config) -> Dic
         )
 
     metrics: Dict[str, Any] = {
-        "frames": [
-            {
-                "time": float(timestamps[i]),
-                "box": rec["box"],
-                "landmarks": rec["landmarks"],
-                "tracking_confidence": float(rec["tracking_confidence"]),
-            }
-            for i, rec in enumerate(per_frame)
-        ],
+        # Serialized to the per-frame list form by AnalysisResult.to_dict.
+        "frames": track,
         "windows": window_summaries,
     }
+    if scan is not None:
+        metrics["scan"] = {"frames_read": len(track), "stop_reason": scan["stop_reason"]}
 
     return {"metrics": metrics, "reasons": reasons}
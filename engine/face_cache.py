@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .config import FaceConfig, IngestConfig
+from .types import FaceTrack
+from .utils.logging import get_logger
+from .utils.video import FrameSource, video_fingerprint
+
+
+logger = get_logger(__name__)
+
+# Bump when the stored arrays or the detection code change meaning.
+_CACHE_VERSION = 1
+
+# FaceConfig fields that do not change the raw detections (post-processing,
+# thread counts, later stages); every other field is part of the key.
+_UNKEYED_FIELDS = frozenset(
+    {
+        "min_face_fraction",
+        "face_tube",
+        "smooth_boxes",
+        "smooth_measurement_noise",
+        "smooth_process_noise",
+        "cache_detections",
+        "onnx_threads",
+        "cv_threads",
+        "stop_after_face_seconds",
+        "give_up_after_seconds",
+    }
+)
+
+
+def face_cache_key(source: FrameSource, config: FaceConfig, detector_id: str) -> str:
+    """
+    Content address of the detections for `source` under `config`.
+
+    Combines the video's content hash, the decode settings that shape the
+    frames, the detector actually loaded (after any fallback) and the face
+    settings that affect detection.
+    """
+    face = {k: v for k, v in asdict(config).items() if k not in _UNKEYED_FIELDS}
+    payload = {
+        "version": _CACHE_VERSION,
+        "video": video_fingerprint(source.path),
+        "decode": [source.max_dim, source.max_frames, source.backend, source.start_time],
+        "detector": detector_id,
+        "face": face,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def segment_cache_key(
+    path: str,
+    ingest: IngestConfig,
+    face: FaceConfig,
+    max_frames: Optional[int],
+    detector_id: str,
+) -> str:
+    """Content address of the segment pre-scan result for `path` (see select_face_segment)."""
+    payload = {
+        "version": _CACHE_VERSION,
+        "video": video_fingerprint(path),
+        "scan": [max_frames, ingest.segment_scan_step, ingest.segment_scan_max_dim, ingest.decoder],
+        "detector": detector_id,
+        "face": {k: v for k, v in asdict(face).items() if k not in _UNKEYED_FIELDS},
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _cache_path(cache_dir: str, key: str) -> Path:
+    return Path(cache_dir) / f"faces_{key[:32]}.npz"
+
+
+def _segment_path(cache_dir: str, key: str) -> Path:
+    return Path(cache_dir) / f"segment_{key[:32]}.json"
+
+
+def load_segment_start(cache_dir: str, key: str) -> Optional[float]:
+    """The cached segment start time for `key`, or None (missing or unreadable entry)."""
+    path = _segment_path(cache_dir, key)
+    if not path.exists():
+        return None
+    try:
+        return float(json.loads(path.read_text())["start_time"])
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Ignoring unreadable segment cache entry {path.name}: {e}")
+        return None
+
+
+def save_segment_start(cache_dir: str, key: str, start_time: float) -> None:
+    path = _segment_path(cache_dir, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.json")
+    tmp_path.write_text(json.dumps({"start_time": start_time}))
+    os.replace(tmp_path, path)
+
+
+def load_face_track(cache_dir: str, key: str) -> Optional[FaceTrack]:
+    """The cached track for `key`, or None (missing or unreadable entry)."""
+    path = _cache_path(cache_dir, key)
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            return FaceTrack.from_boxes(data["times"], data["boxes"], data["conf"])
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Ignoring unreadable face cache entry {path.name}: {e}")
+        return None
+
+
+def save_face_track(cache_dir: str, key: str, track: FaceTrack) -> None:
+    """Store the raw (unsmoothed) track; landmarks are rebuilt on load."""
+    path = _cache_path(cache_dir, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp_path, times=track.times, boxes=track.boxes, conf=track.conf)
+    os.replace(tmp_path, path)
@@ -1,88 +1,131 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import List
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 
 from .config import Config
-from .types import IngestResult, IngestWindow
+from .types import IngestResult, IngestWindow, ResampleGrid, WindowIndex
 from .utils.logging import get_logger, log_params
-from .utils.video import read_video
+from .utils.video import FrameSource, as_frame_source
 
 
 logger = get_logger(__name__)
 
 
-def _resample_frames(frames: np.ndarray, timestamps: np.ndarray, target_fps: float):
-    if len(frames) == 0:
-        return frames, timestamps
+def open_frame_source(
+    path: str, config: Config, cache_dir: Optional[str] = None, start_time: float = 0.0
+) -> FrameSource:
+    """
+    Build the FrameSource for `path` according to the ingest config.
+
+    `cache_dir` (e.g. the job's temp dir) enables the on-disk memmap frame
+    cache when `config.ingest.cache_frames` is set. `start_time` is where
+    reading starts, e.g. from engine.face.select_face_segment.
+    """
+    return FrameSource(
+        path,
+        keep_frames=not config.ingest.stream_frames,
+        chunk_size=config.ingest.chunk_size,
+        prefetch=config.ingest.prefetch_chunks,
+        cache_dir=cache_dir if config.ingest.cache_frames else None,
+        backend=config.ingest.decoder,
+        threads=config.ingest.decoder_threads,
+        start_time=start_time,
+    )
+
+
+def _resample_grid(
+    timestamps: np.ndarray, source_fps: float, target_fps: float
+) -> ResampleGrid:
+    """
+    Map a uniform target-fps grid onto the nearest source frames.
+
+    The grid steps by exactly 1 / target_fps from the first timestamp, so a
+    source already at the target rate maps onto itself frame for frame.
+    """
+    identity = ResampleGrid(
+        times=np.asarray(timestamps, dtype=float),
+        source_indices=np.arange(len(timestamps)),
+        fps=float(source_fps),
+    )
+    if len(timestamps) < 2 or target_fps <= 0:
+        return identity
 
     duration = timestamps[-1] - timestamps[0]
     if duration <= 0:
-        return frames, timestamps
+        return identity
 
-    num_target = int(duration * target_fps)
+    num_target = int(np.floor(duration * target_fps + 1e-6)) + 1
     if num_target <= 1:
-        return frames, timestamps
-
-    new_times = np.linspace(timestamps[0], timestamps[-1], num_target)
-    indices = np.clip(
-        np.round((new_times - timestamps[0]) / (timestamps[1] - timestamps[0])).astype(
-            int
-        ),
-        0,
-        len(frames) - 1,
+        return identity
+
+    times = timestamps[0] + np.arange(num_target) / target_fps
+    right = np.clip(np.searchsorted(timestamps, times), 1, len(timestamps) - 1)
+    left = right - 1
+    nearest = np.where(
+        times - timestamps[left] <= timestamps[right] - times, left, right
     )
-    return frames[indices], new_times
+    return ResampleGrid(times=times, source_indices=nearest, fps=float(target_fps))
 
 
 def _make_windows(
-    frames: np.ndarray,
+    frame_shape: Tuple[int, int],
     timestamps: np.ndarray,
     fps: float,
     window_seconds: float,
     overlap_ratio: float,
-) -> List[IngestWindow]:
+) -> Tuple[List[IngestWindow], WindowIndex]:
+    """
+    Cut overlapping windows over `timestamps` (sorted).
+
+    Window spans are found with one np.searchsorted per edge, so the cost is
+    O(num_windows * log n) rather than a full mask per window.
+    """
+    empty = WindowIndex(starts=np.zeros(0, dtype=np.int64), stops=np.zeros(0, dtype=np.int64))
     total_duration = timestamps[-1] - timestamps[0] if len(timestamps) > 0 else 0.0
     if total_duration <= 0:
-        return []
+        return [], empty
 
     step = window_seconds * (1.0 - overlap_ratio)
+    if step <= 0:
+        raise ValueError(f"overlap_ratio must be < 1, got {overlap_ratio}")
+
+    num_starts = int(np.ceil(total_duration / step))
+    start_times = timestamps[0] + step * np.arange(num_starts)
+    start_times = start_times[start_times < timestamps[-1]]
+    starts = np.searchsorted(timestamps, start_times, side="left")
+    stops = np.searchsorted(timestamps, start_times + window_seconds, side="right")
+    keep = stops > starts
+    index = WindowIndex(starts=starts[keep], stops=stops[keep])
+
+    height, width = frame_shape
     windows: List[IngestWindow] = []
-    start = timestamps[0]
-    index = 0
-    height, width = frames.shape[1:3] if len(frames) else (0, 0)
-
-    while start < timestamps[-1]:
-        end = start + window_seconds
-        mask = (timestamps >= start) & (timestamps <= end)
-        if not np.any(mask):
-            start += step
-            continue
-        ts_w = timestamps[mask]
-        duration = ts_w[-1] - ts_w[0]
-        window = IngestWindow(
-            index=index,
-            start_time=float(ts_w[0]),
-            end_time=float(ts_w[-1]),
-            fps=float(fps),
-            resolution={"width": int(width), "height": int(height)},
-            duration=float(duration),
-            dropped_frames_estimate=0.0,
+    for i, (lo, hi) in enumerate(zip(index.starts, index.stops)):
+        t_first = float(timestamps[lo])
+        t_last = float(timestamps[hi - 1])
+        windows.append(
+            IngestWindow(
+                index=i,
+                start_time=t_first,
+                end_time=t_last,
+                fps=float(fps),
+                resolution={"width": int(width), "height": int(height)},
+                duration=t_last - t_first,
+                dropped_frames_estimate=0.0,
+            )
         )
-        windows.append(window)
-        index += 1
-        start += step
 
-    return windows
+    return windows, index
 
 
-def ingest_video(path: str, config: Config) -> IngestResult:
-    log_params(logger, "ingest", {"path": path, "ingest": asdict(config.ingest)})
+def ingest_video(source: Union[FrameSource, str], config: Config) -> IngestResult:
+    source = as_frame_source(source)
+    log_params(logger, "ingest", {"path": source.path, "ingest": asdict(config.ingest)})
 
-    frames, timestamps, fps = read_video(path)
-    if len(frames) == 0:
+    timestamps, fps = source.timestamps, source.fps
+    if len(timestamps) == 0:
         return IngestResult(
             windows=[],
             metrics={"error": "no_frames"},
@@ -97,23 +140,30 @@ def ingest_video(path: str, config: Config) -> IngestResult:
             reasons=["too_short"],
         )
 
-    frames_r, ts_r = _resample_frames(frames, timestamps, config.ingest.target_fps)
+    grid = _resample_grid(timestamps, fps, config.ingest.target_fps)
 
-    windows = _make_windows(
-        frames_r,
-        ts_r,
-        config.ingest.target_fps,
+    windows, window_index = _make_windows(
+        source.frame_shape,
+        grid.times,
+        grid.fps,
         config.ingest.window_seconds,
         config.ingest.overlap_ratio,
     )
 
     metrics = {
-        "num_frames": int(len(frames_r)),
+        "num_frames": int(len(grid)),
         "duration": duration,
+        "start_time": float(timestamps[0]),
         "source_fps": float(fps),
         "target_fps": float(config.ingest.target_fps),
         "num_windows": len(windows),
     }
 
-    return IngestResult(windows=windows, metrics=metrics, reasons=[])
+    return IngestResult(
+        windows=windows,
+        metrics=metrics,
+        reasons=[],
+        grid=grid,
+        window_index=window_index,
+    )
 
@@ -7,6 +7,15 @@ import numpy as np
 from .config import Config
 
 
+def _spectrum_sqi(spectrum: Dict[str, Any]) -> float:
+    """SNR proxy (peak power / median power) of one spectrum, mapped to (0, 1)."""
+    power = np.asarray((spectrum or {}).get("power", []), dtype=float)
+    if power.size == 0:
+        return 0.0
+    snr = float(power.max()) / max(float(np.median(power)), 1e-6)
+    return float(np.tanh(snr / 10.0))
+
+
 def compute_sqi(
     rppg_metrics: Dict[str, Any],
     stabilization_metrics: Dict[str, Any],
@@ -17,20 +26,29 @@ def compute_sqi(
 
     - SNR proxy: peak power / median power in band.
     - Motion penalty: derived from residual motion metric per window.
+
+    With windowed rPPG (rppg_metrics["windows"]), a region's SQI is the mean
+    of its per-window spectrum SQIs, and "windows" reports each window's SQI.
     """
     regions = rppg_metrics["regions"]
+    windows = rppg_metrics.get("windows") or []
     sqi_per_region: Dict[str, float] = {}
+    window_sqi: List[Dict[str, Any]] = []
 
-    for name, data in regions.items():
-        spectrum = data.get("spectrum") or {}
-        power = np.asarray(spectrum.get("power", []), dtype=float)
-        if power.size == 0:
-            sqi_per_region[name] = 0.0
-            continue
-        peak = float(power.max())
-        noise = float(np.median(power)) if power.size > 0 else 1.0
-        snr = peak / max(noise, 1e-6)
-        sqi_per_region[name] = float(np.tanh(snr / 10.0))  # map to (0, 1)
+    if windows:
+        per_window = [
+            {name: _spectrum_sqi(w["regions"][name]["spectrum"]) for name in regions}
+            for w in windows
+        ]
+        for name in regions:
+            sqi_per_region[name] = float(np.mean([sqis[name] for sqis in per_window]))
+        window_sqi = [
+            {"index": w["index"], "sqi": float(np.mean(list(sqis.values())))}
+            for w, sqis in zip(windows, per_window)
+        ]
+    else:
+        for name, data in regions.items():
+            sqi_per_region[name] = _spectrum_sqi(data.get("spectrum"))
 
     # Motion penalty: average residual_motion, mapped into [0,1]
     motions: List[float] = [
@@ -43,10 +61,13 @@ def compute_sqi(
     base_sqi = float(sqi_values.mean())
     aggregate_sqi = float(base_sqi * (1.0 - 0.5 * motion_penalty))
 
-    return {
+    result: Dict[str, Any] = {
         "regions": sqi_per_region,
         "aggregate": aggregate_sqi,
         "motion_penalty": motion_penalty,
         "tau_sqi": config.quality.tau_sqi,
     }
+    if window_sqi:
+        result["windows"] = window_sqi
+    return result
 
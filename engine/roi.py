@@ -1,158 +1,99 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
-import cv2
 import numpy as np
 
 from .config import Config
-from .types import IngestResult
+from .roi_geometry import REGION_NAMES, RegionGeometry
+from .types import FaceTrack, IngestResult
 from .utils.logging import get_logger, log_params
-from .utils.video import read_video
+from .utils.video import FrameSource, as_frame_source
 
 
 logger = get_logger(__name__)
 
 
-def _region_masks_for_frame(frame_shape, face_box):
-    h, w = frame_shape[:2]
-    if face_box is None:
-        return {}
-    
-    # Validate face_box format
-    if not isinstance(face_box, (list, tuple)) or len(face_box) != 4:
-        logger.warning(f"Invalid face_box format: {face_box}")
-        return {}
-    
-    x, y, fw, fh = face_box
-    x, y, fw, fh = int(x), int(y), int(fw), int(fh)
-    
-    # Validate face box is within frame bounds
-    if fw <= 0 or fh <= 0:
-        logger.warning(f"Invalid face box dimensions: w={fw}, h={fh}")
-        return {}
-    
-    # Clamp face box to frame bounds
-    x = max(0, min(x, w - 1))
-    y = max(0, min(y, h - 1))
-    fw = min(fw, w - x)
-    fh = min(fh, h - y)
-    
-    if fw <= 0 or fh <= 0:
-        logger.warning(f"Face box clamped to invalid size: w={fw}, h={fh} at ({x},{y})")
-        return {}
-    
-    # Calculate ROI regions with bounds checking
-    forehead_y0 = max(0, int(y + 0.0 * fh))
-    forehead_y1 = min(h, int(y + 0.3 * fh))
-    forehead_x0 = max(0, x)
-    forehead_x1 = min(w, x + fw)
-    
-    cheek_y0 = max(0, int(y + 0.3 * fh))
-    cheek_y1 = min(h, int(y + 0.7 * fh))
-    left_cheek_x0 = max(0, int(x + 0.0 * fw))
-    left_cheek_x1 = min(w, int(x + 0.5 * fw))
-    right_cheek_x0 = max(0, int(x + 0.5 * fw))
-    right_cheek_x1 = min(w, int(x + 1.0 * fw))
-    
-    forehead = (slice(forehead_y0, forehead_y1), slice(forehead_x0, forehead_x1))
-    left_cheek = (slice(cheek_y0, cheek_y1), slice(left_cheek_x0, left_cheek_x1))
-    right_cheek = (slice(cheek_y0, cheek_y1), slice(right_cheek_x0, right_cheek_x1))
-    
-    masks = {}
-    base = np.zeros((h, w), dtype=bool)
-    for name, slc in {
-        "forehead": forehead,
-        "left_cheek": left_cheek,
-        "right_cheek": right_cheek,
-    }.items():
-        # Validate slice bounds
-        y_slice, x_slice = slc
-        if y_slice.start < y_slice.stop and x_slice.start < x_slice.stop:
-            m = base.copy()
-            m[slc] = True
-            masks[name] = m
-        else:
-            # Invalid slice - region is empty or out of bounds
-            masks[name] = base.copy()
-    
-    return masks
-
-
-def extract_rois(path: str, face_metrics: Dict[str, Any], ingest_result: IngestResult, config: Config) -> Dict[str, Any]:
+def extract_rois(
+    source: Union[FrameSource, str],
+    face_metrics: Dict[str, Any],
+    ingest_result: IngestResult,
+    config: Config,
+) -> Dict[str, Any]:
     """
-    Produce simple ROI masks (forehead, left/right cheek) per frame and coverage stats.
-    """
-    log_params(logger, "roi", {"path": path, "roi": asdict(config.roi)})
+    Produce simple ROI regions (forehead, left/right cheek) per frame and coverage stats.
 
-    frames, timestamps, _fps = read_video(path)
-    per_frame_face = {m["time"]: m for m in face_metrics["frames"]}
+    Regions are the rectangles of engine.roi_geometry, so coverage is
+    computed from their areas for all frames at once; no per-frame masks are
+    built. Returns {"metrics", "geometry": RegionGeometry, "region_valid":
+    (T, R) bool}.
+    """
+    source = as_frame_source(source)
+    log_params(logger, "roi", {"path": source.path, "roi": asdict(config.roi)})
 
-    per_frame: List[Dict[str, Any]] = []
+    timestamps = source.timestamps
+    frame_shape = source.frame_shape
+    track: FaceTrack = face_metrics["frames"]
     min_cov = config.roi.min_region_coverage
 
-    frames_with_valid_box = 0
-    frames_with_invalid_box = 0
-    
-    for idx, t in enumerate(timestamps):
-        rec = per_frame_face.get(float(t))
-        if rec is None:
-            rec = face_metrics["frames"][min(idx, len(face_metrics["frames"]) - 1)]
-        box = rec["box"]
-        
-        if idx < 3:
-            frame_h, frame_w = frames[idx].shape[:2]
-            if box:
-                logger.info(f"ROI frame {idx}: face_box={box}, frame_size=({frame_w}x{frame_h})")
-            else:
-                logger.warning(f"ROI frame {idx}: No face box available")
-        
-        masks = _region_masks_for_frame(frames[idx].shape, box)
-        
-        # Compute coverage relative to face area (not frame area) so the threshold
-        # is scale-independent and works for both close-ups and distant subjects.
-        if box and isinstance(box, (list, tuple)) and len(box) == 4:
-            face_area = max(1, int(box[2]) * int(box[3]))
-        else:
-            face_area = 1
-        
-        regions: Dict[str, Any] = {}
-        
-        if box:
-            frames_with_valid_box += 1
+    n = len(timestamps)
+    geometry = RegionGeometry.from_track(track, frame_shape, n)
+    boxes, has_box = geometry.boxes, geometry.has_box
+
+    # Coverage relative to face area (not frame area) so the threshold is
+    # scale-independent and works for both close-ups and distant subjects.
+    # Regions are rectangles, so coverage is their area: no masks needed.
+    face_area = boxes[:, 2].astype(np.int64) * boxes[:, 3]
+    areas = geometry.areas
+    coverage = np.where(
+        (face_area > 1)[:, None], areas / np.maximum(face_area, 1)[:, None], 0.0
+    )
+    region_valid = (coverage >= min_cov) & has_box[:, None]
+
+    frame_h, frame_w = frame_shape
+    for idx in range(min(3, n)):
+        if has_box[idx]:
+            logger.info(
+                f"ROI frame {idx}: face_box={boxes[idx].tolist()}, "
+                f"frame_size=({frame_w}x{frame_h})"
+            )
         else:
-            frames_with_invalid_box += 1
-        
-        for name, m in masks.items():
-            coverage = float(m.sum()) / float(face_area) if face_area > 1 else 0.0
-            regions[name] = {
-                "coverage": coverage,
-                "valid": coverage >= min_cov,
-            }
-            if idx == 0:
-                logger.info(
-                    f"ROI frame 0 - {name}: coverage={coverage:.4f} (of face area), "
-                    f"valid={coverage >= min_cov}, threshold={min_cov}"
-                )
-        
-        # Store box so rppg can compute per-ROI pixel means without re-detecting
-        per_frame.append({"time": float(t), "regions": regions, "box": box})
-    
+            logger.warning(f"ROI frame {idx}: No face box available")
+    if n and has_box[0]:
+        for r, name in enumerate(REGION_NAMES):
+            logger.info(
+                f"ROI frame 0 - {name}: coverage={coverage[0, r]:.4f} (of face area), "
+                f"valid={bool(region_valid[0, r])}, threshold={min_cov}"
+            )
+
+    frames_with_valid_box = int(has_box.sum())
     logger.info(
         f"ROI extraction: {frames_with_valid_box} frames with face box, "
-        f"{frames_with_invalid_box} frames without face box"
+        f"{n - frames_with_valid_box} frames without face box"
     )
 
+    # Per-frame records; the box is kept so rppg can compute per-ROI pixel
+    # means without re-detecting.
+    coverage_list = coverage.tolist()
+    valid_list = region_valid.tolist()
+    boxes_list = boxes.tolist()
+    per_frame: List[Dict[str, Any]] = []
+    for idx, t in enumerate(timestamps.tolist()):
+        regions: Dict[str, Any] = {}
+        if has_box[idx]:
+            regions = {
+                name: {"coverage": coverage_list[idx][r], "valid": valid_list[idx][r]}
+                for r, name in enumerate(REGION_NAMES)
+            }
+        per_frame.append(
+            {"time": t, "regions": regions, "box": boxes_list[idx] if has_box[idx] else None}
+        )
+
     # Compact summary for API/diagnostics (avoid sending thousands of frame entries)
-    regions_list = ["forehead", "left_cheek", "right_cheek"]
-    frames_with_all_valid = sum(
-        1 for f in per_frame
-        if all((f.get("regions") or {}).get(r, {}).get("valid") for r in regions_list)
-    )
+    frames_with_all_valid = int(region_valid.all(axis=1).sum())
     frames_per_region = {
-        name: sum(1 for f in per_frame if (f.get("regions") or {}).get(name, {}).get("valid"))
-        for name in regions_list
+        name: int(region_valid[:, r].sum()) for r, name in enumerate(REGION_NAMES)
     }
     metrics: Dict[str, Any] = {
         "frames": per_frame,
@@ -163,5 +104,7 @@ def extract_rois(path: str, face_metrics: Dict[str, Any], ingest_result: IngestR
         },
     }
 
-    return {"metrics": metrics}
+    # The geometry and validity arrays feed rppg directly; metrics hold the
+    # per-frame records for serialization.
+    return {"metrics": metrics, "geometry": geometry, "region_valid": region_valid}
 
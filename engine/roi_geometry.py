@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .types import FaceTrack
+
+
+REGION_NAMES = ("forehead", "left_cheek", "right_cheek")
+
+# Region rectangles as (x0, y0, x1, y1) fractions of the face box.
+_REGION_FRACTIONS = np.array(
+    [
+        [0.0, 0.0, 1.0, 0.3],  # forehead
+        [0.0, 0.3, 0.5, 0.7],  # left cheek
+        [0.5, 0.3, 1.0, 0.7],  # right cheek
+    ]
+)
+
+
+def patch_grid_fractions(rows: int, cols: int) -> np.ndarray:
+    """(rows * cols, 4) box fractions of a row-major grid of patches over the face box."""
+    i, j = np.divmod(np.arange(rows * cols), cols)
+    return np.stack([j / cols, i / rows, (j + 1) / cols, (i + 1) / rows], axis=1)
+
+
+def region_rects(
+    boxes: np.ndarray, frame_shape: Sequence[int], fractions: np.ndarray = _REGION_FRACTIONS
+) -> np.ndarray:
+    """
+    Region rectangles for every box at once.
+
+    `boxes` is (T, 4) face boxes (x, y, w, h), clamped into the frame first.
+    Returns (T, R, 4) int64 (x0, y0, x1, y1) per row of `fractions` (by
+    default the regions of REGION_NAMES, see also patch_grid_fractions),
+    clipped to the frame; an empty region has x1 <= x0 or y1 <= y0.
+    """
+    h, w = frame_shape[:2]
+    boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+    x = np.clip(boxes[:, 0], 0, w - 1)
+    y = np.clip(boxes[:, 1], 0, h - 1)
+    fw = np.minimum(boxes[:, 2], w - x)
+    fh = np.minimum(boxes[:, 3], h - y)
+    origin = np.stack([x, y, x, y], axis=1)[:, None, :]
+    size = np.stack([fw, fh, fw, fh], axis=1)[:, None, :]
+    rects = np.floor(origin + np.asarray(fractions)[None] * size).astype(np.int64)
+    rects[..., 0::2] = np.clip(rects[..., 0::2], 0, w)
+    rects[..., 1::2] = np.clip(rects[..., 1::2], 0, h)
+    return rects
+
+
+def rect_areas(rects: np.ndarray) -> np.ndarray:
+    """Pixel areas of (..., 4) (x0, y0, x1, y1) rectangles; 0 when empty."""
+    return np.maximum(rects[..., 2] - rects[..., 0], 0) * np.maximum(
+        rects[..., 3] - rects[..., 1], 0
+    )
+
+
+@dataclass
+class RegionGeometry:
+    """
+    ROI rectangles for every frame, computed once from the face track and
+    shared by the ROI, rPPG and evidence stages.
+
+    Attributes:
+        boxes: (T, 4) int32 face box (x, y, w, h) per frame; zeros without a face.
+        has_box: (T,) bool, True where the frame has a face box.
+        rects: (T, R, 4) int64 (x0, y0, x1, y1) frame coordinates per region
+            of REGION_NAMES (meaningless where has_box is False).
+        frame_shape: (height, width) of the frames.
+    """
+
+    boxes: np.ndarray
+    has_box: np.ndarray
+    rects: np.ndarray
+    frame_shape: Tuple[int, int]
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    @property
+    def areas(self) -> np.ndarray:
+        """(T, R) region areas in pixels; 0 for empty regions and frames without a face."""
+        return rect_areas(self.rects) * self.has_box[:, None]
+
+    @classmethod
+    def from_track(
+        cls, track: FaceTrack, frame_shape: Sequence[int], num_frames: int
+    ) -> "RegionGeometry":
+        """
+        Geometry for `num_frames` frames; frames past the end of the track
+        reuse its last box.
+        """
+        if len(track):
+            rows = np.minimum(np.arange(num_frames), len(track) - 1)
+            boxes, has_box = track.boxes[rows], track.valid[rows]
+        else:
+            boxes = np.zeros((num_frames, 4), dtype=np.int32)
+            has_box = np.zeros(num_frames, dtype=bool)
+        return cls.from_boxes(boxes, has_box, frame_shape)
+
+    @classmethod
+    def from_boxes(
+        cls, boxes: np.ndarray, has_box: np.ndarray, frame_shape: Sequence[int]
+    ) -> "RegionGeometry":
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        return cls(
+            boxes=boxes,
+            has_box=np.asarray(has_box, dtype=bool),
+            rects=region_rects(boxes, frame_shape),
+            frame_shape=(int(frame_shape[0]), int(frame_shape[1])),
+        )
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+import cv2
 import numpy as np
 from scipy import signal
 
 from .config import Config
-from .types import IngestResult
+from .roi_geometry import (
+    REGION_NAMES,
+    RegionGeometry,
+    patch_grid_fractions,
+    rect_areas,
+    region_rects,
+)
+from .rppg_methods import METHODS, pulse_signals
+from .tube import FaceTube
+from .types import IngestResult, IngestWindow
 from .utils.logging import get_logger, log_params
-from .utils.video import read_video
+from .utils.video import FrameSource, as_frame_source
 
 
 logger = get_logger(__name__)
 
 
-def _bandpass_filter(x: np.ndarray, fs: float, low: float, high: float) -> np.ndarray:
-    if len(x) < 4:
+def _bandpass_filter(
+    x: np.ndarray, fs: float, low: float, high: float, axis: int = -1
+) -> np.ndarray:
+    if x.shape[axis] < 4:
         return x
     nyq = 0.5 * fs
     low_n = low / nyq
@@ -24,103 +37,306 @@ def _bandpass_filter(x: np.ndarray, fs: float, low: float, high: float) -> np.nd
     if low_n <= 0 or high_n >= 1 or low_n >= high_n:
         return x
     b, a = signal.butter(3, [low_n, high_n], btype="band")
-    return signal.filtfilt(b, a, x)
-
-
-def _roi_slices_from_box(h: int, w: int, box) -> Dict[str, tuple]:
-    """Same ROI geometry as engine.roi: forehead, left/right cheek from face box."""
-    if box is None or len(box) != 4:
-        return {}
-    x, y, fw, fh = box
-    x, y = int(x), int(y)
-    fw, fh = int(fw), int(fh)
-    regions = {}
-    r0, r1 = max(0, y), min(h, y + int(0.3 * fh))
-    c0, c1 = max(0, x), min(w, x + fw)
-    if r1 > r0 and c1 > c0:
-        regions["forehead"] = (slice(r0, r1), slice(c0, c1))
-    r0, r1 = max(0, y + int(0.3 * fh)), min(h, y + int(0.7 * fh))
-    c0, c1 = max(0, x), min(w, x + int(0.5 * fw))
-    if r1 > r0 and c1 > c0:
-        regions["left_cheek"] = (slice(r0, r1), slice(c0, c1))
-    r0, r1 = max(0, y + int(0.3 * fh)), min(h, y + int(0.7 * fh))
-    c0, c1 = max(0, x + int(0.5 * fw)), min(w, x + fw)
-    if r1 > r0 and c1 > c0:
-        regions["right_cheek"] = (slice(r0, r1), slice(c0, c1))
-    return regions
-
-
-def _extract_chrom_signal(
-    r_raw: np.ndarray, g_raw: np.ndarray, b_raw: np.ndarray
+    return signal.filtfilt(b, a, x, axis=axis)
+
+
+def _roi_arrays(
+    roi_metrics: Dict[str, Any], frame_shape: Tuple[int, int]
+) -> Tuple[RegionGeometry, np.ndarray]:
+    """RegionGeometry and (T, R) region validity rebuilt from ROI per-frame records."""
+    roi_frames = roi_metrics.get("frames") or []
+    boxes = np.zeros((len(roi_frames), 4), dtype=np.int32)
+    has_box = np.zeros(len(roi_frames), dtype=bool)
+    valid = np.ones((len(roi_frames), len(REGION_NAMES)), dtype=bool)
+    for i, rec in enumerate(roi_frames):
+        box = rec.get("box")
+        if box is None or len(box) != 4:
+            continue
+        boxes[i], has_box[i] = box, True
+        regions = rec.get("regions") or {}
+        for r, name in enumerate(REGION_NAMES):
+            if name in regions:
+                valid[i, r] = bool(regions[name].get("valid", True))
+    return RegionGeometry.from_boxes(boxes, has_box, frame_shape), valid
+
+
+def _rect_means(frame: np.ndarray, rects: np.ndarray) -> np.ndarray:
+    """
+    Mean (R, G, B) inside each (x0, y0, x1, y1) rectangle of `rects` (P, 4).
+
+    One summed-area table (cv2.integral) over the rectangles' bounding box
+    gives every sum from four lookups, so the cost is a single pass over
+    those pixels whatever the number of rectangles. Empty rectangles give 0.
+    """
+    x0, y0 = rects[:, :2].min(axis=0)
+    x1, y1 = rects[:, 2:].max(axis=0)
+    table = cv2.integral(np.ascontiguousarray(frame[y0:y1, x0:x1]), sdepth=cv2.CV_64F)
+    local = rects - np.array([x0, y0, x0, y0])
+    lx0, ly0, lx1, ly1 = local.T
+    sums = table[ly1, lx1] - table[ly0, lx1] - table[ly1, lx0] + table[ly0, lx0]
+    means = sums / np.maximum(rect_areas(local), 1)[:, None]
+    return means[:, ::-1]  # BGR -> RGB
+
+
+def _extract_rgb_means(
+    pixels: Iterable[np.ndarray], rects: np.ndarray, selected: np.ndarray
 ) -> np.ndarray:
     """
-    CHROM (Chrominance-based) rPPG extraction.
+    Mean RGB of every rectangle in every selected frame.
 
-    De Haan & Jeanne (2013): uses a linear combination of chrominance
-    channels to cancel specular reflection and motion artifacts while
-    preserving the blood-volume pulse.
+    `rects` is (T, N, 4) per-frame rectangles and `selected` a (T,) bool
+    mask; returns (N, T, 3) float32, zero for frames not selected. Each
+    selected frame costs one _rect_means call (one integral image), however
+    many rectangles there are. Iteration stops after the last selected frame.
     """
-    n = len(r_raw)
-    if n < 4:
-        return g_raw
+    means = np.zeros((rects.shape[1], len(rects), 3), dtype=np.float32)
+    picked = np.flatnonzero(selected[: len(rects)])
+    stop = int(picked[-1]) + 1 if len(picked) else 0
+    for idx, frame in enumerate(pixels):
+        if idx >= stop:
+            break
+        if selected[idx]:
+            means[:, idx] = _rect_means(frame, rects[idx])
+    return means
 
-    r_mean = np.mean(r_raw)
-    g_mean = np.mean(g_raw)
-    b_mean = np.mean(b_raw)
 
-    if r_mean < 1 or g_mean < 1 or b_mean < 1:
-        return g_raw
+def _interp_samples(t_new: np.ndarray, t: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """np.interp along axis 1 of (N, K, C) `values`, for every series at once."""
+    j = np.clip(np.searchsorted(t, t_new, side="right") - 1, 0, len(t) - 2)
+    w = ((t_new - t[j]) / (t[j + 1] - t[j]))[None, :, None]
+    return values[:, j] * (1.0 - w) + values[:, j + 1] * w
 
-    xs = r_raw / r_mean - 1.0
-    ys = g_raw / g_mean - 1.0
-    zs = b_raw / b_mean - 1.0
 
-    s1 = 3.0 * xs - 2.0 * ys
-    s2 = 1.5 * xs + ys - 1.5 * zs
+def _pulse_spectra(
+    pulse: np.ndarray, fs: float, config: Config
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Detrended, bandpassed pulses and their Hann-windowed power spectra for
+    (N, K) raw pulses: (filtered (N, K), freqs (F,), power (N, F)).
+    """
+    filtered = _bandpass_filter(
+        signal.detrend(pulse, axis=1),
+        fs,
+        config.rppg.bandpass_low_hz,
+        config.rppg.bandpass_high_hz,
+        axis=1,
+    )
+    return (filtered,) + _power_spectra(filtered, fs)
+
 
-    std_s1 = np.std(s1)
-    std_s2 = np.std(s2)
-    if std_s2 < 1e-10:
-        return ys
+def _power_spectra(x: np.ndarray, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Hann-windowed power spectra of (N, K) signals: (freqs (F,), power (N, F))."""
+    n = x.shape[1]
+    power = np.abs(np.fft.rfft(x * np.hanning(n)[None, :], axis=1)) ** 2
+    return np.fft.rfftfreq(n, d=1.0 / fs), power
 
-    alpha = std_s1 / std_s2
-    rppg = s1 - alpha * s2
 
-    return rppg
+def _band_snr(
+    freqs: np.ndarray, power: np.ndarray, config: Config
+) -> Tuple[np.ndarray, np.ndarray]:
+    """In-band SNR (spectral peak / median inside the bandpass band) and peak frequency per row of `power`."""
+    band = (freqs >= config.rppg.bandpass_low_hz) & (freqs <= config.rppg.bandpass_high_hz)
+    if band.any():
+        power, freqs = power[:, band], freqs[band]
+    snr = power.max(axis=1) / np.maximum(np.median(power, axis=1), 1e-12)
+    return snr, freqs[power.argmax(axis=1)]
 
 
-def _extract_rgb_means_per_roi(
-    frame: np.ndarray, roi_slices: Dict[str, tuple]
-) -> Dict[str, Tuple[float, float, float]]:
-    """Extract mean R, G, B for each ROI region in a single frame."""
-    result = {}
-    for name, sl in roi_slices.items():
-        pixels = frame[sl]
-        if pixels.size == 0:
-            continue
-        r_mean = float(np.mean(pixels[:, :, 2]))
-        g_mean = float(np.mean(pixels[:, :, 1]))
-        b_mean = float(np.mean(pixels[:, :, 0]))
-        result[name] = (r_mean, g_mean, b_mean)
-    return result
+def _patch_pulse_map(
+    rgb: np.ndarray, fs: float, rows: int, cols: int, method: str, config: Config
+) -> Dict[str, Any]:
+    """
+    Per-patch pulse spectra (`method`) for (rows * cols, K, 3) RGB traces:
+    the in-band SNR and the peak frequency of every patch, as rows x cols maps.
+    """
+    band = (config.rppg.bandpass_low_hz, config.rppg.bandpass_high_hz)
+    pulse = pulse_signals(rgb, fs, [method], band)[method]
+    _filtered, freqs, power = _pulse_spectra(pulse, fs, config)
+    snr, peak_hz = _band_snr(freqs, power, config)
+    return {
+        "grid": [rows, cols],
+        "snr": snr.reshape(rows, cols).tolist(),
+        "peak_hz": peak_hz.reshape(rows, cols).tolist(),
+    }
+
+
+_MethodSnrs = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+
+def _method_spectra(
+    rgb: np.ndarray, fs: float, methods: Sequence[str], config: Config
+) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], _MethodSnrs]:
+    """
+    Run `methods` on (N, K, 3) RGB traces. Returns ({method: (filtered
+    (N, K), freqs, power (N, F))}, {method: (snr (N,), peak_hz (N,))}).
+    """
+    band = (config.rppg.bandpass_low_hz, config.rppg.bandpass_high_hz)
+    # Every method runs on the same traces; only the pulse step differs.
+    spectra = {
+        m: _pulse_spectra(pulse, fs, config)
+        for m, pulse in pulse_signals(rgb, fs, methods, band).items()
+    }
+    snrs = {m: _band_snr(freqs, power, config) for m, (_f, freqs, power) in spectra.items()}
+    return spectra, snrs
+
+
+def _segment_pulses(
+    rgb: np.ndarray, fs: float, methods: Sequence[str], method: str, config: Config
+) -> Tuple[str, np.ndarray, np.ndarray, np.ndarray, _MethodSnrs]:
+    """
+    Run `methods` on (N, K, 3) RGB traces and keep `method` ("auto": the
+    best mean in-band SNR). Returns (method, filtered (N, K), freqs, power
+    (N, F), {method: (snr (N,), peak_hz (N,))}).
+    """
+    spectra, snrs = _method_spectra(rgb, fs, methods, config)
+    if method == "auto":
+        method = max(methods, key=lambda m: float(np.mean(snrs[m][0])))
+    return (method,) + spectra[method] + (snrs,)
+
+
+def _method_scores(snrs: _MethodSnrs, region_names: Sequence[str]) -> Dict[str, Any]:
+    return {
+        m: {
+            "snr": float(np.mean(snr)),
+            "regions": {
+                name: {"snr": float(snr[r]), "peak_hz": float(peak_hz[r])}
+                for r, name in enumerate(region_names)
+            },
+        }
+        for m, (snr, peak_hz) in snrs.items()
+    }
+
+
+def _windowed_pulses(
+    rgb: np.ndarray,
+    times: np.ndarray,
+    fs: float,
+    windows: Sequence[IngestWindow],
+    methods: Sequence[str],
+    method: str,
+    region_names: Sequence[str],
+    config: Config,
+) -> Optional[Tuple[str, np.ndarray, List[Dict[str, Any]], _MethodSnrs]]:
+    """
+    Pulse extraction run independently on each ingest window of (N, K, 3)
+    RGB traces sampled at `times` (on `rppg.window_workers` threads).
+
+    Every window runs all `methods`; one `method` is kept for the whole
+    clip ("auto": the best SNR averaged over windows), since pulses of
+    different methods differ in shape and polarity. Each window's pulse is
+    detrended, bandpassed, normalized to unit variance and signed to
+    correlate with the window's green channel on its own, then the windows
+    are overlap-added with a Hann taper into one (N, K) pulse, as in POS.
+    Windows shorter than half `ingest.window_seconds` (the clip's tail) are
+    skipped. Returns (method, pulse, per-window records with spectra, mean
+    per-method SNRs), or None when no window is long enough.
+    """
+    min_samples = max(4, int(round(config.ingest.window_seconds * fs / 2)))
+    spans = []
+    for w in windows:
+        lo = int(np.searchsorted(times, w.start_time, side="left"))
+        hi = int(np.searchsorted(times, w.end_time, side="right"))
+        if hi - lo >= min_samples:
+            spans.append((w, lo, hi))
+    if not spans:
+        return None
+
+    def run(span: Tuple[IngestWindow, int, int]):
+        _w, lo, hi = span
+        return _method_spectra(rgb[:, lo:hi], fs, methods, config)
+
+    workers = config.rppg.window_workers
+    if workers > 1 and len(spans) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bioverify-rppg") as pool:
+            results = list(pool.map(run, spans))
+    else:
+        results = [run(span) for span in spans]
+
+    mean_snrs = {
+        m: (
+            np.mean([snrs[m][0] for _spectra, snrs in results], axis=0),
+            np.median([snrs[m][1] for _spectra, snrs in results], axis=0),
+        )
+        for m in methods
+    }
+    if method == "auto":
+        method = max(methods, key=lambda m: float(np.mean(mean_snrs[m][0])))
+
+    pulse = np.zeros(rgb.shape[:2])
+    weight = np.zeros(rgb.shape[1])
+    records: List[Dict[str, Any]] = []
+    for (w, lo, hi), (spectra, snrs) in zip(spans, results):
+        filtered, freqs, power = spectra[method]
+        green = rgb[:, lo:hi, 1] - rgb[:, lo:hi, 1].mean(axis=1, keepdims=True)
+        sign = np.sign(np.einsum("nk,nk->n", filtered, green))
+        filtered = filtered * np.where(sign == 0, 1.0, sign)[:, None]
+        taper = np.hanning(hi - lo + 2)[1:-1]
+        scale = np.maximum(filtered.std(axis=1, keepdims=True), 1e-12)
+        pulse[:, lo:hi] += taper * filtered / scale
+        weight[lo:hi] += taper
+        snr, peak_hz = snrs[method]
+        records.append(
+            {
+                "index": w.index,
+                "start_time": float(times[lo]),
+                "end_time": float(times[hi - 1]),
+                "method": method,
+                "regions": {
+                    name: {
+                        "snr": float(snr[r]),
+                        "peak_hz": float(peak_hz[r]),
+                        "spectrum": {"freqs_hz": freqs.tolist(), "power": power[r].tolist()},
+                    }
+                    for r, name in enumerate(region_names)
+                },
+            }
+        )
+    pulse /= np.maximum(weight, 1e-12)
+    return method, pulse, records, mean_snrs
 
 
 def extract_rppg(
-    path: str,
+    source: Union[FrameSource, str],
     ingest_result: IngestResult,
     roi_metrics: Dict[str, Any],
     config: Config,
+    face_tube: Optional[FaceTube] = None,
+    geometry: Optional[RegionGeometry] = None,
+    region_valid: Optional[np.ndarray] = None,
 ) -> Dict[str, Any]:
     """
-    Extract rPPG signals per ROI using the CHROM method.
+    Extract rPPG signals per ROI with the `rppg.method` pulse extractor
+    (CHROM by default; see engine.rppg_methods).
 
     Uses all three color channels (RGB) for robust pulse extraction,
-    then bandpass filters and computes power spectra.
+    then bandpass filters and computes power spectra. With `rppg.method`
+    "auto" or `rppg.compare_methods`, every method runs on the same RGB
+    traces and metrics["methods"] holds their per-region in-band SNR and
+    peak frequency; "auto" keeps the method with the best mean SNR.
+
+    When `face_tube` is given, pixels are read from its face patches instead
+    of the full frames.
+
+    With `rppg.windowed`, each ingest window is processed independently and
+    the window pulses are overlap-added into the clip signal;
+    metrics["windows"] holds every window's per-region SNR and spectrum
+    (used by SQI).
+
+    `geometry` / `region_valid` are the ROI rectangles and validity from
+    extract_rois; without them they are rebuilt from `roi_metrics`.
+
+    With `roi.patch_rows` / `roi.patch_cols` set, the face box is also split
+    into a grid of patches measured from integral images, and
+    metrics["patches"] holds their per-patch SNR and peak-frequency maps.
     """
+    source = as_frame_source(source)
     log_params(logger, "rppg", {"rppg": asdict(config.rppg)})
+    method = config.rppg.method
+    if method != "auto" and method not in METHODS:
+        raise ValueError(f"Unknown rPPG method {method!r}; expected 'auto' or one of {list(METHODS)}")
 
-    frames, timestamps, fps = read_video(path)
-    if len(frames) == 0:
+    timestamps, fps = source.timestamps, source.fps
+    if len(timestamps) == 0:
         empty_region = {"raw": [], "filtered": [], "spectrum": {}}
         return {
             "metrics": {
@@ -129,50 +345,61 @@ def extract_rppg(
                 "regions": {n: dict(empty_region) for n in ["forehead", "left_cheek", "right_cheek"]},
             }
         }
-    h, w = int(frames.shape[1]), int(frames.shape[2])
-
-    roi_frames = roi_metrics.get("frames") or []
-    region_names = ["forehead", "left_cheek", "right_cheek"]
-
-    # Collect per-frame RGB means for each region
-    rgb_per_region: Dict[str, List[Tuple[float, float, float]]] = {r: [] for r in region_names}
-    times: List[float] = []
-
-    for idx in range(len(timestamps)):
-        if idx >= len(roi_frames):
-            break
-        t = float(timestamps[idx])
-        frame_data = roi_frames[idx]
-        box = frame_data.get("box")
-        frame_regions = frame_data.get("regions") or {}
-        if box is None:
-            continue
-        roi_slices = _roi_slices_from_box(h, w, box)
-        if not roi_slices:
-            continue
-
-        rgb_means = _extract_rgb_means_per_roi(frames[idx], roi_slices)
-
-        # Require all three regions for aligned time series
-        frame_vals = {}
-        for name in region_names:
-            if name not in rgb_means:
-                break
-            region_info = frame_regions.get(name)
-            if region_info is not None and not region_info.get("valid", True):
-                break
-            frame_vals[name] = rgb_means[name]
-
-        if len(frame_vals) == len(region_names):
-            for name in region_names:
-                rgb_per_region[name].append(frame_vals[name])
-            times.append(t)
+    if geometry is None or region_valid is None:
+        geometry, region_valid = _roi_arrays(roi_metrics, source.frame_shape)
+    rects = geometry.rects
+    # Frames with a face and every region valid and non-empty.
+    usable = geometry.has_box & region_valid.all(axis=1) & (rect_areas(rects) > 0).all(axis=1)
+    rows, cols = config.roi.patch_rows, config.roi.patch_cols
+    patch_rects = None
+    if rows > 0 and cols > 0:
+        patch_rects = region_rects(
+            geometry.boxes, geometry.frame_shape, patch_grid_fractions(rows, cols)
+        )
+    if face_tube is not None:
+        # Patch coordinates: shift by each patch's origin.
+        shift = np.tile(face_tube.origins, 2)[:, None, :]
+        rects = rects - shift
+        if patch_rects is not None:
+            patch_rects = patch_rects - shift
+        usable &= face_tube.valid
+
+    region_names = list(REGION_NAMES)
+
+    # Sample on the ingest resampling grid so rPPG sees the same time base
+    # as the windows; only source frames the grid reads are measured.
+    grid = ingest_result.grid
+    if grid is not None and len(grid):
+        grid_times, grid_sources, fps = grid.times, grid.source_indices, grid.fps
+    else:
+        grid_times, grid_sources = timestamps, np.arange(len(timestamps))
+    in_grid = grid_sources < len(timestamps)
+    needed = np.zeros(len(timestamps), dtype=bool)
+    needed[grid_sources[in_grid]] = True
+
+    # One pass over the frames into (regions [+ patches], T, 3) means, only
+    # for needed frames with all regions valid. Without any, no frame is
+    # read (without a face tube that would decode the clip again).
+    all_rects = rects if patch_rects is None else np.concatenate([rects, patch_rects], axis=1)
+    selected = needed & usable
+    if selected.any():
+        pixels_iter = iter(face_tube.patches) if face_tube is not None else source.iter_frames()
+        means = _extract_rgb_means(pixels_iter, all_rects, selected)
+    else:
+        logger.info("rPPG: no frame with all regions valid; skipping pixel extraction")
+        means = np.zeros((all_rects.shape[1], len(all_rects), 3), dtype=np.float32)
+
+    # Per-grid-sample RGB means: (N, K, 3) for the K samples read from usable frames.
+    keep = in_grid.copy()
+    keep[in_grid] = usable[grid_sources[in_grid]]
+    t_arr = np.asarray(grid_times, dtype=float)[keep]
+    rgb = means[:, grid_sources[keep]]
+    times: List[float] = t_arr.tolist()
 
     # Resample to uniform time grid when frames are scattered.
     # Without this, bandpass filter and FFT assume the wrong sample rate,
     # corrupting all spectral analysis and heart rate estimation.
     if len(times) >= 4:
-        t_arr = np.array(times)
         t_start, t_end = float(t_arr[0]), float(t_arr[-1])
         span = t_end - t_start
         if span > 0:
@@ -180,74 +407,57 @@ def extract_rppg(
             actual_n = len(times)
             if expected_n > actual_n * 1.1:
                 t_uniform = np.linspace(t_start, t_end, expected_n)
-                for name in region_names:
-                    rgb_list = rgb_per_region[name]
-                    if len(rgb_list) != actual_n:
-                        continue
-                    r_vals = np.array([v[0] for v in rgb_list])
-                    g_vals = np.array([v[1] for v in rgb_list])
-                    b_vals = np.array([v[2] for v in rgb_list])
-                    rgb_per_region[name] = list(zip(
-                        np.interp(t_uniform, t_arr, r_vals).tolist(),
-                        np.interp(t_uniform, t_arr, g_vals).tolist(),
-                        np.interp(t_uniform, t_arr, b_vals).tolist(),
-                    ))
+                rgb = _interp_samples(t_uniform, t_arr, rgb)
                 logger.info(
                     f"Interpolated {actual_n} scattered samples to {expected_n} "
                     f"uniform samples (span={span:.1f}s, "
                     f"effective_rate={actual_n / span:.1f} -> {fps}fps)"
                 )
                 times = t_uniform.tolist()
+                t_arr = t_uniform
 
     fs = float(fps)
     filtered_per_region: Dict[str, List[float]] = {}
     raw_green_per_region: Dict[str, List[float]] = {}
     spectra_per_region: Dict[str, Any] = {}
-
-    for name in region_names:
-        rgb_list = rgb_per_region[name]
-        if len(rgb_list) < 4:
-            filtered_per_region[name] = []
-            raw_green_per_region[name] = []
-            spectra_per_region[name] = {}
-            continue
-
-        r_arr = np.array([v[0] for v in rgb_list])
-        g_arr = np.array([v[1] for v in rgb_list])
-        b_arr = np.array([v[2] for v in rgb_list])
-
-        raw_green_per_region[name] = g_arr.tolist()
-
-        # CHROM extraction
-        chrom_signal = _extract_chrom_signal(r_arr, g_arr, b_arr)
-
-        # Detrend then bandpass
-        x_detrend = signal.detrend(chrom_signal)
-        x_filt = _bandpass_filter(
-            x_detrend, fs, config.rppg.bandpass_low_hz, config.rppg.bandpass_high_hz
-        )
-        filtered_per_region[name] = x_filt.tolist()
-
-        # Hann-windowed FFT for cleaner spectrum
-        win = np.hanning(len(x_filt))
-        x_win = x_filt * win
-        freqs = np.fft.rfftfreq(len(x_win), d=1.0 / fs)
-        power = np.abs(np.fft.rfft(x_win)) ** 2
-        spectra_per_region[name] = {
-            "freqs_hz": freqs.tolist(),
-            "power": power.tolist(),
-        }
-
-    samples_per_region = {name: len(rgb_per_region[name]) for name in region_names}
+    method_scores: Dict[str, Any] = {}
+
+    window_records: List[Dict[str, Any]] = []
+
+    num_samples = rgb.shape[1]
+    if num_samples >= 4:
+        methods = METHODS if method == "auto" or config.rppg.compare_methods else (method,)
+        region_rgb = rgb[: len(region_names)].astype(np.float64)
+        windowed = None
+        if config.rppg.windowed:
+            windowed = _windowed_pulses(
+                region_rgb, t_arr, fs, ingest_result.windows, methods, method, region_names, config
+            )
+        if windowed is not None:
+            method, filtered, window_records, snrs = windowed
+            freqs, power = _power_spectra(filtered, fs)
+        else:
+            method, filtered, freqs, power, snrs = _segment_pulses(
+                region_rgb, fs, methods, method, config
+            )
+        if len(methods) > 1:
+            method_scores = _method_scores(snrs, region_names)
+        for r, name in enumerate(region_names):
+            raw_green_per_region[name] = region_rgb[r, :, 1].tolist()
+            filtered_per_region[name] = filtered[r].tolist()
+            spectra_per_region[name] = {"freqs_hz": freqs.tolist(), "power": power[r].tolist()}
+
+    samples_per_region = {name: num_samples for name in region_names}
     duration_seconds = (times[-1] - times[0]) if len(times) >= 2 else 0.0
 
     logger.info(
-        f"rPPG CHROM extraction: {samples_per_region}, duration={duration_seconds:.1f}s, fs={fs}"
+        f"rPPG {method.upper()} extraction: {samples_per_region}, duration={duration_seconds:.1f}s, fs={fs}"
     )
 
     metrics: Dict[str, Any] = {
         "times": times,
         "sampling_rate": fs,
+        "method": method,
         "regions": {
             name: {
                 "raw": raw_green_per_region.get(name, []),
@@ -261,5 +471,12 @@ def extract_rppg(
             "duration_seconds": duration_seconds,
         },
     }
+    if method_scores:
+        metrics["methods"] = method_scores
+    if window_records:
+        metrics["windows"] = window_records
+    if patch_rects is not None and num_samples >= 4:
+        patch_rgb = rgb[len(region_names) :].astype(np.float64)
+        metrics["patches"] = _patch_pulse_map(patch_rgb, fs, rows, cols, method, config)
 
     return {"metrics": metrics}
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+
+# rPPG methods selectable via RPPGConfig.method.
+METHODS = ("green", "chrom", "pos", "pbv", "ica")
+
+Band = Tuple[float, float]
+
+
+def _normalized(rgb: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(traces / per-series channel means - 1, means (N, 3)) for (N, K, 3) RGB traces."""
+    means = rgb.mean(axis=1)
+    return rgb / np.maximum(means, 1e-12)[:, None, :] - 1.0, means
+
+
+def green(rgb: np.ndarray, fs: float, band: Band) -> np.ndarray:
+    """Raw green channel (Verkruysse et al. 2008)."""
+    return rgb[..., 1]
+
+
+def chrom(rgb: np.ndarray, fs: float, band: Band) -> np.ndarray:
+    """
+    CHROM (Chrominance-based) rPPG extraction.
+
+    De Haan & Jeanne (2013): uses a linear combination of chrominance
+    channels to cancel specular reflection and motion artifacts while
+    preserving the blood-volume pulse.
+    """
+    norm, means = _normalized(rgb)
+    xs, ys, zs = norm[..., 0], norm[..., 1], norm[..., 2]
+    s1 = 3.0 * xs - 2.0 * ys
+    s2 = 1.5 * xs + ys - 1.5 * zs
+    std_s1, std_s2 = s1.std(axis=1)[:, None], s2.std(axis=1)[:, None]
+    pulse = s1 - (std_s1 / np.maximum(std_s2, 1e-10)) * s2
+    pulse = np.where(std_s2 < 1e-10, ys, pulse)
+    return np.where((means < 1).any(axis=1)[:, None], rgb[..., 1], pulse)
+
+
+# POS projection onto the plane orthogonal to skin tone: rows are S1, S2.
+_POS_PROJECTION = np.array([[0.0, 1.0, -1.0], [-2.0, 1.0, 1.0]])
+
+
+def _moving_sums(x: np.ndarray, length: int) -> np.ndarray:
+    """Sums of `length` consecutive samples along axis 1 (K - length + 1 windows)."""
+    c = np.cumsum(x, axis=1)
+    c = np.concatenate([np.zeros_like(c[:, :1]), c], axis=1)
+    return c[:, length:] - c[:, :-length]
+
+
+def pos(rgb: np.ndarray, fs: float, band: Band, window_seconds: float = 1.6) -> np.ndarray:
+    """
+    POS (Plane-Orthogonal-to-Skin) rPPG extraction.
+
+    Wang et al. (2017): every `window_seconds` sliding window is normalized
+    by its own channel means, projected onto the plane orthogonal to the
+    skin tone, alpha-tuned like CHROM, and overlap-added. Each window's
+    pulse is linear in the raw RGB, so its per-channel weights are
+    computed from moving sums and overlap-added instead, with no Python
+    loop over windows.
+    """
+    n, k, _ = rgb.shape
+    length = int(min(k, max(2, round(window_seconds * fs))))
+    # Windowed statistics of mean-centred traces (shift-invariant covariances).
+    c = rgb - rgb.mean(axis=1, keepdims=True)
+    mu_c = _moving_sums(c, length) / length
+    mu = np.maximum(mu_c + rgb.mean(axis=1, keepdims=True), 1e-12)
+    cov = _moving_sums(c[..., :, None] * c[..., None, :], length) / length
+    cov -= mu_c[..., :, None] * mu_c[..., None, :]
+    # Window pulse h = S1 + alpha * S2 = coef . C: linear in the raw RGB,
+    # and already zero-mean over its window (coef . mu = 0 since each
+    # projection row sums to zero).
+    a = _POS_PROJECTION[None, None] / mu[:, :, None, :]  # (N, W, 2, 3)
+    var = np.einsum("nwsc,nwcd,nwsd->nws", a, cov, a)
+    std = np.sqrt(np.maximum(var, 0.0))
+    alpha = std[..., 0] / np.maximum(std[..., 1], 1e-10)
+    coef = a[..., 0, :] + alpha[..., None] * a[..., 1, :]  # (N, W, 3)
+    # Overlap-add: sample t gets the summed weights of every window covering it.
+    pad = np.zeros((n, length - 1, 3))
+    weights = _moving_sums(np.concatenate([pad, coef, pad], axis=1), length)  # (N, K, 3)
+    return np.einsum("nkc,nkc->nk", weights, rgb)
+
+
+def pbv(rgb: np.ndarray, fs: float, band: Band) -> np.ndarray:
+    """
+    PBV (blood-volume pulse signature) rPPG extraction.
+
+    De Haan & van Leest (2014): the pulse is the projection of the
+    normalized traces that best matches the pulse's own color signature
+    (here the per-channel pulse strength measured from the traces).
+    """
+    norm, _means = _normalized(rgb)
+    signature = norm.std(axis=1)
+    signature /= np.maximum(np.linalg.norm(signature, axis=1, keepdims=True), 1e-12)
+    q = np.einsum("nkc,nkd->ncd", norm, norm) / norm.shape[1]
+    q += 1e-12 * np.eye(3)
+    w = np.linalg.solve(q, signature[..., None])[..., 0]
+    scale = np.einsum("nc,nc->n", signature, w)
+    w /= np.where(np.abs(scale) > 1e-12, scale, 1.0)[:, None]
+    return np.einsum("nkc,nc->nk", norm, w)
+
+
+def _sym_decorrelate(w: np.ndarray) -> np.ndarray:
+    """(W W^T)^(-1/2) W for a batch of (3, 3) unmixing matrices."""
+    d, e = np.linalg.eigh(w @ np.swapaxes(w, 1, 2))
+    inv_sqrt = (e / np.sqrt(np.maximum(d, 1e-12))[:, None, :]) @ np.swapaxes(e, 1, 2)
+    return inv_sqrt @ w
+
+
+def ica(
+    rgb: np.ndarray, fs: float, band: Band, max_iter: int = 200, tol: float = 1e-6
+) -> np.ndarray:
+    """
+    ICA rPPG extraction.
+
+    Poh et al. (2010): the z-scored channels are unmixed by FastICA
+    (symmetric, log-cosh, run on every series at once) and the source with
+    the strongest in-band spectral peak is the pulse, signed to correlate
+    with the green channel.
+    """
+    x = rgb - rgb.mean(axis=1, keepdims=True)
+    x /= np.maximum(x.std(axis=1, keepdims=True), 1e-12)
+    k = x.shape[1]
+    # Whiten.
+    d, e = np.linalg.eigh(np.einsum("nkc,nkd->ncd", x, x) / k)
+    whiten = (e / np.sqrt(np.maximum(d, 1e-12))[:, None, :]) @ np.swapaxes(e, 1, 2)
+    z = x @ whiten  # whiten is symmetric
+    w = np.broadcast_to(np.eye(3), (len(x), 3, 3)).copy()
+    for _ in range(max_iter):
+        g = np.tanh(z @ np.swapaxes(w, 1, 2))  # (N, K, 3) sources
+        w_new = np.einsum("nks,nkc->nsc", g, z) / k - (1.0 - g**2).mean(axis=1)[..., None] * w
+        w_new = _sym_decorrelate(w_new)
+        converged = np.abs(np.abs(np.einsum("nsc,nsc->ns", w_new, w)) - 1.0).max() < tol
+        w = w_new
+        if converged:
+            break
+    sources = z @ np.swapaxes(w, 1, 2)
+    power = np.abs(np.fft.rfft(sources, axis=1)) ** 2
+    freqs = np.fft.rfftfreq(k, d=1.0 / fs)
+    in_band = (freqs >= band[0]) & (freqs <= band[1])
+    if in_band.any():
+        peak = power[:, in_band].max(axis=1) / np.maximum(power[:, 1:].sum(axis=1), 1e-12)
+    else:
+        peak = power.max(axis=1)
+    pulse = np.take_along_axis(sources, peak.argmax(axis=1)[:, None, None], axis=2)[..., 0]
+    sign = np.sign(np.einsum("nk,nk->n", pulse, x[..., 1]))
+    return pulse * np.where(sign == 0, 1.0, sign)[:, None]
+
+
+_METHOD_FUNCS: Dict[str, Callable[[np.ndarray, float, Band], np.ndarray]] = {
+    "green": green,
+    "chrom": chrom,
+    "pos": pos,
+    "pbv": pbv,
+    "ica": ica,
+}
+
+
+def pulse_signals(
+    rgb: np.ndarray, fs: float, methods: Sequence[str], band: Band
+) -> Dict[str, np.ndarray]:
+    """
+    Raw pulse signals (N, K) per method of `methods` (see METHODS) for the
+    (N, K, 3) RGB traces of N regions / patches sampled at `fs`. `band` is
+    the (low, high) pulse band in Hz.
+    """
+    unknown = [m for m in methods if m not in _METHOD_FUNCS]
+    if unknown:
+        raise ValueError(f"Unknown rPPG method(s) {unknown}; expected some of {list(METHODS)}")
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return {m: _METHOD_FUNCS[m](rgb, fs, band) for m in methods}
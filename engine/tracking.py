@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+Box = Tuple[int, int, int, int]
+
+
+class FaceTracker:
+    """
+    Follow a detected face box between detector runs by template matching.
+
+    The template is the grayscale face patch from the last detection,
+    downscaled so its longer side is at most `template_size` pixels. Each
+    update searches a window `search_margin` box-sizes around the previous
+    position and moves the box (size unchanged) to the best match.
+
+    The match is always against the detection-time template, so errors do
+    not accumulate frame to frame; instead the score falls as the face
+    changes, which tells the caller when to run the detector again.
+    """
+
+    def __init__(self, template_size: int = 48, search_margin: float = 0.25) -> None:
+        self.template_size = template_size
+        self.search_margin = search_margin
+        self.box: Optional[Box] = None
+        self._anchor: Optional[Box] = None
+        self._template: Optional[np.ndarray] = None
+        self._scale = 1.0
+
+    def start(self, frame: np.ndarray, box: Box) -> None:
+        """(Re)initialize on a detector box (x, y, w, h) in `frame`."""
+        x, y, w, h = (int(v) for v in box)
+        self._scale = min(1.0, self.template_size / max(w, h, 1))
+        gray = cv2.cvtColor(frame[y : y + h, x : x + w], cv2.COLOR_BGR2GRAY)
+        if self._scale < 1.0:
+            size = (max(1, int(round(w * self._scale))), max(1, int(round(h * self._scale))))
+            gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        self._template = gray
+        self.box = self._anchor = (x, y, w, h)
+
+    def reset(self) -> None:
+        self.box = self._anchor = self._template = None
+
+    @property
+    def active(self) -> bool:
+        return self._template is not None
+
+    @property
+    def drift(self) -> float:
+        """Displacement since the last detection, in box sizes."""
+        if self.box is None or self._anchor is None:
+            return 0.0
+        x, y, w, h = self._anchor
+        return max(abs(self.box[0] - x) / max(w, 1), abs(self.box[1] - y) / max(h, 1))
+
+    def update(self, frame: np.ndarray) -> Tuple[Optional[Box], float]:
+        """
+        Locate the face in `frame`.
+
+        Returns (box, score) where score is the normalized cross-correlation
+        of the best match in [-1, 1]; (None, 0.0) if not tracking.
+        """
+        if self._template is None or self.box is None:
+            return None, 0.0
+        frame_h, frame_w = frame.shape[:2]
+        x, y, w, h = self.box
+        mx = int(round(w * self.search_margin))
+        my = int(round(h * self.search_margin))
+        x0, y0 = max(0, x - mx), max(0, y - my)
+        x1, y1 = min(frame_w, x + w + mx), min(frame_h, y + h + my)
+
+        window = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        if self._scale < 1.0:
+            window = cv2.resize(
+                window, None, fx=self._scale, fy=self._scale, interpolation=cv2.INTER_AREA
+            )
+        th, tw = self._template.shape
+        if window.shape[0] < th or window.shape[1] < tw:
+            return self.box, 0.0
+
+        scores = cv2.matchTemplate(window, self._template, cv2.TM_CCOEFF_NORMED)
+        _min_val, score, _min_loc, (lx, ly) = cv2.minMaxLoc(scores)
+        if not np.isfinite(score):
+            return self.box, 0.0
+
+        nx = min(max(x0 + int(round(lx / self._scale)), 0), frame_w - w)
+        ny = min(max(y0 + int(round(ly / self._scale)), 0), frame_h - h)
+        self.box = (nx, ny, w, h)
+        return self.box, float(score)
+
+
+# Constant-velocity model, one step per frame: state (position, velocity).
+_CV_TRANSITION = np.array([[1.0, 1.0], [0.0, 1.0]])
+_CV_NOISE_SHAPE = np.array([[0.25, 0.5], [0.5, 1.0]])  # white acceleration
+
+
+def _kalman_smooth(z: np.ndarray, process_noise: float, measurement_noise: float) -> np.ndarray:
+    """
+    Rauch-Tung-Striebel smoothed positions for measurements `z` (n, d).
+
+    Every column shares the same noise model, so the covariances and gains
+    are (2, 2) / (2,) and the d columns are filtered together as one
+    (2, d) state.
+    """
+    n = len(z)
+    F = _CV_TRANSITION
+    Q = process_noise**2 * _CV_NOISE_SHAPE
+    R = measurement_noise**2
+
+    x_pred = np.empty((n, 2, z.shape[1]))
+    x_filt = np.empty_like(x_pred)
+    P_pred = np.empty((n, 2, 2))
+    P_filt = np.empty_like(P_pred)
+    x = np.stack([z[0], np.zeros(z.shape[1])])
+    P = np.diag([R, process_noise**2 + R])
+    for k in range(n):
+        if k:
+            x = F @ x
+            P = F @ P @ F.T + Q
+        x_pred[k], P_pred[k] = x, P
+        gain = P[:, 0] / (P[0, 0] + R)
+        x = x + np.outer(gain, z[k] - x[0])
+        P = P - np.outer(gain, P[0])
+        x_filt[k], P_filt[k] = x, P
+
+    smoothed = x_filt.copy()
+    for k in range(n - 2, -1, -1):
+        C = P_filt[k] @ F.T @ np.linalg.inv(P_pred[k + 1])
+        smoothed[k] += C @ (smoothed[k + 1] - x_pred[k + 1])
+    return smoothed[:, 0]
+
+
+def smooth_boxes(
+    boxes: np.ndarray,
+    valid: np.ndarray,
+    process_noise: float = 0.01,
+    measurement_noise: float = 0.05,
+) -> np.ndarray:
+    """
+    Smooth a (T, 4) box track with a constant-velocity Kalman smoother.
+
+    Box centers and sizes are smoothed together over each run of
+    consecutive valid frames (runs are independent; invalid frames are
+    returned unchanged). Noise levels are in units of the run's median box
+    size, so they mean the same for small and large faces:
+    `measurement_noise` is the per-frame box jitter, `process_noise` how
+    fast the true box may accelerate.
+    """
+    out = np.array(boxes, dtype=np.int32, copy=True)
+    idx = np.flatnonzero(valid)
+    if len(idx) < 2:
+        return out
+    for run in np.split(idx, np.flatnonzero(np.diff(idx) > 1) + 1):
+        if len(run) < 2:
+            continue
+        b = out[run].astype(np.float64)
+        z = np.column_stack([b[:, 0] + b[:, 2] / 2, b[:, 1] + b[:, 3] / 2, b[:, 2], b[:, 3]])
+        scale = max(float(np.median(b[:, 2:])), 1.0)
+        cx, cy, w, h = (_kalman_smooth(z / scale, process_noise, measurement_noise) * scale).T
+        w, h = np.maximum(w, 1.0), np.maximum(h, 1.0)
+        out[run] = np.rint(np.column_stack([cx - w / 2, cy - h / 2, w, h])).astype(np.int32)
+    return out
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .types import FaceTrack
+from .utils.logging import get_logger
+from .utils.video import FrameSource
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class FaceTube:
+    """
+    Per-frame face crops cut from the full frames after face detection.
+
+    Every patch has the same (H, W) -- the largest face box in the clip --
+    and is cut at native resolution, so ROI statistics computed on a patch
+    see exactly the pixels they would see on the full frame.
+
+    Attributes:
+        patches: (T, H, W, 3) uint8 crops; all zeros where there is no face.
+        origins: (T, 2) int32 (x, y) of each patch's top-left in the frame.
+        boxes: (T, 4) int32 face box (x, y, w, h) in frame coordinates.
+        valid: (T,) bool, True where the frame has a face box.
+        frame_shape: (height, width) of the frames the tube was cut from.
+    """
+
+    patches: np.ndarray
+    origins: np.ndarray
+    boxes: np.ndarray
+    valid: np.ndarray
+    frame_shape: Tuple[int, int]
+
+    def __len__(self) -> int:
+        return len(self.patches)
+
+    @property
+    def patch_shape(self) -> Tuple[int, int]:
+        return int(self.patches.shape[1]), int(self.patches.shape[2])
+
+    @property
+    def local_boxes(self) -> np.ndarray:
+        """(T, 4) face boxes relative to each patch's origin."""
+        local = self.boxes.copy()
+        local[:, :2] -= self.origins
+        return local
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.patches.nbytes + self.origins.nbytes + self.boxes.nbytes)
+
+
+def build_face_tube(source: FrameSource, track: FaceTrack) -> Optional[FaceTube]:
+    """
+    Cut a FaceTube from `source` using the face track from analyze_faces.
+
+    One pass over the frames; only the crops are kept. Returns None when no
+    frame has a face.
+    """
+    frame_h, frame_w = source.frame_shape
+    boxes = track.boxes.copy()
+    valid = track.valid
+    if not valid.any() or frame_h <= 0 or frame_w <= 0:
+        return None
+
+    # Clamp boxes into the frame, then size the patch to fit the largest one.
+    boxes[:, 0] = np.clip(boxes[:, 0], 0, frame_w - 1)
+    boxes[:, 1] = np.clip(boxes[:, 1], 0, frame_h - 1)
+    boxes[:, 2] = np.minimum(boxes[:, 2], frame_w - boxes[:, 0])
+    boxes[:, 3] = np.minimum(boxes[:, 3], frame_h - boxes[:, 1])
+    patch_w = int(boxes[valid, 2].max())
+    patch_h = int(boxes[valid, 3].max())
+
+    # Anchor each patch at its box, shifted inward so it stays in the frame;
+    # since the patch is at least as large as the box it always covers it.
+    origins = np.zeros((len(boxes), 2), dtype=np.int32)
+    origins[:, 0] = np.minimum(boxes[:, 0], frame_w - patch_w)
+    origins[:, 1] = np.minimum(boxes[:, 1], frame_h - patch_h)
+
+    patches: Optional[np.ndarray] = None
+    for idx, frame in enumerate(source.iter_frames()):
+        if idx >= len(boxes):
+            break
+        if patches is None:
+            patches = np.zeros((len(boxes), patch_h, patch_w) + frame.shape[2:], dtype=frame.dtype)
+        if valid[idx]:
+            x0, y0 = origins[idx]
+            patches[idx] = frame[y0 : y0 + patch_h, x0 : x0 + patch_w]
+
+    if patches is None:
+        return None
+
+    tube = FaceTube(
+        patches=patches,
+        origins=origins,
+        boxes=boxes,
+        valid=valid,
+        frame_shape=(int(frame_h), int(frame_w)),
+    )
+    full_bytes = len(boxes) * frame_h * frame_w * patches.shape[-1] * patches.itemsize
+    logger.info(
+        f"Face tube: {len(tube)} frames, patch={patch_w}x{patch_h}, "
+        f"{tube.nbytes / 1e6:.1f} MB vs {full_bytes / 1e6:.1f} MB full frames"
+    )
+    return tube
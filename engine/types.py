@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 
 class Verdict(str, Enum):
     HUMAN = "Human"
@@ -22,11 +24,165 @@ class IngestWindow:
     dropped_frames_estimate: float
 
 
+@dataclass
+class ResampleGrid:
+    """
+    Virtual resampling of the source frames onto a uniform target-fps grid.
+
+    Only indices are stored: grid sample j reads source frame
+    `source_indices[j]`, so per-frame values (face validity, RGB means, ...)
+    are resampled with `take` and frames are never copied.
+    """
+
+    times: np.ndarray
+    source_indices: np.ndarray
+    fps: float
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def take(self, per_frame: np.ndarray) -> np.ndarray:
+        """Resample a per-source-frame array onto the grid."""
+        return np.asarray(per_frame)[self.source_indices]
+
+
+@dataclass
+class WindowIndex:
+    """
+    Integer [start, stop) spans of the ingest windows on the resampling grid.
+
+    Built once with np.searchsorted; stages slice windows directly and get
+    per-window counts from prefix sums instead of masking every timestamp
+    for every window.
+    """
+
+    starts: np.ndarray
+    stops: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span(self, i: int) -> slice:
+        return slice(int(self.starts[i]), int(self.stops[i]))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.stops - self.starts
+
+    def counts(self, mask: np.ndarray) -> np.ndarray:
+        """Number of True grid samples of `mask` inside each window."""
+        csum = np.concatenate(([0], np.cumsum(np.asarray(mask, dtype=np.int64))))
+        return csum[self.stops] - csum[self.starts]
+
+    def fractions(self, mask: np.ndarray) -> np.ndarray:
+        """Fraction of True grid samples of `mask` inside each window."""
+        return self.counts(mask) / np.maximum(self.lengths, 1)
+
+
+# Synthetic landmarks as (x, y) fractions of the face box: eyes, nose tip,
+# mouth corners, chin.
+FACE_LANDMARK_OFFSETS = np.array(
+    [[0.3, 0.35], [0.7, 0.35], [0.5, 0.5], [0.35, 0.75], [0.65, 0.75], [0.5, 0.9]]
+)
+
+
+@dataclass
+class FaceTrack:
+    """
+    Per-frame face detections as parallel arrays.
+
+    Stages read boxes and validity straight from the arrays; the verbose
+    per-frame list of dicts is only built when results are serialized
+    (see to_records / AnalysisResult.to_dict).
+
+    Attributes:
+        times: (T,) float64 frame timestamps (seconds).
+        boxes: (T, 4) int32 face box (x, y, w, h); zeros where there is no face.
+        conf: (T,) float32 tracking confidence, 0 where there is no face.
+        landmarks: (T, K, 2) int32 landmark (x, y) per frame.
+    """
+
+    times: np.ndarray
+    boxes: np.ndarray
+    conf: np.ndarray
+    landmarks: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """(T,) bool, True where the frame has a face box."""
+        return (self.boxes[:, 2] > 0) & (self.boxes[:, 3] > 0)
+
+    def box(self, i: int) -> Optional[List[int]]:
+        """Face box of frame `i` as [x, y, w, h], or None."""
+        x, y, w, h = (int(v) for v in self.boxes[i])
+        return [x, y, w, h] if w > 0 and h > 0 else None
+
+    @classmethod
+    def from_boxes(cls, times: np.ndarray, boxes: np.ndarray, conf: np.ndarray) -> "FaceTrack":
+        """Build a track from (T, 4) boxes, deriving the synthetic landmarks."""
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        origin = boxes[:, None, :2].astype(np.float64)
+        size = boxes[:, None, 2:].astype(np.float64)
+        landmarks = (origin + FACE_LANDMARK_OFFSETS[None] * size).astype(np.int32)
+        return cls(
+            times=np.asarray(times, dtype=np.float64),
+            boxes=boxes,
+            conf=np.asarray(conf, dtype=np.float32),
+            landmarks=landmarks,
+        )
+
+    @classmethod
+    def from_detections(
+        cls, times: np.ndarray, detections: List[Dict[str, Any]]
+    ) -> "FaceTrack":
+        """Build a track from per-frame {"box", "tracking_confidence"} results."""
+        boxes = np.zeros((len(detections), 4), dtype=np.int32)
+        conf = np.zeros(len(detections), dtype=np.float32)
+        for i, rec in enumerate(detections):
+            if rec["box"] is not None:
+                boxes[i] = rec["box"]
+                conf[i] = rec["tracking_confidence"]
+        return cls.from_boxes(np.asarray(times)[: len(detections)], boxes, conf)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """The per-frame list form: {"time", "box", "landmarks", "tracking_confidence"}."""
+        valid = self.valid.tolist()
+        times = self.times.tolist()
+        boxes = self.boxes.tolist()
+        landmarks = self.landmarks.tolist()
+        conf = self.conf.tolist()
+        return [
+            {
+                "time": times[i],
+                "box": boxes[i] if valid[i] else None,
+                "landmarks": landmarks[i] if valid[i] else [],
+                "tracking_confidence": conf[i],
+            }
+            for i in range(len(times))
+        ]
+
+
+def _serializable(value: Any) -> Any:
+    """Replace FaceTrack values nested in dicts/lists with their record lists."""
+    if isinstance(value, FaceTrack):
+        return value.to_records()
+    if isinstance(value, dict):
+        return {k: _serializable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_serializable(v) for v in value]
+    return value
+
+
 @dataclass
 class IngestResult:
     windows: List[IngestWindow]
     metrics: Dict[str, Any]
     reasons: List[str]
+    grid: Optional[ResampleGrid] = None
+    window_index: Optional[WindowIndex] = None
 
 
 @dataclass
@@ -41,7 +197,7 @@ class AnalysisResult:
     config_version: str
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
+        data = asdict(replace(self, metrics=_serializable(self.metrics)))
         data["verdict"] = self.verdict.value
         return data
 
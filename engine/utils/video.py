@@ -1,19 +1,629 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+import functools
+import hashlib
+import json
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
 
 import cv2
 import numpy as np
 
+from .logging import get_logger
+
+
+logger = get_logger(__name__)
 
 DEFAULT_MAX_DIM = 480
 DEFAULT_MAX_FRAMES = 600  # ~20s at 30fps
+DEFAULT_CHUNK_SIZE = 64
+DEFAULT_PREFETCH = 2  # chunks decoded ahead by the background thread
+DEFAULT_BACKEND = "cv2"
+
+
+@dataclass
+class FrameChunk:
+    """
+    A run of consecutive decoded frames.
+
+    `frames` and `timestamps` are views into a buffer that the producer may
+    reuse for the next chunk; copy anything that must outlive the iteration.
+    """
+
+    start: int
+    frames: np.ndarray
+    timestamps: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+def _resize_target(orig_w: int, orig_h: int, max_dim: Optional[int]) -> Optional[Tuple[int, int]]:
+    """(width, height) to resize to so neither side exceeds max_dim, or None."""
+    if max_dim is not None and orig_w > 0 and orig_h > 0 and max(orig_w, orig_h) > max_dim:
+        scale = max_dim / max(orig_w, orig_h)
+        return int(orig_w * scale), int(orig_h * scale)
+    return None
+
+
+class VideoDecoder(ABC):
+    """
+    Base class for frame decoder backends.
+
+    A decoder opens `path` on construction and decodes frames one at a time,
+    resized to fit `max_dim`, straight into caller-provided buffers.
+    Timestamps are in seconds from the first frame of the video, also after
+    a seek.
+
+    Subclasses set `fps`, `frame_count` (0 if unknown) and `frame_shape`
+    ((height, width, channels) after resizing) and implement `read_into`,
+    `skip`, `seek` and `close`.
+    """
+
+    name = ""
+
+    fps: float
+    frame_count: int
+    frame_shape: Tuple[int, int, int]
+
+    def __init__(self, path: str, max_dim: Optional[int] = DEFAULT_MAX_DIM, threads: int = 0) -> None:
+        self.path = str(path)
+        self.max_dim = max_dim
+        self.threads = threads
+
+    @abstractmethod
+    def read_into(self, out: np.ndarray) -> Optional[float]:
+        """Decode the next frame into `out`; return its timestamp, or None at the end."""
+        pass
+
+    @abstractmethod
+    def skip(self) -> Optional[float]:
+        """Advance one frame without producing pixels; None at the end."""
+        pass
+
+    @abstractmethod
+    def seek(self, seconds: float, exact: bool = True) -> None:
+        """
+        Reposition so the next frame read is the first at or after `seconds`.
+
+        With `exact=False` the decoder may instead land on the keyframe at
+        or before `seconds`, which skips decoding the frames in between.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the underlying capture / container."""
+        pass
+
+    def __enter__(self) -> "VideoDecoder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Cv2Decoder(VideoDecoder):
+    """cv2.VideoCapture backend; timestamps are frame_index / fps."""
+
+    name = "cv2"
+
+    def __init__(self, path: str, max_dim: Optional[int] = DEFAULT_MAX_DIM, threads: int = 0) -> None:
+        super().__init__(path, max_dim, threads)
+        self._cap = cv2.VideoCapture(self.path)
+        if not self._cap.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+
+        fps = self._cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.fps = float(fps) if fps > 0 else 30.0
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self._index = 0
+        self._pending: Optional[np.ndarray] = None
+
+        orig_w = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        orig_h = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        channels = 3
+        if orig_w <= 0 or orig_h <= 0:
+            # Container does not report a size; peek at the first frame.
+            ret, frame = self._cap.read()
+            if ret:
+                self._pending = frame
+                orig_h, orig_w = frame.shape[:2]
+                channels = frame.shape[2] if frame.ndim == 3 else 1
+        self._size = _resize_target(orig_w, orig_h, max_dim)
+        w, h = self._size if self._size is not None else (orig_w, orig_h)
+        self.frame_shape = (int(h), int(w), channels)
+
+    def _next_raw(self) -> Optional[np.ndarray]:
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            return frame
+        ret, frame = self._cap.read()
+        return frame if ret else None
+
+    def read_into(self, out: np.ndarray) -> Optional[float]:
+        frame = self._next_raw()
+        if frame is None:
+            return None
+        if self._size is not None:
+            cv2.resize(frame, self._size, dst=out, interpolation=cv2.INTER_AREA)
+        else:
+            out[...] = frame
+        t = self._index / self.fps
+        self._index += 1
+        return t
+
+    def skip(self) -> Optional[float]:
+        if self._pending is not None:
+            self._pending = None
+        elif not self._cap.grab():
+            return None
+        t = self._index / self.fps
+        self._index += 1
+        return t
+
+    def seek(self, seconds: float, exact: bool = True) -> None:
+        # VideoCapture has no keyframe-only seek: it always seeks
+        # frame-accurately (keyframe + decode forward), so `exact` is ignored.
+        self._pending = None
+        self._cap.set(cv2.CAP_PROP_POS_MSEC, max(seconds, 0.0) * 1000.0)
+        self._index = int(round(self._cap.get(cv2.CAP_PROP_POS_FRAMES)))
+
+    def close(self) -> None:
+        self._cap.release()
+
+
+class PyAVDecoder(VideoDecoder):
+    """
+    PyAV (FFmpeg) backend.
+
+    Decodes with FFmpeg frame/slice threading (`threads` = 0 lets FFmpeg
+    pick), reports exact per-frame presentation timestamps, and converts
+    each frame's BGR plane in place into the caller's buffer without an
+    intermediate ndarray.
+    """
+
+    name = "pyav"
+
+    def __init__(self, path: str, max_dim: Optional[int] = DEFAULT_MAX_DIM, threads: int = 0) -> None:
+        super().__init__(path, max_dim, threads)
+        try:
+            import av
+        except ImportError as exc:  # pragma: no cover - depends on the image
+            raise ImportError(
+                "The 'pyav' decoder backend requires PyAV (pip install av)"
+            ) from exc
+
+        try:
+            self._container = av.open(self.path)
+        except Exception as exc:  # noqa: BLE001 - surface like the cv2 backend
+            raise ValueError(f"Cannot open video: {path}") from exc
+        if not self._container.streams.video:
+            self._container.close()
+            raise ValueError(f"Cannot open video: {path}")
+
+        stream = self._container.streams.video[0]
+        stream.thread_type = "AUTO"
+        if threads > 0:
+            stream.codec_context.thread_count = threads
+        rate = stream.average_rate or stream.guessed_rate
+        self.fps = float(rate) if rate else 30.0
+        self.frame_count = int(stream.frames or 0)
+        self._stream = stream
+        self._time_base = float(stream.time_base) if stream.time_base else None
+        self._frames = self._container.decode(stream)
+        self._index = 0
+        self._t0: Optional[float] = None
+        if stream.start_time is not None and self._time_base is not None:
+            self._t0 = float(stream.start_time) * self._time_base
+        self._pending = None
+
+        orig_w, orig_h = int(stream.codec_context.width), int(stream.codec_context.height)
+        self._size = _resize_target(orig_w, orig_h, max_dim)
+        w, h = self._size if self._size is not None else (orig_w, orig_h)
+        self.frame_shape = (int(h), int(w), 3)
+
+    def _next_frame(self):
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            return frame
+        try:
+            return next(self._frames)
+        except StopIteration:
+            return None
+
+    def _frame_time(self, frame) -> float:
+        if frame.pts is None or self._time_base is None:
+            t = self._index / self.fps
+        else:
+            t = float(frame.pts) * self._time_base
+        if self._t0 is None:
+            self._t0 = t
+        return t - self._t0
+
+    def _timestamp(self, frame) -> float:
+        t = self._frame_time(frame)
+        self._index += 1
+        return t
+
+    def seek(self, seconds: float, exact: bool = True) -> None:
+        seconds = max(seconds, 0.0)
+        self._pending = None
+        if self._time_base is None:
+            # No timeline to seek on; decode forward from the start.
+            self._container.seek(0)
+            self._frames = self._container.decode(self._stream)
+            self._index = 0
+            exact = True
+        else:
+            target = int(((self._t0 or 0.0) + seconds) / self._time_base)
+            self._container.seek(target, stream=self._stream, backward=True, any_frame=False)
+            self._frames = self._container.decode(self._stream)
+            self._index = int(round(seconds * self.fps))
+        if not exact:
+            return
+        # Decode forward from the keyframe to the first frame at `seconds`.
+        half_frame = 0.5 / self.fps
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return
+            if self._frame_time(frame) >= seconds - half_frame:
+                self._pending = frame
+                return
+
+    def read_into(self, out: np.ndarray) -> Optional[float]:
+        frame = self._next_frame()
+        if frame is None:
+            return None
+        bgr = frame.reformat(format="bgr24")
+        plane = bgr.planes[0]
+        h, w = bgr.height, bgr.width
+        # View the plane's memory (rows may be padded to line_size).
+        view = np.frombuffer(plane, dtype=np.uint8).reshape(h, plane.line_size)[:, : w * 3]
+        view = view.reshape(h, w, 3)
+        if self._size is not None:
+            cv2.resize(view, self._size, dst=out, interpolation=cv2.INTER_AREA)
+        else:
+            np.copyto(out, view)
+        return self._timestamp(frame)
+
+    def skip(self) -> Optional[float]:
+        frame = self._next_frame()
+        if frame is None:
+            return None
+        return self._timestamp(frame)
+
+    def close(self) -> None:
+        self._container.close()
+
+
+DECODER_BACKENDS: Dict[str, Type[VideoDecoder]] = {
+    Cv2Decoder.name: Cv2Decoder,
+    PyAVDecoder.name: PyAVDecoder,
+}
+
+
+def open_decoder(
+    path: str,
+    max_dim: Optional[int] = DEFAULT_MAX_DIM,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
+) -> VideoDecoder:
+    """
+    Open `path` with the named decoder backend (see DECODER_BACKENDS),
+    positioned at `start_time` seconds.
+    """
+    try:
+        cls = DECODER_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown decoder backend {backend!r}; expected one of {sorted(DECODER_BACKENDS)}"
+        ) from None
+    decoder = cls(path, max_dim=max_dim, threads=threads)
+    if start_time > 0:
+        try:
+            decoder.seek(start_time)
+        except BaseException:
+            decoder.close()
+            raise
+    return decoder
+
+
+def _decode_chunks(
+    path: str,
+    chunk_size: int,
+    max_dim: Optional[int],
+    max_frames: Optional[int],
+    num_buffers: int = 1,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
+) -> Iterator[FrameChunk]:
+    """
+    Decode loop behind iter_video_chunks.
+
+    Rotates through `num_buffers` preallocated chunk buffers; a yielded chunk
+    stays valid until `num_buffers - 1` further chunks have been produced.
+    """
+    chunk_size = max(1, int(chunk_size))
+    num_buffers = max(1, int(num_buffers))
+    with open_decoder(
+        path, max_dim=max_dim, backend=backend, threads=threads, start_time=start_time
+    ) as decoder:
+        bufs = [
+            np.empty((chunk_size,) + decoder.frame_shape, dtype=np.uint8)
+            for _ in range(num_buffers)
+        ]
+        ts_bufs = [np.empty(chunk_size, dtype=np.float64) for _ in range(num_buffers)]
+        slot = 0
+        idx = 0
+        fill = 0
+
+        while not (max_frames and idx >= max_frames):
+            t = decoder.read_into(bufs[slot][fill])
+            if t is None:
+                break
+            ts_bufs[slot][fill] = t
+            fill += 1
+            idx += 1
+
+            if fill == chunk_size:
+                yield FrameChunk(start=idx - fill, frames=bufs[slot], timestamps=ts_bufs[slot])
+                slot = (slot + 1) % num_buffers
+                fill = 0
+
+        if fill:
+            yield FrameChunk(
+                start=idx - fill, frames=bufs[slot][:fill], timestamps=ts_bufs[slot][:fill]
+            )
+
+
+_END_OF_STREAM = object()
+
+
+def _prefetch_chunks(
+    path: str,
+    chunk_size: int,
+    max_dim: Optional[int],
+    max_frames: Optional[int],
+    queue_size: int,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
+) -> Iterator[FrameChunk]:
+    """
+    Run the decode loop on a background thread feeding a bounded queue.
+
+    cv2 releases the GIL while decoding and resizing, so the consumer's work
+    (face detection, ROI statistics) overlaps with decode. The producer owns
+    queue_size + 2 buffers: one being filled, up to queue_size queued, and
+    the one the consumer is currently holding.
+    """
+    chunks: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def _produce() -> None:
+        try:
+            for chunk in _decode_chunks(
+                path,
+                chunk_size,
+                max_dim,
+                max_frames,
+                num_buffers=queue_size + 2,
+                backend=backend,
+                threads=threads,
+                start_time=start_time,
+            ):
+                while not stop.is_set():
+                    try:
+                        chunks.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            chunks.put(_END_OF_STREAM)
+        except BaseException as exc:  # noqa: BLE001 - re-raised on the consumer side
+            chunks.put(exc)
+
+    worker = threading.Thread(target=_produce, name="bioverify-decode", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _END_OF_STREAM:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue, then wait for it.
+        while worker.is_alive():
+            try:
+                chunks.get_nowait()
+            except queue.Empty:
+                worker.join(timeout=0.1)
+
+
+def iter_video_chunks(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_dim: Optional[int] = DEFAULT_MAX_DIM,
+    max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    prefetch: int = 0,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
+) -> Iterator[FrameChunk]:
+    """
+    Decode a video in fixed-size chunks with bounded memory.
+
+    Frames are resized straight into preallocated (chunk_size, H, W, 3)
+    buffers that are reused for every chunk, so memory stays at a few chunks
+    no matter how long the clip is. Consumers that only need per-frame
+    reductions can process the whole video in a single pass this way.
+
+    Args:
+        path: Path to the video file.
+        chunk_size: Frames per chunk (the last chunk may be shorter).
+        max_dim: Max height/width in pixels. Resized proportionally.
+        max_frames: Stop reading after this many frames.
+        prefetch: If > 0, decode on a background thread keeping up to this
+            many chunks ready ahead of the consumer.
+        backend: Decoder backend name (see DECODER_BACKENDS).
+        threads: Codec threads for backends that support it (0 = auto).
+        start_time: Seek here (seconds) before decoding; timestamps stay
+            relative to the start of the video.
+
+    Yields:
+        FrameChunk views into the shared buffers. A chunk is valid until
+        the next one is requested.
+    """
+    if prefetch > 0:
+        return _prefetch_chunks(
+            path,
+            chunk_size,
+            max_dim,
+            max_frames,
+            int(prefetch),
+            backend=backend,
+            threads=threads,
+            start_time=start_time,
+        )
+    return _decode_chunks(
+        path, chunk_size, max_dim, max_frames, backend=backend, threads=threads, start_time=start_time
+    )
+
+
+def probe_video(
+    path: str,
+    max_dim: Optional[int] = DEFAULT_MAX_DIM,
+    max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
+) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Cheap metadata pass: (timestamps, fps, (height, width) after resize).
+
+    Frames are advanced with the decoder's skip(), so they are never
+    converted or resized.
+    """
+    timestamps: List[float] = []
+    with open_decoder(
+        path, max_dim=max_dim, backend=backend, threads=threads, start_time=start_time
+    ) as decoder:
+        while not (max_frames and len(timestamps) >= max_frames):
+            t = decoder.skip()
+            if t is None:
+                break
+            timestamps.append(t)
+        fps = decoder.fps
+        shape = decoder.frame_shape[:2] if timestamps else (0, 0)
+    return np.asarray(timestamps, dtype=float), fps, (int(shape[0]), int(shape[1]))
+
+
+class _FrameCollector:
+    """
+    Copy a chunk stream into one array sized from `expected` frames.
+
+    `allocate(shape, dtype, old, n)` returns a new array and must carry over
+    the first n frames of `old` when growing (container under-reported its
+    frame count).
+    """
+
+    def __init__(
+        self,
+        expected: int,
+        allocate: Callable[[Tuple[int, ...], np.dtype, Optional[np.ndarray], int], np.ndarray],
+    ) -> None:
+        self.allocate = allocate
+        self.frames: Optional[np.ndarray] = None
+        self.timestamps = np.empty(max(expected, 0), dtype=np.float64)
+        self.expected = expected
+        self.n = 0
+
+    def add(self, chunk: FrameChunk) -> FrameChunk:
+        """Append `chunk`; returns the same frames as views of the collected arrays."""
+        n = self.n
+        if self.frames is None:
+            self.frames = self.allocate(
+                (max(self.expected, len(chunk)),) + chunk.frames.shape[1:], chunk.frames.dtype, None, 0
+            )
+        elif n + len(chunk) > len(self.frames):
+            capacity = max(n + len(chunk), 2 * len(self.frames))
+            self.frames = self.allocate(
+                (capacity,) + self.frames.shape[1:], self.frames.dtype, self.frames, n
+            )
+        if n + len(chunk) > len(self.timestamps):
+            self.timestamps = np.concatenate(
+                (self.timestamps[:n], np.empty(max(len(self.frames), n + len(chunk)) - n))
+            )
+        self.frames[n : n + len(chunk)] = chunk.frames
+        self.timestamps[n : n + len(chunk)] = chunk.timestamps
+        self.n = n + len(chunk)
+        return FrameChunk(
+            start=n, frames=self.frames[n : self.n], timestamps=self.timestamps[n : self.n]
+        )
+
+    def result(self) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        frames = self.frames[: self.n] if self.frames is not None else None
+        return frames, self.timestamps[: self.n]
+
+
+def _collect_chunks(
+    chunks: Iterator[FrameChunk],
+    expected: int,
+    allocate: Callable[[Tuple[int, ...], np.dtype, Optional[np.ndarray], int], np.ndarray],
+) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """Copy a whole chunk stream into one array (see _FrameCollector)."""
+    collector = _FrameCollector(expected, allocate)
+    for chunk in chunks:
+        collector.add(chunk)
+    return collector.result()
+
+
+def _allocate_in_memory(
+    shape: Tuple[int, ...], dtype: np.dtype, old: Optional[np.ndarray], n: int
+) -> np.ndarray:
+    arr = np.empty(shape, dtype=dtype)
+    if old is not None:
+        arr[:n] = old[:n]
+    return arr
+
+
+def _expected_frames(
+    path: str,
+    max_dim: Optional[int],
+    max_frames: Optional[int],
+    backend: str,
+    start_time: float = 0.0,
+) -> Tuple[int, float]:
+    with open_decoder(path, max_dim=max_dim, backend=backend) as decoder:
+        expected, fps = decoder.frame_count, decoder.fps
+    if expected > 0 and start_time > 0:
+        expected = max(expected - int(start_time * fps), 0)
+    if max_frames:
+        expected = min(expected, max_frames) if expected > 0 else max_frames
+    return expected, fps
 
 
 def read_video(
     path: str,
     max_dim: Optional[int] = DEFAULT_MAX_DIM,
     max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    prefetch: int = 0,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
 ) -> Tuple[np.ndarray, np.ndarray, float]:
     """
     Read a video into frames and timestamps.
@@ -22,54 +632,529 @@ def read_video(
     to preserve the temporal resolution required for rPPG analysis.
     Sparse/uniform sampling would destroy the signal.
 
+    Frames are decoded chunk by chunk into a single preallocated array
+    (sized from the container's frame count), so there is no intermediate
+    list-of-frames copy.
+
     Args:
         path: Path to the video file.
         max_dim: Max height/width in pixels. Resized proportionally.
         max_frames: Stop reading after this many frames.
+        prefetch: Chunks decoded ahead on a background thread (0 = inline).
+        backend: Decoder backend name (see DECODER_BACKENDS).
+        threads: Codec threads for backends that support it (0 = auto).
+        start_time: Seconds into the video to start reading from.
 
     Returns:
         (frames, timestamps, fps)
     """
-    cap = cv2.VideoCapture(path)
-    if not cap.isOpened():
-        raise ValueError(f"Cannot open video: {path}")
-
-    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
-    if fps <= 0:
-        fps = 30.0
-
-    # Pre-compute resize dimensions
-    scale = None
-    new_w, new_h = 0, 0
-    if max_dim is not None:
-        orig_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        orig_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        if orig_w > 0 and orig_h > 0 and max(orig_w, orig_h) > max_dim:
-            scale = max_dim / max(orig_w, orig_h)
-            new_w = int(orig_w * scale)
-            new_h = int(orig_h * scale)
-
-    frames = []
-    timestamps = []
-    idx = 0
-
-    while True:
-        if max_frames and len(frames) >= max_frames:
-            break
+    expected, fps = _expected_frames(path, max_dim, max_frames, backend, start_time)
+    frames, timestamps = _collect_chunks(
+        iter_video_chunks(
+            path,
+            max_dim=max_dim,
+            max_frames=max_frames,
+            prefetch=prefetch,
+            backend=backend,
+            threads=threads,
+            start_time=start_time,
+        ),
+        expected,
+        _allocate_in_memory,
+    )
+
+    if frames is None or len(frames) == 0:
+        return np.array([]), np.array([]), float(fps)
+
+    return frames, timestamps, float(fps)
+
 
-        ret, frame = cap.read()
-        if not ret:
+def video_fingerprint(path: str, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of the file contents, used to key on-disk caches.
+
+    Memoized per (path, size, mtime), so the frame and face caches of one
+    job hash the file once.
+    """
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_size, stat.st_mtime_ns, block_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _file_digest(path: str, _size: int, _mtime_ns: int, block_size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _frame_cache_paths(
+    cache_dir: str,
+    path: str,
+    max_dim: Optional[int],
+    max_frames: Optional[int],
+    backend: str,
+    start_time: float = 0.0,
+) -> Tuple[Path, Path]:
+    key = f"{video_fingerprint(path)[:16]}_{backend}_{max_dim or 0}_{max_frames or 0}"
+    if start_time > 0:
+        key += f"_{int(round(start_time * 1000))}ms"
+    root = Path(cache_dir)
+    return root / f"frames_{key}.npy", root / f"frames_{key}.json"
+
+
+def _read_frame_cache_meta(meta_path: Path) -> Optional[Tuple[int, np.ndarray, float]]:
+    """(num_frames, timestamps, fps) of an entry, or None when missing or unreadable (a miss)."""
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return (
+            int(meta["num_frames"]),
+            np.asarray(meta["timestamps"], dtype=float),
+            float(meta["fps"]),
+        )
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Ignoring unreadable frame cache entry {meta_path.name}: {e}")
+        return None
+
+
+def prune_frame_cache(cache_dir: str, max_bytes: int) -> int:
+    """
+    Delete the least recently used cache entries (frames, face detections,
+    segment pre-scans) in `cache_dir` until it holds at most `max_bytes`.
+
+    Files sharing a name stem form one entry. In-progress temporary files
+    are left alone. Returns the number of bytes freed.
+    """
+    entries: Dict[str, List[os.stat_result]] = {}
+    paths: Dict[str, List[Path]] = {}
+    root = Path(cache_dir)
+    if not root.is_dir():
+        return 0
+    for p in root.iterdir():
+        if not p.is_file() or ".tmp" in p.name or ".grow" in p.name:
+            continue
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.setdefault(p.stem, []).append(st)
+        paths.setdefault(p.stem, []).append(p)
+    total = sum(st.st_size for sts in entries.values() for st in sts)
+    freed = 0
+    for stem in sorted(entries, key=lambda s: max(st.st_mtime for st in entries[s])):
+        if total - freed <= max_bytes:
             break
+        for p, st in zip(paths[stem], entries[stem]):
+            try:
+                p.unlink()
+                freed += st.st_size
+            except FileNotFoundError:
+                pass
+    if freed:
+        logger.info(f"Pruned {freed / 1e6:.0f} MB from cache dir {cache_dir}")
+    return freed
 
-        if scale is not None:
-            frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
-        frames.append(frame)
-        timestamps.append(idx / fps)
-        idx += 1
 
-    cap.release()
+def _publish_frame_cache(
+    tmp_path: Path, npy_path: Path, meta_path: Path, timestamps: np.ndarray, fps: float
+) -> None:
+    """Move a complete temporary .npy into place, writing its .json meta first."""
+    tmp_meta = meta_path.with_name(f"{meta_path.stem}.{os.getpid()}.tmp.json")
+    tmp_meta.write_text(
+        json.dumps({"num_frames": len(timestamps), "fps": float(fps), "timestamps": timestamps.tolist()}),
+        encoding="utf-8",
+    )
+    os.replace(tmp_meta, meta_path)
+    os.replace(tmp_path, npy_path)
+
+
+def frame_cache_hit(
+    cache_dir: str,
+    path: str,
+    max_dim: Optional[int] = DEFAULT_MAX_DIM,
+    max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    backend: str = DEFAULT_BACKEND,
+    start_time: float = 0.0,
+) -> bool:
+    """True if load_frame_cache would map an existing entry instead of decoding."""
+    npy_path, meta_path = _frame_cache_paths(cache_dir, path, max_dim, max_frames, backend, start_time)
+    return npy_path.exists() and _read_frame_cache_meta(meta_path) is not None
+
+
+def store_frame_cache(
+    cache_dir: str,
+    path: str,
+    frames: np.ndarray,
+    timestamps: np.ndarray,
+    fps: float,
+    max_dim: Optional[int] = DEFAULT_MAX_DIM,
+    max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    backend: str = DEFAULT_BACKEND,
+    start_time: float = 0.0,
+) -> np.ndarray:
+    """
+    Write already decoded frames as the load_frame_cache entry for these
+    decode settings; returns them memmapped from the entry.
+    """
+    npy_path, meta_path = _frame_cache_paths(cache_dir, path, max_dim, max_frames, backend, start_time)
+    npy_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = npy_path.with_name(f"{npy_path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, frames)
+    _publish_frame_cache(tmp_path, npy_path, meta_path, np.asarray(timestamps), fps)
+    return np.load(npy_path, mmap_mode="r")
+
+
+def load_frame_cache(
+    cache_dir: str,
+    path: str,
+    max_dim: Optional[int] = DEFAULT_MAX_DIM,
+    max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+    prefetch: int = 0,
+    backend: str = DEFAULT_BACKEND,
+    threads: int = 0,
+    start_time: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Like read_video, but backed by a .npy memmap in `cache_dir`.
+
+    The first call decodes chunk by chunk straight into the memmap file; any
+    later call with the same video contents and decode settings maps the
+    file instead of decoding. Frames are returned as a read-only memmap, so
+    they live in the page cache rather than in process memory.
+
+    Both files are written under temporary names and renamed into place,
+    the .json first: an entry is only visible once complete, so workers
+    sharing `cache_dir` never read a partial one. Hits refresh the entry's
+    mtime for prune_frame_cache.
+    """
+    npy_path, meta_path = _frame_cache_paths(
+        cache_dir, path, max_dim, max_frames, backend, start_time
+    )
+
+    meta = _read_frame_cache_meta(meta_path) if npy_path.exists() else None
+    if meta is not None:
+        os.utime(npy_path)
+    else:
+        npy_path.parent.mkdir(parents=True, exist_ok=True)
+        expected, fps = _expected_frames(path, max_dim, max_frames, backend, start_time)
+        tmp_path = npy_path.with_name(f"{npy_path.stem}.{os.getpid()}.tmp.npy")
+        grow_path = npy_path.with_name(f"{npy_path.stem}.{os.getpid()}.grow.npy")
+
+        def _allocate(shape, dtype, old, n):
+            if old is None:
+                return np.lib.format.open_memmap(str(tmp_path), mode="w+", dtype=dtype, shape=shape)
+            grown = np.lib.format.open_memmap(str(grow_path), mode="w+", dtype=dtype, shape=shape)
+            grown[:n] = old[:n]
+            os.replace(grow_path, tmp_path)
+            return grown
+
+        frames, timestamps = _collect_chunks(
+            iter_video_chunks(
+                path,
+                max_dim=max_dim,
+                max_frames=max_frames,
+                prefetch=prefetch,
+                backend=backend,
+                threads=threads,
+                start_time=start_time,
+            ),
+            expected,
+            _allocate,
+        )
+        if frames is None or len(frames) == 0:
+            return np.array([]), np.array([]), float(fps)
+        meta = (len(frames), timestamps, float(fps))
+        frames.flush()
+        del frames
+        _publish_frame_cache(tmp_path, npy_path, meta_path, timestamps, fps)
+
+    n, timestamps, fps = meta
+    frames = np.load(npy_path, mmap_mode="r")[:n]
+    return frames, timestamps, fps
+
+
+class FrameSource:
+    """
+    Decoded frames for a single analysis, shared across pipeline stages.
+
+    By default the video is decoded lazily on first access and kept for the
+    lifetime of the object, so ingest, face, ROI, rPPG and evidence all read
+    the same arrays instead of each stage decoding the file again.
+
+    With `keep_frames=False` the source streams instead: metadata comes from
+    a cheap probe pass and `iter_chunks` decodes into reusable chunk buffers,
+    keeping memory bounded at the cost of one decode per pass.
+
+    `prefetch` > 0 moves decoding onto a background thread that keeps that
+    many chunks ready, so a streaming consumer overlaps with decode.
+
+    With `cache_dir` set, frames are decoded once into a .npy memmap there
+    (see load_frame_cache) and every pass maps that file, so later sources
+    for the same video skip decoding entirely.
+
+    `backend` and `threads` select the decoder (see DECODER_BACKENDS);
+    `start_time` starts the clip that many seconds into the video.
+
+    A pass may stop early (see `limit`): in-memory frames it already decoded
+    are kept and later passes never read past the limit.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_dim: Optional[int] = DEFAULT_MAX_DIM,
+        max_frames: Optional[int] = DEFAULT_MAX_FRAMES,
+        keep_frames: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        prefetch: int = 0,
+        cache_dir: Optional[str] = None,
+        backend: str = DEFAULT_BACKEND,
+        threads: int = 0,
+        start_time: float = 0.0,
+    ) -> None:
+        self.path = str(path)
+        self.max_dim = max_dim
+        self.max_frames = max_frames
+        self.keep_frames = keep_frames
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self.cache_dir = str(cache_dir) if cache_dir else None
+        self.backend = backend
+        self.threads = threads
+        self.start_time = float(start_time)
+        self._frames: Optional[np.ndarray] = None
+        self._timestamps: Optional[np.ndarray] = None
+        self._fps = 0.0
+        self._frame_shape: Optional[Tuple[int, int]] = None
+        self._limit: Optional[int] = None
+        # (frames, timestamps, fps) decoded by an in-memory pass that stopped early.
+        self._partial: Optional[Tuple[Optional[np.ndarray], np.ndarray, float]] = None
+
+    def _decode_max_frames(self) -> Optional[int]:
+        if self._limit is None:
+            return self.max_frames
+        return min(self.max_frames, self._limit) if self.max_frames else self._limit
+
+    def _set_frames(self, frames: Optional[np.ndarray], timestamps: np.ndarray, fps: float) -> None:
+        if frames is None or len(frames) == 0:
+            frames, timestamps = np.array([]), np.array([])
+        if self._limit is not None:
+            frames, timestamps = frames[: self._limit], timestamps[: self._limit]
+        self._frames, self._timestamps, self._fps = frames, timestamps, float(fps)
+        self._frame_shape = tuple(frames.shape[1:3]) if len(frames) else (0, 0)
+        self._partial = None
+
+    def _load(self) -> None:
+        if self._frames is not None:
+            return
+        if self.cache_dir:
+            # Decode settings (not the limit) key the cache, so a limited
+            # source still maps the same file.
+            frames, timestamps, fps = load_frame_cache(
+                self.cache_dir,
+                self.path,
+                max_dim=self.max_dim,
+                max_frames=self.max_frames,
+                prefetch=self.prefetch,
+                backend=self.backend,
+                threads=self.threads,
+                start_time=self.start_time,
+            )
+        else:
+            frames, timestamps, fps = read_video(
+                self.path,
+                max_dim=self.max_dim,
+                max_frames=self._decode_max_frames(),
+                prefetch=self.prefetch,
+                backend=self.backend,
+                threads=self.threads,
+                start_time=self.start_time,
+            )
+        self._set_frames(frames, timestamps, fps)
+
+    def _load_meta(self) -> None:
+        if self._timestamps is not None:
+            return
+        if self.keep_frames or self.cache_dir:
+            self._load()
+        else:
+            self._timestamps, self._fps, self._frame_shape = probe_video(
+                self.path,
+                max_dim=self.max_dim,
+                max_frames=self._decode_max_frames(),
+                backend=self.backend,
+                threads=self.threads,
+                start_time=self.start_time,
+            )
+
+    @property
+    def frames(self) -> np.ndarray:
+        """Full (T, H, W, 3) frame array; decodes and caches it if needed."""
+        self._load()
+        return self._frames
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        self._load_meta()
+        return self._timestamps
+
+    @property
+    def fps(self) -> float:
+        self._load_meta()
+        return self._fps
+
+    @property
+    def frame_shape(self) -> Tuple[int, int]:
+        """(height, width) of decoded frames."""
+        self._load_meta()
+        return self._frame_shape
+
+    def read(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Same (frames, timestamps, fps) tuple as read_video, decoded once."""
+        self._load()
+        return self._frames, self._timestamps, self._fps
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[FrameChunk]:
+        """
+        Iterate frames chunk by chunk.
+
+        Yields views of the cached array when frames are held in memory,
+        otherwise streams from disk through reusable buffers. The first pass
+        of an in-memory source decodes as it yields, so the consumer can work
+        (and stop) before the whole clip is read. So does the first pass of a
+        cached source on a cache miss: the cache entry is written only once
+        that pass completes (a pass that stops early, see `limit`, keeps its
+        frames in memory and writes no entry).
+        """
+        chunk_size = chunk_size or self.chunk_size
+        if self._frames is None and self.cache_dir and not self._cache_hit():
+            yield from self._decode_and_keep(chunk_size)
+            return
+        if self.cache_dir or self._frames is not None:
+            frames, timestamps, _fps = self.read()
+            for start in range(0, len(frames), chunk_size):
+                stop = start + chunk_size
+                yield FrameChunk(start=start, frames=frames[start:stop], timestamps=timestamps[start:stop])
+            return
+        if self.keep_frames:
+            yield from self._decode_and_keep(chunk_size)
+            return
+        yield from self._stream_chunks(chunk_size)
+
+    def _stream_chunks(self, chunk_size: int) -> Iterator[FrameChunk]:
+        return iter_video_chunks(
+            self.path,
+            chunk_size=chunk_size,
+            max_dim=self.max_dim,
+            max_frames=self._decode_max_frames(),
+            prefetch=self.prefetch,
+            backend=self.backend,
+            threads=self.threads,
+            start_time=self.start_time,
+        )
+
+    def _cache_hit(self) -> bool:
+        return frame_cache_hit(
+            self.cache_dir, self.path, self.max_dim, self.max_frames, self.backend, self.start_time
+        )
+
+    def _decode_and_keep(self, chunk_size: int) -> Iterator[FrameChunk]:
+        max_frames = self._decode_max_frames()
+        expected, fps = _expected_frames(
+            self.path, self.max_dim, max_frames, self.backend, self.start_time
+        )
+        collector = _FrameCollector(expected, _allocate_in_memory)
+        complete = False
+        try:
+            for chunk in iter_video_chunks(
+                self.path,
+                chunk_size=chunk_size,
+                max_dim=self.max_dim,
+                max_frames=max_frames,
+                prefetch=self.prefetch,
+                backend=self.backend,
+                threads=self.threads,
+                start_time=self.start_time,
+            ):
+                yield collector.add(chunk)
+            complete = True
+        finally:
+            frames, timestamps = collector.result()
+            if complete and self.cache_dir and self._limit is None and frames is not None and len(frames):
+                # A full pass: publish it as the cache entry and map that
+                # instead of holding the frames in memory.
+                frames = store_frame_cache(
+                    self.cache_dir,
+                    self.path,
+                    frames,
+                    timestamps,
+                    fps,
+                    self.max_dim,
+                    self.max_frames,
+                    self.backend,
+                    self.start_time,
+                )
+            if complete:
+                self._set_frames(frames, timestamps, fps)
+            else:
+                self._partial = (frames, timestamps, fps)
+
+    def limit(self, num_frames: int) -> None:
+        """
+        Restrict the source to its first `num_frames` frames.
+
+        Meant for a pass that stopped early: frames it decoded into memory
+        are reused as the clip, and later passes never decode past the limit.
+        """
+        self._limit = max(int(num_frames), 0)
+        if self._frames is None and self._partial is not None:
+            frames, timestamps, fps = self._partial
+            if len(timestamps) >= self._limit:
+                self._set_frames(frames, timestamps, fps)
+        self._partial = None
+        if self._frames is not None:
+            self._frames = self._frames[: self._limit]
+        if self._timestamps is not None:
+            self._timestamps = self._timestamps[: self._limit]
+
+    def iter_frames(self) -> Iterator[np.ndarray]:
+        """Iterate single frames (buffer views when streaming)."""
+        for chunk in self.iter_chunks():
+            yield from chunk.frames
+
+    def get_frames(self, indices: Sequence[int]) -> np.ndarray:
+        """Copy out the frames at `indices` (sorted, in range) without holding the clip."""
+        if self.cache_dir or self._frames is not None:
+            return self.frames[np.asarray(indices, dtype=int)].copy()
+        wanted = sorted(set(int(i) for i in indices))
+        picked = {}
+        for chunk in self._stream_chunks(self.chunk_size):
+            for i in wanted:
+                if chunk.start <= i < chunk.start + len(chunk):
+                    picked[i] = chunk.frames[i - chunk.start].copy()
+            if wanted and chunk.start + len(chunk) > wanted[-1]:
+                break
+        return np.array([picked[int(i)] for i in indices if int(i) in picked])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def release(self) -> None:
+        """
+        Drop the decoded frames but keep timestamps and shape.
+
+        A later full-frame access decodes (or re-maps) again; get_frames
+        streams just the requested frames instead.
+        """
+        self._frames = None
+        self._partial = None
 
-    if not frames:
-        return np.array([]), np.array([]), float(fps)
 
-    return np.array(frames), np.array(timestamps), float(fps)
+def as_frame_source(source: Union[FrameSource, str]) -> FrameSource:
+    """Accept either a FrameSource or a video path (decoded on demand)."""
+    if isinstance(source, FrameSource):
+        return source
+    return FrameSource(source)
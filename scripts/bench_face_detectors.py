@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Compare face detector backends: latency, detection rate and agreement with the Caffe SSD.
+
+Usage:
+    python scripts/bench_face_detectors.py clip.mp4 [--detectors caffe onnx onnx-int8 haar]
+
+Frames are sampled evenly from the clip (resized exactly as the engine reads
+it) and each backend picks its best face per frame the way face analysis
+does. IoU is measured against the Caffe SSD boxes on frames where both
+found a face; "agree" is the share of those with IoU >= 0.5.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from engine.detectors import DETECTORS, get_detector_registry  # noqa: E402
+from engine.face import _box_iou, _detect_best_face  # noqa: E402
+from engine.utils.video import DEFAULT_MAX_DIM, iter_video_chunks  # noqa: E402
+
+
+def sample_frames(path, max_dim, max_frames, samples):
+    """Up to `samples` frames spread evenly over the first `max_frames`."""
+    frames = [
+        frame.copy()
+        for chunk in iter_video_chunks(path, max_dim=max_dim, max_frames=max_frames)
+        for frame in chunk.frames
+    ]
+    if len(frames) > samples:
+        keep = np.linspace(0, len(frames) - 1, samples).round().astype(int)
+        frames = [frames[i] for i in keep]
+    return frames
+
+
+def load_detector(name, threads):
+    """(available, net) for `name`, without the engine's fallback to Caffe."""
+    registry = get_detector_registry()
+    if name == "haar":
+        return True, None
+    if name == "caffe":
+        net = registry.dnn_net()
+    else:
+        net = registry.onnx_detector(quantized=name == "onnx-int8", threads=threads)
+    return net is not None, net
+
+
+def bench(frames, net, repeat):
+    """Return (best faces per frame, best ms/frame over `repeat` runs)."""
+    _detect_best_face(frames[0], net)  # first-run latency
+    best_ms = float("inf")
+    faces = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        faces = [_detect_best_face(frame, net) for frame in frames]
+        best_ms = min(best_ms, (time.perf_counter() - start) * 1000.0 / len(frames))
+    return faces, best_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video_path", help="Clip to sample frames from.")
+    parser.add_argument(
+        "--detectors", nargs="+", default=list(DETECTORS), choices=DETECTORS, help="Backends to compare."
+    )
+    parser.add_argument("--max-dim", type=int, default=DEFAULT_MAX_DIM)
+    parser.add_argument("--max-frames", type=int, default=0, help="Frames to read (0 = whole clip).")
+    parser.add_argument("--samples", type=int, default=100, help="Frames to detect on.")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime threads (0 = default).")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = sample_frames(args.video_path, args.max_dim, args.max_frames or None, args.samples)
+    if not frames:
+        sys.exit(f"No frames read from {args.video_path}")
+    print(f"Face detector benchmark: {args.video_path} ({len(frames)} frames, best of {args.repeat})")
+
+    reference = None
+    available, caffe = load_detector("caffe", args.threads)
+    if available:
+        reference, _ = bench(frames, caffe, 1)
+    else:
+        print("caffe reference unavailable: IoU columns left blank")
+
+    print(f"{'detector':<12}{'ms/frame':>10}{'detected':>10}{'mean IoU':>10}{'agree':>8}")
+    for name in args.detectors:
+        available, net = load_detector(name, args.threads)
+        if not available:
+            print(f"{name:<12}  unavailable")
+            continue
+        faces, ms = bench(frames, net, args.repeat)
+        detected = sum(face is not None for face in faces) / len(faces)
+        ious = [
+            _box_iou(face[:4], ref[:4])
+            for face, ref in zip(faces, reference or [])
+            if face is not None and ref is not None
+        ]
+        if ious:
+            iou = f"{np.mean(ious):>10.3f}{np.mean(np.asarray(ious) >= 0.5):>8.0%}"
+        else:
+            iou = f"{'-':>10}{'-':>8}"
+        print(f"{name:<12}{ms:>10.2f}{detected:>10.0%}{iou}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from engine.detectors import DetectorRegistry, OnnxFaceDetector
+
+
+def test_registry_hands_out_one_detector_per_thread() -> None:
+    registry = DetectorRegistry()
+    registry.warm_up()
+    main_net = registry.dnn_net()
+    assert registry.dnn_net() is main_net
+    assert registry.haar_cascade() is registry.haar_cascade()
+
+    other = {}
+
+    def worker() -> None:
+        other["net"] = registry.dnn_net()
+        other["haar"] = registry.haar_cascade()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert other["haar"] is not registry.haar_cascade()
+    if main_net is not None:
+        assert other["net"] is not None and other["net"] is not main_net
+
+
+def test_onnx_fallback_warns_once_per_detector(monkeypatch, caplog) -> None:
+    registry = DetectorRegistry()
+    monkeypatch.setattr(registry, "onnx_detector", lambda quantized, threads: None)
+    monkeypatch.setattr(registry, "dnn_net", lambda: "caffe")
+
+    assert [registry.detector(name) for name in ["onnx", "onnx", "onnx-int8", "onnx"]] == ["caffe"] * 4
+    warnings = [r.getMessage() for r in caplog.records if "unavailable" in r.getMessage()]
+    assert len(warnings) == 2
+
+
+def test_onnx_detector_decodes_boxes_to_frame_coordinates(tmp_path, monkeypatch) -> None:
+    # RFB-320 outputs: scores (1, N, 2) [background, face] and normalized
+    # corner boxes (1, N, 4) (x0, y0, x1, y1).
+    scores = np.array([[[0.1, 0.9], [0.2, 0.8], [0.7, 0.3], [0.3, 0.7], [0.4, 0.6]]], dtype=np.float32)
+    boxes = np.array(
+        [
+            [
+                [0.1, 0.2, 0.4, 0.6],  # kept
+                [0.11, 0.21, 0.41, 0.61],  # overlaps the first: suppressed by NMS
+                [0.5, 0.5, 0.7, 0.7],  # below the confidence threshold
+                [0.9, 0.9, 0.91, 0.91],  # 6 px wide: too small
+                [0.8, -0.1, 1.2, 0.3],  # clamped into the frame
+            ]
+        ],
+        dtype=np.float32,
+    )
+    feeds = []
+
+    class FakeSession:
+        def __init__(self, path, sess_options=None, providers=None):
+            self.path = path
+
+        def get_inputs(self):
+            return [types.SimpleNamespace(name="input")]
+
+        def run(self, output_names, feed):
+            feeds.append(feed)
+            return [scores, boxes]
+
+    fake_ort = types.SimpleNamespace(SessionOptions=types.SimpleNamespace, InferenceSession=FakeSession)
+    monkeypatch.setitem(sys.modules, "onnxruntime", fake_ort)
+
+    detector = OnnxFaceDetector(tmp_path / "model.onnx")
+    image = np.zeros((240, 320, 3), dtype=np.uint8)
+    image[..., 2] = 255  # red in BGR
+    faces = detector.detect_batch([image], [(640, 480)])
+
+    (blob,) = feeds[0].values()
+    assert blob.shape == (1, 3, 240, 320)
+    # RGB planes, scaled to (x - 127) / 128.
+    np.testing.assert_allclose(blob[0, :, 0, 0], [1.0, -127 / 128, -127 / 128])
+    assert [face[:4] for face in faces[0]] == [(64, 96, 192, 192), (512, 0, 127, 144)]
+    assert [face[4] for face in faces[0]] == pytest.approx([0.9, 0.6])
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from engine import face as face_mod
+from engine.config import Config
+from engine.face import analyze_faces, scan_faces, select_face_segment
+from engine.ingest import ingest_video
+from engine.types import FaceTrack
+from engine.utils import video as video_mod
+from engine.utils.video import FrameSource, iter_video_chunks
+
+from test_ingest import _make_synthetic_video
+
+
+def test_scan_gives_up_without_face(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=150, fps=30)
+
+    cfg = Config()
+    cfg.face.give_up_after_seconds = 1.0
+    source = FrameSource(str(video_path))
+    scan = scan_faces(source, cfg)
+
+    assert scan["stop_reason"] == "no_face"
+    assert len(scan["frames"]) == 31
+    source.limit(len(scan["frames"]))
+    assert len(source) == 31
+
+
+def test_cached_scan_decodes_as_it_goes(tmp_path: Path, monkeypatch, caplog) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=300, fps=30)
+    decoded = []
+
+    def _counting_chunks(*args, **kwargs):
+        for chunk in iter_video_chunks(*args, **kwargs):
+            decoded.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(video_mod, "iter_video_chunks", _counting_chunks)
+    cfg = Config()
+    cfg.face.give_up_after_seconds = 1.0
+    cache_dir = tmp_path / "frames"
+    source = FrameSource(str(video_path), cache_dir=str(cache_dir), chunk_size=16)
+    scan = scan_faces(source, cfg)
+
+    assert scan["stop_reason"] == "no_face"
+    assert sum(decoded) < 64
+    assert "No faces detected" not in caplog.text
+    # An early stop writes no cache entry for the whole clip.
+    assert not list(cache_dir.glob("*.npy"))
+    source.limit(len(scan["frames"]))
+    assert len(source) == 31
+
+
+def test_face_detections_cached_by_content(tmp_path: Path, monkeypatch) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=30, fps=30)
+    cfg = Config()
+    cache_dir = str(tmp_path / "cache")
+
+    def _analyze():
+        source = FrameSource(str(video_path), cache_dir=cache_dir)
+        return analyze_faces(source, ingest_video(source, cfg), cfg)["metrics"]["frames"]
+
+    first = _analyze()
+    monkeypatch.setattr(face_mod, "_detect_faces_for_source", lambda *args: pytest.fail("re-detected"))
+    cfg.roi.min_region_coverage = 0.1  # other stages' settings do not invalidate the cache
+    second = _analyze()
+    assert second.to_records() == first.to_records()
+
+    cfg.face.detect_every_n = 5
+    with pytest.raises(pytest.fail.Exception):
+        _analyze()
+
+
+def test_select_segment_finds_late_face(tmp_path: Path, monkeypatch) -> None:
+    video_path = tmp_path / "late_face.mp4"
+    out = cv2.VideoWriter(str(video_path), cv2.VideoWriter_fourcc(*"mp4v"), 10, (64, 64))
+    for i in range(200):
+        # Bright frames stand in for a visible face from 12s on.
+        out.write(np.full((64, 64, 3), 255 if i >= 120 else 0, dtype=np.uint8))
+    out.release()
+    monkeypatch.setattr(face_mod, "_get_dnn_detector", lambda *args: None)
+    monkeypatch.setattr(
+        face_mod,
+        "_detect_best_face",
+        lambda frame, net: (0, 0, 8, 8, 1.0) if frame.mean() > 128 else None,
+    )
+
+    cfg = Config()
+    assert select_face_segment(str(video_path), cfg, max_frames=50) == 0.0  # off by default
+    cfg.ingest.select_segment = True
+    cache_dir = str(tmp_path / "cache")
+    assert select_face_segment(str(video_path), cfg, max_frames=50, cache_dir=cache_dir) == 12.0
+    assert select_face_segment(str(video_path), cfg, max_frames=400) == 0.0
+
+    monkeypatch.setattr(face_mod, "_scan_face_segment", lambda *args: pytest.fail("re-scanned"))
+    assert select_face_segment(str(video_path), cfg, max_frames=50, cache_dir=cache_dir) == 12.0
+
+
+def test_batched_dnn_matches_single_frame() -> None:
+    net = face_mod._get_dnn_detector()
+    if net is None:
+        pytest.skip("DNN face model unavailable")
+    sample = cv2.imread(str(Path(__file__).resolve().parent.parent / "bioverify_sample.png"))
+    frames = [sample[108:228, 430:620], np.zeros((120, 160, 3), dtype=np.uint8), sample]
+
+    batched = face_mod._detect_face_dnn_batch(
+        [face_mod._dnn_input(f) for f in frames],
+        [(f.shape[1], f.shape[0]) for f in frames],
+        net,
+    )
+
+    assert len(batched) == 3
+    assert batched[0]
+    for frame, faces in zip(frames, batched):
+        single = face_mod._detect_face_dnn(frame, net)
+        assert [f[:4] for f in faces] == [f[:4] for f in single]
+        assert np.allclose([f[4] for f in faces], [f[4] for f in single], atol=1e-3)
+
+
+def test_local_detection_finds_small_face() -> None:
+    net = face_mod._get_dnn_detector()
+    if net is None:
+        pytest.skip("DNN face model unavailable")
+    sample = cv2.imread(str(Path(__file__).resolve().parent.parent / "bioverify_sample.png"))
+    frame = np.full((270, 480, 3), 90, dtype=np.uint8)
+    frame[100:163, 300:400] = cv2.resize(sample[108:228, 430:620], (100, 63), interpolation=cv2.INTER_AREA)
+
+    assert face_mod._detect_best_face(frame, net) is None
+    best = face_mod._detect_best_face_near(frame, (325, 100, 50, 63), net, margin=0.5)
+    assert best is not None
+    x, y, w, h, _conf = best
+    assert 300 <= x and x + w <= 400 and 100 <= y and y + h <= 163
+
+
+def test_parallel_detection_matches_sequential(tmp_path: Path) -> None:
+    if face_mod._get_dnn_detector() is None:
+        pytest.skip("DNN face model unavailable")
+    sample = cv2.imread(str(Path(__file__).resolve().parent.parent / "bioverify_sample.png"))
+    face = cv2.resize(sample[108:228, 430:620], (380, 240))
+    video_path = tmp_path / "face.mp4"
+    out = cv2.VideoWriter(str(video_path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (480, 270))
+    for i in range(60):
+        frame = np.full((270, 480, 3), 90, dtype=np.uint8)
+        frame[15:255, 40 + i : 420 + i] = face
+        out.write(frame)
+    out.release()
+
+    cfg = Config()
+    sequential = face_mod._detect_faces(FrameSource(str(video_path)).iter_frames(), cfg.face)
+    cfg.face.detect_workers = 2
+    parallel = face_mod._detect_faces_parallel(FrameSource(str(video_path)).iter_chunks(16), cfg.face)
+
+    assert len(parallel) == len(sequential) == 60
+    for seq, par in zip(sequential, parallel):
+        assert seq["box"] is not None and par["box"] is not None
+        assert face_mod._box_iou(seq["box"], par["box"]) > 0.7
+
+
+def test_face_track_serializes_per_frame_records() -> None:
+    detections = [face_mod._make_result(10, 20, 40, 50, 0.9), dict(face_mod._NO_FACE)]
+    track = FaceTrack.from_detections(np.array([0.0, 0.04, 0.08]), detections)
+
+    assert len(track) == 2 and track.valid.tolist() == [True, False]
+    first, second = track.to_records()
+    assert first["box"] == [10, 20, 40, 50]
+    assert first["landmarks"][0] == [int(10 + 0.3 * 40), int(20 + 0.35 * 50)]
+    assert first["landmarks"][-1] == [int(10 + 0.5 * 40), int(20 + 0.9 * 50)]
+    assert first["tracking_confidence"] == pytest.approx(0.9)
+    assert second == {"time": 0.04, "box": None, "landmarks": [], "tracking_confidence": 0.0}
+
+
+def test_select_segment_survives_undecodable_file(tmp_path: Path) -> None:
+    video_path = tmp_path / "corrupt.mp4"
+    video_path.write_bytes(b"not a video")
+    cfg = Config()
+    cfg.ingest.select_segment = True
+
+    assert select_face_segment(str(video_path), cfg, cache_dir=str(tmp_path / "cache")) == 0.0
@@ -6,7 +6,7 @@ import cv2
 import numpy as np
 
 from engine.config import Config
-from engine.ingest import ingest_video
+from engine.ingest import _make_windows, _resample_grid, ingest_video
 
 
 def _make_synthetic_video(path: Path, num_frames: int = 60, fps: int = 30) -> None:
@@ -46,3 +46,27 @@ def test_ingest_windowing(tmp_path: Path) -> None:
     starts = [w.start_time for w in result.windows]
     assert starts == sorted(starts)
 
+
+def test_resample_grid_is_index_only() -> None:
+    ts = np.arange(90) / 30.0
+    same = _resample_grid(ts, 30.0, 30.0)
+    assert (same.source_indices == np.arange(90)).all()
+
+    half = _resample_grid(ts, 30.0, 15.0)
+    assert half.fps == 15.0
+    assert len(half) == 45
+    assert (half.source_indices == np.arange(0, 90, 2)).all()
+    assert (half.take(ts) == half.times).all()
+
+
+def test_window_index_matches_masks() -> None:
+    ts = np.arange(0, 120.0, 1 / 30.0)
+    windows, index = _make_windows((48, 64), ts, 30.0, 8.0, 0.5)
+
+    assert len(windows) == len(index) == 30
+    valid = (np.arange(len(ts)) % 3) != 0
+    for w in windows:
+        mask = (ts >= w.start_time) & (ts <= w.end_time)
+        span = index.span(w.index)
+        assert (np.flatnonzero(mask) == np.arange(span.start, span.stop)).all()
+        assert index.counts(valid)[w.index] == valid[mask].sum()
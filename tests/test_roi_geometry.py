@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import numpy as np
+
+from engine.roi_geometry import rect_areas, region_rects
+
+
+def test_region_rects_match_mask_areas_at_frame_edges() -> None:
+    frame_shape = (48, 64)
+    boxes = np.array([[10, 8, 21, 30], [50, 40, 30, 20], [0, 0, 64, 48]])
+
+    rects = region_rects(boxes, frame_shape)
+
+    for box_rects in rects:
+        for x0, y0, x1, y1 in box_rects:
+            mask = np.zeros(frame_shape, dtype=bool)
+            mask[y0:y1, x0:x1] = True
+            assert rect_areas(np.array([x0, y0, x1, y1])) == mask.sum()
+    # Second box runs off the bottom-right corner: clamped to the frame.
+    assert rects[1].tolist() == [[50, 40, 64, 42], [50, 42, 57, 45], [57, 42, 64, 45]]
+    assert rects[0, 0].tolist() == [10, 8, 31, 17]
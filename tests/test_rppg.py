@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from engine.config import Config
+from engine.ingest import ingest_video
+from engine.roi_geometry import RegionGeometry, patch_grid_fractions, region_rects
+from engine.rppg import (
+    _extract_rgb_means,
+    _interp_samples,
+    _rect_means,
+    _segment_pulses,
+    _windowed_pulses,
+    extract_rppg,
+)
+from engine.rppg_methods import METHODS, pulse_signals
+from engine.types import IngestWindow
+from engine.utils.video import FrameSource
+
+from test_ingest import _make_synthetic_video
+
+
+def test_integral_patch_means_match_direct_means() -> None:
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8)
+    box = np.array([[7, 5, 45, 37]])
+
+    rects = region_rects(box, frame.shape, patch_grid_fractions(4, 3))[0]
+    means = _rect_means(frame, rects)
+
+    assert means.shape == (12, 3)
+    for (x0, y0, x1, y1), mean in zip(rects, means):
+        expected = frame[y0:y1, x0:x1].reshape(-1, 3).mean(axis=0)[::-1]
+        np.testing.assert_allclose(mean, expected, rtol=1e-12)
+    # The grid tiles the box exactly.
+    assert rects[:, 0].min() == 7 and rects[:, 2].max() == 52
+    assert rects[:, 1].min() == 5 and rects[:, 3].max() == 42
+
+
+def test_rgb_means_fill_regions_by_frame_array() -> None:
+    rng = np.random.default_rng(1)
+    frames = rng.integers(0, 256, size=(5, 40, 50, 3), dtype=np.uint8)
+    rects = region_rects(np.tile([[4, 3, 30, 28]], (5, 1)), frames.shape[1:])
+    selected = np.array([True, False, True, True, False])
+
+    means = _extract_rgb_means(iter(frames), rects, selected)
+
+    assert means.shape == (3, 5, 3) and means.dtype == np.float32
+    assert not means[:, ~selected].any()
+    for t in np.flatnonzero(selected):
+        for r, (x0, y0, x1, y1) in enumerate(rects[t]):
+            expected = frames[t, y0:y1, x0:x1].reshape(-1, 3).mean(axis=0)[::-1]
+            np.testing.assert_allclose(means[r, t], expected, rtol=1e-6)
+
+    t = np.array([0.0, 0.1, 0.35, 0.4])
+    t_new = np.linspace(0.0, 0.4, 9)
+    values = rng.normal(size=(2, 4, 3))
+    out = _interp_samples(t_new, t, values)
+    np.testing.assert_allclose(out[1, :, 2], np.interp(t_new, t, values[1, :, 2]))
+
+
+def test_every_rppg_method_recovers_the_pulse_rate() -> None:
+    rng = np.random.default_rng(2)
+    fs, hr_hz = 30.0, 1.2
+    t = np.arange(600) / fs
+    pulse = np.sin(2 * np.pi * hr_hz * t)[:, None] * np.array([0.33, 0.77, 0.53])
+    drift = 0.01 * np.sin(2 * np.pi * 0.1 * t)[:, None]  # slow illumination change
+    base = np.array([150.0, 110.0, 90.0])
+    rgb = base * (1 + 0.005 * pulse + drift) + rng.normal(scale=0.2, size=(600, 3))
+
+    pulses = pulse_signals(np.stack([rgb, 0.8 * rgb]), fs, METHODS, (0.7, 4.0))
+
+    freqs = np.fft.rfftfreq(600, d=1.0 / fs)
+    band = freqs >= 0.7
+    for method, x in pulses.items():
+        assert x.shape == (2, 600), method
+        x = signal.detrend(x, axis=1)
+        power = np.abs(np.fft.rfft(x * np.hanning(600), axis=1)) ** 2
+        np.testing.assert_allclose(freqs[band][power[:, band].argmax(axis=1)], hr_hz, err_msg=method)
+
+
+def test_windowed_pulses_overlap_add_independent_windows() -> None:
+    rng = np.random.default_rng(3)
+    fs = 30.0
+    t = np.arange(900) / fs
+    pulse = np.sin(2 * np.pi * 1.5 * t)[:, None] * np.array([0.33, 0.77, 0.53])
+    rgb = np.array([150.0, 110.0, 90.0]) * (1 + 0.005 * pulse) + rng.normal(scale=0.2, size=(900, 3))
+    rgb = np.stack([rgb, rgb])
+    windows = [
+        IngestWindow(i, start, min(start + 8.0, t[-1]), fs, {}, 8.0, 0.0)
+        for i, start in enumerate([0.0, 4.0, 8.0, 12.0, 16.0, 20.0, 24.0, 28.0])
+    ]
+    config = Config()
+
+    out = _windowed_pulses(rgb, t, fs, windows, ["chrom"], "chrom", ["a", "b"], config)
+    config.rppg.window_workers = 3
+    threaded = _windowed_pulses(rgb, t, fs, windows, ["chrom"], "chrom", ["a", "b"], config)
+
+    method, combined, records, _snrs = out
+    assert method == "chrom" and combined.shape == (2, 900)
+    # The 2 s tail window is too short and skipped.
+    assert [r["index"] for r in records] == list(range(7))
+    assert all(abs(r["regions"]["a"]["peak_hz"] - 1.5) < 0.15 for r in records)
+    np.testing.assert_allclose(threaded[1], combined)
+    power = np.abs(np.fft.rfft(combined[0])) ** 2
+    assert np.fft.rfftfreq(900, d=1.0 / fs)[power.argmax()] == 1.5
+
+
+def test_windowed_pulses_keep_one_method_per_clip() -> None:
+    rng = np.random.default_rng(3)
+    fs = 30.0
+    t = np.arange(900) / fs
+    true_pulse = np.sin(2 * np.pi * 1.5 * t)
+    rgb = np.array([150.0, 110.0, 90.0]) * (1 + 0.005 * true_pulse[:, None] * np.array([0.33, 0.77, 0.53]))
+    rgb += rng.normal(scale=0.2, size=(900, 3))
+    # Early windows: common-mode intensity noise, which CHROM cancels;
+    # later windows: red/blue noise, which leaves the green channel clean.
+    early = t < 14
+    rgb[early] *= 1 + 0.02 * rng.normal(size=(early.sum(), 1))
+    rgb[~early, 0] += rng.normal(scale=3.0, size=(~early).sum())
+    rgb[~early, 2] += rng.normal(scale=3.0, size=(~early).sum())
+    rgb = np.stack([rgb, rgb])
+    windows = [
+        IngestWindow(i, start, min(start + 8.0, t[-1]), fs, {}, 8.0, 0.0)
+        for i, start in enumerate([0.0, 4.0, 8.0, 12.0, 16.0, 20.0, 24.0, 28.0])
+    ]
+    config = Config()
+    methods = ["green", "chrom"]
+    spans = [(int(w.start_time * fs), int(w.end_time * fs) + 1) for w in windows[:7]]
+    favourites = {_segment_pulses(rgb[:, lo:hi], fs, methods, "auto", config)[0] for lo, hi in spans}
+    assert favourites == {"green", "chrom"}
+
+    method, combined, records, snrs = _windowed_pulses(
+        rgb, t, fs, windows, methods, "auto", ["a", "b"], config
+    )
+    assert method == max(methods, key=lambda m: snrs[m][0].mean())
+    assert {r["method"] for r in records} == {method}
+    assert np.corrcoef(combined[0], true_pulse)[0, 1] > 0.5
+    # CHROM's pulse is inverted relative to green; windows are signed to green.
+    _m, chrom_pulse, _r, _s = _windowed_pulses(rgb, t, fs, windows, methods, "chrom", ["a", "b"], config)
+    assert np.corrcoef(chrom_pulse[0], true_pulse)[0, 1] > 0.3
+
+
+def test_no_usable_frames_reads_no_pixels(tmp_path: Path, monkeypatch) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=30, fps=30)
+    cfg = Config()
+    source = FrameSource(str(video_path))
+    ingest = ingest_video(source, cfg)
+    n = len(source)
+    geometry = RegionGeometry.from_boxes(np.zeros((n, 4)), np.zeros(n, dtype=bool), source.frame_shape)
+    monkeypatch.setattr(FrameSource, "iter_frames", lambda self: pytest.fail("read frames"))
+
+    result = extract_rppg(
+        source, ingest, {}, cfg, geometry=geometry, region_valid=np.ones((n, 3), dtype=bool)
+    )
+
+    assert result["metrics"]["times"] == []
+    assert result["metrics"]["summary"]["samples_per_region"]["forehead"] == 0
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from engine.tracking import FaceTracker, smooth_boxes
+
+
+def _frame_with_face(dx: int, dy: int) -> np.ndarray:
+    sample = cv2.imread(str(Path(__file__).resolve().parent.parent / "bioverify_sample.png"))
+    face = cv2.resize(sample[108:228, 430:620], (95, 60))
+    frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+    frame[80 + dy : 140 + dy, 100 + dx : 195 + dx] = face
+    return frame
+
+
+def test_tracker_follows_shifted_face() -> None:
+    tracker = FaceTracker()
+    tracker.start(_frame_with_face(0, 0), (100, 80, 95, 60))
+
+    box, score = tracker.update(_frame_with_face(12, -7))
+
+    assert score > 0.9
+    assert abs(box[0] - 112) <= 2 and abs(box[1] - 73) <= 2
+    assert box[2:] == (95, 60)
+    assert 0.1 < tracker.drift < 0.2
+
+    _box, score = tracker.update(np.full((240, 320, 3), 90, dtype=np.uint8))
+    assert score < 0.5
+
+
+def test_smooth_boxes_reduces_jitter_and_keeps_gaps() -> None:
+    rng = np.random.default_rng(0)
+    t = np.arange(120)
+    true = np.column_stack([100 + 0.5 * t, np.full(120, 80.0), np.full(120, 60.0), np.full(120, 70.0)])
+    boxes = np.rint(true + rng.normal(0, 3, true.shape)).astype(np.int32)
+    valid = np.ones(120, dtype=bool)
+    valid[50:55] = False
+    boxes[50:55] = 0
+
+    smoothed = smooth_boxes(boxes, valid)
+
+    assert smoothed.dtype == np.int32 and not smoothed[50:55].any()
+    error_before = np.abs(boxes[valid] - true[valid]).mean()
+    error_after = np.abs(smoothed[valid] - true[valid]).mean()
+    assert error_after < 0.5 * error_before
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from engine.tube import build_face_tube
+from engine.types import FaceTrack
+from engine.utils.video import FrameSource
+
+from test_ingest import _make_synthetic_video
+
+
+def test_face_tube_crops_match_frames(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=12, fps=30)
+    source = FrameSource(str(video_path))
+    frames = source.frames
+
+    boxes = np.array([[5 + i, 10, 20 + (i % 3), 24] for i in range(12)])
+    boxes[4] = 0  # no face
+    boxes[7] = [55, 50, 20, 20]  # runs off the frame edge
+    track = FaceTrack.from_boxes(source.timestamps, boxes, np.ones(12))
+
+    tube = build_face_tube(source, track)
+
+    assert tube is not None
+    assert tube.patch_shape == (24, 22)
+    assert not tube.valid[4] and not tube.patches[4].any()
+    for i in range(12):
+        if not tube.valid[i]:
+            continue
+        x0, y0 = tube.origins[i]
+        lx, ly, w, h = tube.local_boxes[i]
+        assert lx >= 0 and ly >= 0 and lx + w <= 22 and ly + h <= 24
+        x, y = tube.boxes[i][:2]
+        assert (tube.patches[i][ly:ly + h, lx:lx + w] == frames[i][y:y + h, x:x + w]).all()
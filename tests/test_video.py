@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from engine.config import Config
+from engine.ingest import ingest_video
+from engine.utils import video as video_mod
+from engine.utils.video import (
+    FrameSource,
+    VideoDecoder,
+    iter_video_chunks,
+    load_frame_cache,
+    prune_frame_cache,
+    read_video,
+)
+
+from test_ingest import _make_synthetic_video
+
+
+def test_frame_source_decodes_once(tmp_path: Path, monkeypatch) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=90, fps=30)
+
+    calls = []
+    real_read_video = video_mod.read_video
+
+    def counting_read_video(*args, **kwargs):
+        calls.append(args)
+        return real_read_video(*args, **kwargs)
+
+    monkeypatch.setattr(video_mod, "read_video", counting_read_video)
+
+    cfg = Config()
+    cfg.ingest.min_duration_seconds = 1.0
+    source = FrameSource(str(video_path))
+    ingest_video(source, cfg)
+    frames, timestamps, fps = source.read()
+
+    assert len(calls) == 1
+    assert frames.shape[0] == 90
+    assert len(timestamps) == 90
+    assert fps == 30.0
+
+
+def test_iter_video_chunks_matches_read_video(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=70, fps=30)
+
+    frames, timestamps, _fps = read_video(str(video_path))
+    sizes = []
+    first = None
+    for chunk in iter_video_chunks(str(video_path), chunk_size=32):
+        sizes.append(len(chunk))
+        if first is None:
+            first = chunk.frames
+        # Every chunk is a view of the same reusable buffer.
+        assert np.shares_memory(first, chunk.frames)
+        stop = chunk.start + len(chunk)
+        assert (chunk.frames == frames[chunk.start:stop]).all()
+        assert (chunk.timestamps == timestamps[chunk.start:stop]).all()
+
+    assert sizes == [32, 32, 6]
+
+
+def test_streaming_frame_source(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=40, fps=30)
+
+    cached = FrameSource(str(video_path))
+    streamed = FrameSource(str(video_path), keep_frames=False, chunk_size=16)
+
+    assert len(streamed) == 40
+    assert streamed.frame_shape == cached.frame_shape
+    assert (streamed.get_frames([0, 20, 39]) == cached.frames[[0, 20, 39]]).all()
+    assert streamed._frames is None
+
+
+def test_prefetched_chunks_match_inline(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=70, fps=30)
+
+    frames, _timestamps, _fps = read_video(str(video_path))
+    seen = 0
+    for chunk in iter_video_chunks(str(video_path), chunk_size=16, prefetch=2):
+        assert (chunk.frames == frames[chunk.start:chunk.start + len(chunk)]).all()
+        seen += len(chunk)
+    assert seen == 70
+
+    # Abandoning the iterator early must stop the decode thread.
+    chunks = iter_video_chunks(str(video_path), chunk_size=8, prefetch=1)
+    next(chunks)
+    chunks.close()
+    assert not any(t.name == "bioverify-decode" for t in threading.enumerate())
+
+
+def test_memmap_frame_cache_is_reused(tmp_path: Path, monkeypatch) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=40, fps=30)
+    cache_dir = tmp_path / "cache"
+
+    first = FrameSource(str(video_path), cache_dir=str(cache_dir))
+    expected, _timestamps, _fps = read_video(str(video_path))
+    assert isinstance(first.frames, np.memmap)
+    assert (first.frames == expected).all()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached frames should not be decoded again")
+
+    monkeypatch.setattr(video_mod, "iter_video_chunks", fail)
+    second = FrameSource(str(video_path), cache_dir=str(cache_dir))
+    assert (second.frames == expected).all()
+    assert len(second) == 40
+
+
+def test_frame_cache_ignores_torn_entry_and_prunes_lru(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=20, fps=10)
+    cache_dir = tmp_path / "cache"
+
+    frames, timestamps, _fps = load_frame_cache(str(cache_dir), str(video_path))
+    (meta_path,) = cache_dir.glob("frames_*.json")
+    meta_path.write_text('{"num_fr')  # e.g. left half-written by an old writer
+    again, again_ts, _ = load_frame_cache(str(cache_dir), str(video_path))
+    np.testing.assert_array_equal(np.asarray(again), np.asarray(frames))
+    np.testing.assert_array_equal(again_ts, timestamps)
+
+    old = cache_dir / "faces_old.npz"
+    old.write_bytes(b"x" * 1000)
+    os.utime(old, (0, 0))
+    entry_size = sum(p.stat().st_size for p in cache_dir.glob("frames_*"))
+    assert prune_frame_cache(str(cache_dir), entry_size) == 1000
+    assert not old.exists() and len(list(cache_dir.glob("frames_*"))) == 2
+    prune_frame_cache(str(cache_dir), 0)
+    assert not list(cache_dir.iterdir())
+
+
+def test_limit_reuses_frames_from_stopped_pass(tmp_path: Path, monkeypatch) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=90, fps=30)
+    expected, expected_ts, _fps = read_video(str(video_path))
+
+    source = FrameSource(str(video_path), chunk_size=16)
+    seen = 0
+    for chunk in source.iter_chunks():
+        seen += len(chunk)
+        if seen >= 40:
+            break
+
+    def fail(*args, **kwargs):
+        raise AssertionError("frames read before the stop should not be decoded again")
+
+    monkeypatch.setattr(video_mod, "read_video", fail)
+    monkeypatch.setattr(video_mod, "iter_video_chunks", fail)
+    source.limit(40)
+    assert len(source) == 40
+    assert (source.frames == expected[:40]).all()
+    assert np.allclose(source.timestamps, expected_ts[:40])
+
+
+def test_start_time_seeks_into_video(tmp_path: Path) -> None:
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=90, fps=30)
+    expected, expected_ts, _fps = read_video(str(video_path))
+
+    source = FrameSource(str(video_path), start_time=1.0, max_frames=30)
+    assert np.allclose(source.timestamps, expected_ts[30:60])
+    assert (source.frames == expected[30:60]).all()
+
+
+def test_pyav_backend_matches_cv2(tmp_path: Path) -> None:
+    pytest.importorskip("av")
+    video_path = tmp_path / "synthetic.mp4"
+    _make_synthetic_video(video_path, num_frames=30, fps=30)
+
+    cv_frames, cv_ts, cv_fps = read_video(str(video_path), backend="cv2")
+    av_frames, av_ts, av_fps = read_video(str(video_path), backend="pyav")
+
+    assert av_fps == cv_fps
+    assert av_frames.shape == cv_frames.shape
+    assert np.allclose(av_ts, cv_ts)
+    assert np.abs(av_frames.astype(int) - cv_frames.astype(int)).mean() < 2.0
+
+
+def test_decoder_backend_must_implement_every_method() -> None:
+    class NoSeekDecoder(VideoDecoder):
+        name = "no-seek"
+
+        def read_into(self, out: np.ndarray):
+            return None
+
+        def skip(self):
+            return None
+
+        def close(self) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        NoSeekDecoder("clip.mp4")